@@ -0,0 +1,113 @@
+import threading
+from collections import Counter
+from itertools import combinations
+
+from agents.categorical import CATEGORICAL_COLUMNS, MISSING, vocabularies
+from agents.storage import ResponseLog, log_path_for
+
+
+class AggregateStore:
+    """
+    Value counts and pairwise cross-tabs of the categorical columns,
+    maintained incrementally as responses are committed.
+
+    Answers are dictionary-encoded through the store's own vocabularies
+    (see agents/categorical.py), so the counts are kept per code and labels
+    are only looked up when a query is answered. Answers that differ only
+    in case or whitespace are counted together under one normalized label.
+    The vocabularies start over with the counts when the log is cleared.
+
+    The store remembers the log position it has consumed up to. `apply`
+    folds a just-written batch in directly when it starts at that position
+    (the common case); otherwise `sync` catches up by reading only the new
+    part of the log, which also picks up writes from other processes.
+    """
+
+    def __init__(self, log, columns=CATEGORICAL_COLUMNS):
+        self.log = log
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.position = None
+        self.total = 0
+        self.vocabulary = vocabularies(self.columns)
+        self.counts = {col: Counter() for col in self.columns}
+        self._pair_index = list(combinations(range(len(self.columns)), 2))
+        self.pairs = {(self.columns[i], self.columns[j]): Counter() for i, j in self._pair_index}
+
+    def _add(self, records):
+        counts = [self.counts[col] for col in self.columns]
+        vocabs = [self.vocabulary[col] for col in self.columns]
+        pairs = list(self.pairs.values())
+        for record in records:
+            row = tuple(vocab.code(record.get(col)) for vocab, col in zip(vocabs, self.columns))
+            self.total += 1
+            for counter, code in zip(counts, row):
+                if code != MISSING:
+                    counter[code] += 1
+            for counter, (i, j) in zip(pairs, self._pair_index):
+                if row[i] != MISSING and row[j] != MISSING:
+                    counter[(row[i], row[j])] += 1
+
+    def sync(self):
+        """Folds in any records appended to the log since the last update."""
+        with self._lock:
+            if self.position and self.position[0] not in self.log.segments():
+                # The log was cleared: rebuild from scratch.
+                self._reset()
+            records, position = self.log.scan(self.position)
+            self._add(records)
+            self.position = position
+        return self
+
+    def apply(self, records, span):
+        """Updates the aggregates with a batch the caller just appended at `span`."""
+        if not span:
+            return
+        start, end = span
+        with self._lock:
+            if self.position == start:
+                self._add(records)
+                self.position = end
+                return
+        self.sync()
+
+    # --- Queries ---
+    def available(self):
+        return bool(self.log.segments())
+
+    def value_counts(self, column):
+        """Counts for one column, most common first (like pandas value_counts)."""
+        self.sync()
+        with self._lock:
+            labels = self.vocabulary[column].labels
+            return {labels[code]: n for code, n in self.counts[column].most_common()}
+
+    def crosstab(self, row_col, col_col):
+        """Returns {(row_value, col_value): count} for two categorical columns."""
+        self.sync()
+        with self._lock:
+            rows = self.vocabulary[row_col].labels
+            cols = self.vocabulary[col_col].labels
+            if (row_col, col_col) in self.pairs:
+                return {(rows[r], cols[c]): n for (r, c), n in self.pairs[(row_col, col_col)].items()}
+            return {(rows[r], cols[c]): n for (c, r), n in self.pairs[(col_col, row_col)].items()}
+
+    def has_pair(self, row_col, col_col):
+        return (row_col, col_col) in self.pairs or (col_col, row_col) in self.pairs
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def aggregates_for(data_file):
+    """Returns the process-wide aggregate store for a data file's response log."""
+    path = log_path_for(data_file)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = AggregateStore(ResponseLog(path))
+    return store
@@ -1,16 +1,27 @@
 import pandas as pd
 import os
 import json
+import uuid
+import asyncio
 import operator
 from typing import TypedDict, Annotated, List, Union
 from functools import partial
 
 from dotenv import load_dotenv
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage, ToolMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage, ToolMessage, RemoveMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.tools import tool, StructuredTool
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+
+from agents import telemetry
+from agents.aggregates import aggregates_for
+from agents.checkpoints import SQLiteCheckpointer
+from agents.clustering import IdeaClusterer, clusterer_for
+from agents.dataset import dataset_version, load_columns, load_dataset, value_counts
+from agents.query import engine_for
+from agents.tool_cache import ToolCache
+from agents.answer_cache import AnswerCache
 
 
 load_dotenv()
@@ -18,10 +29,10 @@ load_dotenv()
 # --- Tools ---
 def get_dataset_info(data_file: str) -> str:
     """Returns basic information about the dataset (columns, shape, sample)."""
-    if not os.path.exists(data_file):
+    if dataset_version(data_file) is None:
         return "Data file does not exist."
     try:
-        df = pd.read_excel(data_file)
+        df = load_dataset(data_file)
         if df.empty:
             return "Dataset is empty."
         info = f"Columns: {list(df.columns)}\nShape: {df.shape}\nSample:\n{df.head(2).to_string()}"
@@ -32,10 +43,14 @@ def get_dataset_info(data_file: str) -> str:
 def count_values(data_file: str, column: str) -> str:
     """Counts unique values in a specific column."""
     try:
-        df = pd.read_excel(data_file)
-        if column not in df.columns:
-            return f"Column '{column}' not found. Available: {list(df.columns)}"
-        counts = df[column].value_counts().to_dict()
+        store = aggregates_for(data_file)
+        if column in store.columns and store.available():
+            # Answered from the incrementally maintained counts
+            return json.dumps(store.value_counts(column), indent=2)
+        try:
+            counts = value_counts(data_file, column)
+        except KeyError:
+            return f"Column '{column}' not found. Available: {list(load_dataset(data_file).columns)}"
         return json.dumps(counts, indent=2)
     except Exception as e:
         return f"Error: {e}"
@@ -43,22 +58,30 @@ def count_values(data_file: str, column: str) -> str:
 def filter_and_count(data_file: str, filter_col: str, filter_val: str, count_col: str) -> str:
     """Filters data by a column value (substring match) and counts values in another column."""
     try:
-        df = pd.read_excel(data_file)
-        # Case insensitive string match
-        filtered = df[df[filter_col].astype(str).str.contains(filter_val, case=False, na=False)]
-        if filtered.empty:
+        engine = engine_for(data_file)
+        engine.column(count_col)   # unknown columns fail before any filtering
+        # Case insensitive substring match, through the n-gram index
+        rows = engine.where(filter_col, filter_val)
+        if not len(rows):
             return "No matching records found."
-        counts = filtered[count_col].value_counts().to_dict()
-        return json.dumps(counts, indent=2)
+        return json.dumps(engine.count(count_col, rows), indent=2)
     except Exception as e:
         return f"Error: {e}"
 
 def cross_tabulate(data_file: str, row_col: str, col_col: str) -> str:
     """Creates a cross-tabulation (contingency table) between two columns."""
     try:
-        df = pd.read_excel(data_file)
-        if row_col not in df.columns or col_col not in df.columns:
-            return f"Columns not found. Available: {list(df.columns)}"
+        store = aggregates_for(data_file)
+        if store.has_pair(row_col, col_col) and store.available():
+            counts = store.crosstab(row_col, col_col)
+            if not counts:
+                return "{}"
+            ct = pd.Series(counts, dtype='int64').unstack(fill_value=0).sort_index().sort_index(axis=1)
+            return ct.to_json()
+        try:
+            df = load_columns(data_file, [row_col, col_col])
+        except KeyError:
+            return f"Columns not found. Available: {list(load_dataset(data_file).columns)}"
         ct = pd.crosstab(df[row_col], df[col_col])
         return ct.to_json()
     except Exception as e:
@@ -67,19 +90,181 @@ def cross_tabulate(data_file: str, row_col: str, col_col: str) -> str:
 def get_raw_data(data_file: str, limit: int = 5) -> str:
     """Returns a sample of raw rows for qualitative analysis."""
     try:
-        df = pd.read_excel(data_file)
+        df = load_dataset(data_file)
         return df.head(limit).to_json(orient='records')
     except Exception as e:
         return f"Error: {e}"
 
 
 
+# --- Deterministic summary ---
+# Modes for AnalyticsAgent.analyze:
+#   "llm"    - the ReAct agent computes everything through the tools
+#   "hybrid" - counts are computed here; the LLM only groups project ideas
+#   "local"  - no LLM at all; project ideas are grouped locally
+ANALYSIS_MODES = ("llm", "hybrid", "local")
+
+def column_counts(data_file: str, column: str) -> dict:
+    """Value counts for a column, most common first ({} if the column is missing)."""
+    store = aggregates_for(data_file)
+    if column in store.columns and store.available():
+        return store.value_counts(column)
+    try:
+        return value_counts(data_file, column)
+    except KeyError:
+        return {}
+
+def compute_summary(data_file: str, top_domains: int = 10) -> dict:
+    """Computes every key of the analysis except interest_clusters, without an LLM."""
+    store = aggregates_for(data_file)
+    if store.available():
+        total = store.sync().total
+    else:
+        total = len(load_dataset(data_file))
+    domains = column_counts(data_file, "Domain")
+    return {
+        "total_participants": total,
+        "experience_breakdown": column_counts(data_file, "AI_Experience"),
+        "confidence_breakdown": column_counts(data_file, "Programming_Confidence"),
+        "top_domains": dict(list(domains.items())[:top_domains]),
+    }
+
+def idea_clusters(data_file: str) -> IdeaClusterer:
+    """The data file's idea clusterer, brought up to date with the dataset."""
+    clusterer = clusterer_for(data_file)
+    return clusterer.update(column_counts(data_file, "Project_Idea"), version=dataset_version(data_file))
+
+def local_interest_clusters(data_file: str, limit: int = 8) -> dict:
+    """Groups project ideas into themes without an LLM (see agents/clustering.py)."""
+    return idea_clusters(data_file).summary(limit)
+
+def get_interest_clusters(data_file: str) -> str:
+    """Describes the locally computed project-idea clusters."""
+    try:
+        clusters = idea_clusters(data_file).clusters()
+    except Exception as e:
+        return f"Error: {e}"
+    return "\n".join(f"{c['label']}: {c['count']} participants, e.g. {'; '.join(c['examples'])}"
+                     for c in clusters)
+
+def _clusters_prompt(data_file: str):
+    listing = "\n".join(
+        f"- {c['label']} ({c['count']} participants), e.g. {'; '.join(c['examples'])}"
+        for c in idea_clusters(data_file).clusters()
+    )
+    return [
+        SystemMessage(content="You group workshop participants' AI project ideas into themes."),
+        HumanMessage(content=f"""
+        These project ideas were pre-clustered by keyword. Each line is a cluster
+        with its participant count and example ideas. Give each cluster a clear
+        theme name, merging clusters that share a theme, into at most 8 themes.
+        Return ONLY a JSON object mapping a short theme name to the number of participants in it.
+
+        {listing}
+        """),
+    ]
+
+def _parse_json_reply(message) -> dict:
+    text = _message_text(message)
+    # Clean up code blocks if present
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+
+def _message_text(message):
+    """Flattens a chat message's content (str or list of blocks) to text."""
+    content = message.content
+    if isinstance(content, list):
+        return " ".join([block['text'] for block in content if 'text' in block])
+    return content
+
+
+class _StreamEvents:
+    """
+    Turns LangGraph ("messages", "updates") stream items into dashboard events.
+    Tokens come from the agent node's message chunks; tool calls and results
+    come from the node updates, where they arrive complete.
+    """
+
+    def __init__(self):
+        self.last_message = None
+        self.llm_calls = 0
+
+    def feed(self, mode, data):
+        if mode == "messages":
+            chunk, metadata = data
+            if metadata.get("langgraph_node") == "agent" and isinstance(chunk, AIMessage):
+                text = _message_text(chunk)
+                if text:
+                    yield {"type": "token", "text": text}
+            return
+
+        for node, update in (data or {}).items():
+            for message in (update or {}).get("messages", []):
+                if isinstance(message, AIMessage):
+                    self.last_message = message
+                    self.llm_calls += 1
+                    for call in message.tool_calls:
+                        yield {"type": "tool_call", "name": call["name"], "args": call["args"]}
+                elif isinstance(message, ToolMessage):
+                    yield {"type": "tool_result", "name": message.name}
+
+    def done(self):
+        answer = _message_text(self.last_message) if self.last_message is not None else ""
+        return {"type": "done", "answer": answer}
+
+
+def _trim_history(max_turns):
+    """
+    Pre-model hook that keeps a thread to its last `max_turns` questions
+    and what followed them. The cut is always at a question, so a tool
+    call is never separated from its result; older turns are removed from
+    the stored thread, not just from the prompt.
+    """
+    def hook(state):
+        messages = state["messages"]
+        questions = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+        if len(questions) <= max_turns:
+            return {}
+        start = questions[-max_turns]
+        system = [m for m in messages[:start] if isinstance(m, SystemMessage)]
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *system, *messages[start:]]}
+    return hook
+
+
+def _llm_calls(messages):
+    """Number of model turns since the last question in a thread."""
+    calls = 0
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        calls += isinstance(message, AIMessage)
+    return max(calls, 1)
+
+
 # --- Agent ---
 class AnalyticsAgent:
-    def __init__(self, data_file='data/responses.xlsx'):
+    def __init__(self, data_file='data/responses.xlsx', mode=None, checkpointer=None):
         self.data_file = data_file
+        self.checkpointer = checkpointer
         self.api_key = os.getenv("GEMINI_API_KEY")
+        self.mode = mode or os.getenv("ANALYTICS_MODE", "hybrid")
+        if self.mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{self.mode}'. Use one of {ANALYSIS_MODES}.")
         self.app = None
+        self.llm = None
+        # Repeated admin questions on unchanged data skip the ReAct run
+        self.answer_cache = AnswerCache(
+            ttl=float(os.getenv("ANSWER_CACHE_TTL", "600")),
+            max_entries=int(os.getenv("ANSWER_CACHE_SIZE", "256")),
+            thread_aware=os.getenv("ANSWER_CACHE_THREAD_AWARE", "1") != "0",
+        )
+        self.tool_concurrency = int(os.getenv("TOOL_CONCURRENCY", "4"))
+        # Older turns of a conversation are dropped, so a thread (and the
+        # prompt sent for it) stays bounded however long it is used
+        self.max_turns = int(os.getenv("THREAD_MAX_TURNS", "10"))
+        # Idempotent tools are memoized per dataset version
+        self.tool_cache = ToolCache(lambda: dataset_version(self.data_file),
+                                    max_entries=int(os.getenv("TOOL_CACHE_SIZE", "512")))
         
         if self.api_key:
             self._setup_graph()
@@ -107,6 +292,10 @@ class AnalyticsAgent:
             """Returns a sample of raw rows for qualitative analysis."""
             return get_raw_data(self.data_file, limit)
 
+        def _get_interest_clusters():
+            """Returns the project-idea clusters with counts and example ideas."""
+            return get_interest_clusters(self.data_file)
+
         def _generate_report():
             """Generates a text report of the analysis and returns a download link."""
             from agents.writer import WriterAgent
@@ -117,33 +306,40 @@ class AnalyticsAgent:
             writer.write_report(data)
             return "Report generated! [Download Report](/static/audience_report.txt)"
 
+        # generate_report writes a file, so it is never memoized
+        memo = self.tool_cache.wrap
         tools = [
             StructuredTool.from_function(
-                _get_dataset_info,
+                memo("get_dataset_info", _get_dataset_info),
                 name="get_dataset_info",
                 description="Get info about dataset columns and shape."
                 
             ),
             StructuredTool.from_function(
-                _count_values,
+                memo("count_values", _count_values),
                 name="count_values",
                 description="Count unique values in a column."
             ),
             StructuredTool.from_function(
-                _filter_and_count,
+                memo("filter_and_count", _filter_and_count, fold_case=("filter_val",)),
                 name="filter_and_count",
                 description="Filter data by one column and count values in another."
             ),
             StructuredTool.from_function(
-                _cross_tabulate,
+                memo("cross_tabulate", _cross_tabulate),
                 name="cross_tabulate",
                 description="Create a contingency table between two columns."
             ),
             StructuredTool.from_function(
-                _get_raw_data,
+                memo("get_raw_data", _get_raw_data),
                 name="get_raw_data",
                 description="Get raw data rows for qualitative analysis."
             ),
+            StructuredTool.from_function(
+                memo("get_interest_clusters", _get_interest_clusters),
+                name="get_interest_clusters",
+                description="Get project ideas grouped into themes, with counts and examples."
+            ),
             StructuredTool.from_function(
                 _generate_report,
                 name="generate_report",
@@ -153,6 +349,7 @@ class AnalyticsAgent:
 
         # 2. Setup LLM
         llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=self.api_key)
+        self.llm = llm
         
         system_prompt = """You are an expert Data Analyst for an AI Workshop. 
         Your goal is to provide deep, actionable insights, not just numbers.
@@ -160,29 +357,27 @@ class AnalyticsAgent:
         When asked to analyze:
         1. ALWAYS start by checking the dataset info.
         2. Look for patterns using cross-tabulation (e.g., Experience vs Confidence, Domain vs Project Idea).
-        3. Read raw project ideas to identify themes.
+        3. Use the interest clusters (and raw rows if needed) to identify project themes.
         4. Be proactive: if you see a trend, explain WHY it might be happening.
         5. Use a professional but engaging tone.
         """
 
         # 3. Create Agent
-        self.checkpointer = MemorySaver()
-        self.app = create_react_agent(llm, tools=tools, checkpointer=self.checkpointer)
-
-    def analyze(self):
-        """
-        Performs a full analysis to generate the summary JSON expected by the report writer.
-        """
-        if not self.app:
-            return {"error": "Gemini API Key missing."}
+        if self.checkpointer is None:
+            # Threads unused for CHECKPOINT_THREAD_TTL seconds are deleted from disk
+            self.checkpointer = SQLiteCheckpointer(os.getenv("CHECKPOINT_DB", "data/checkpoints.db"),
+                                                   thread_ttl=float(os.getenv("CHECKPOINT_THREAD_TTL", "86400")))
+        self.app = create_react_agent(llm, tools=tools, checkpointer=self.checkpointer,
+                                      pre_model_hook=_trim_history(self.max_turns))
 
+    def _analysis_inputs(self):
         system_prompt = """You are an expert Data Analyst for an AI Workshop. 
         Your goal is to provide deep, actionable insights, not just numbers.
         
         When asked to analyze:
         1. ALWAYS start by checking the dataset info.
         2. Look for patterns using cross-tabulation (e.g., Experience vs Confidence, Domain vs Project Idea).
-        3. Read raw project ideas to identify themes.
+        3. Use the interest clusters (and raw rows if needed) to identify project themes.
         4. Be proactive: if you see a trend, explain WHY it might be happening.
         5. Use a professional but engaging tone.
         """
@@ -193,24 +388,94 @@ class AnalyticsAgent:
         - experience_breakdown (dict)
         - confidence_breakdown (dict)
         - top_domains (dict)
-        - interest_clusters (dict - group similar project ideas)
+        - interest_clusters (dict - theme name to participant count; start from get_interest_clusters)
 
         Use the tools to get the data. Return ONLY the JSON.
         """
-        
+        return {"messages": [SystemMessage(content=system_prompt), HumanMessage(content=prompt)]}
+
+    def _run_config(self, thread_id):
+        # The prebuilt tool node runs the tool calls of one LLM turn in
+        # parallel; max_concurrency bounds its thread pool. The telemetry
+        # callback times every LLM and tool call of the run.
+        return {"configurable": {"thread_id": thread_id}, "max_concurrency": self.tool_concurrency,
+                "callbacks": [telemetry.callback()]}
+
+    def _analysis_config(self):
+        # Each analysis gets a throwaway thread, so dashboard refreshes don't
+        # pile their tool transcripts onto one ever-growing conversation.
+        return self._run_config(f"analysis-{uuid.uuid4().hex}")
+
+    def _parse_analysis(self, result):
+        return _parse_json_reply(result["messages"][-1])
+
+    def _summary(self):
+        if dataset_version(self.data_file) is None:
+            raise FileNotFoundError("Data file does not exist.")
+        return compute_summary(self.data_file)
+
+    def analyze(self, mode=None):
+        """
+        Performs a full analysis to generate the summary JSON expected by the report writer.
+        `mode` overrides the agent's analysis mode (see ANALYSIS_MODES).
+        """
+        mode = mode or self.mode
+        if mode == "llm":
+            if not self.app:
+                return {"error": "Gemini API Key missing."}
+            config = self._analysis_config()
+            try:
+                result = self.app.invoke(self._analysis_inputs(), config=config)
+                return self._parse_analysis(result)
+            except Exception as e:
+                print(f"Analysis failed: {e}")
+                return {"error": str(e)}
+            finally:
+                self.checkpointer.delete_thread(config["configurable"]["thread_id"])
+
         try:
-            inputs = {"messages": [SystemMessage(content=system_prompt), HumanMessage(content=prompt)]}
-            result = self.app.invoke(inputs,config={"configurable": {"thread_id": "admin_session"}})
-            last_msg = result["messages"][-1].content
-            if isinstance(last_msg, list):
-                last_msg = " ".join([block['text'] for block in last_msg if 'text' in block])
-            
-            # Clean up code blocks if present
-            clean_json = last_msg.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean_json)
+            summary = self._summary()
         except Exception as e:
             print(f"Analysis failed: {e}")
             return {"error": str(e)}
+        summary["interest_clusters"] = None
+        if mode == "hybrid" and self.llm:
+            try:
+                reply = self.llm.invoke(_clusters_prompt(self.data_file), config={"callbacks": [telemetry.callback()]})
+                summary["interest_clusters"] = _parse_json_reply(reply)
+            except Exception as e:
+                print(f"Interest clustering failed, using local grouping: {e}")
+        if summary["interest_clusters"] is None:
+            summary["interest_clusters"] = local_interest_clusters(self.data_file)
+        return summary
+
+    def _cached_answer(self, question, config):
+        # A thread with a checkpoint has earlier turns the answer may build on
+        has_history = (self.answer_cache.thread_aware and self.checkpointer is not None
+                       and self.checkpointer.get_tuple(config) is not None)
+        return self.answer_cache.get(question, dataset_version(self.data_file), has_history)
+
+    async def _acached_answer(self, question, config):
+        # The lookup reads the checkpoint database and stats the data files,
+        # so it runs on the loop's default executor (the admin pool under
+        # asgi.py) rather than on the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, self._cached_answer, question, config)
+
+    def _cached_turn(self, question, answer):
+        # Record the cached exchange in the thread so follow-ups still see it
+        return {"messages": [HumanMessage(content=question), AIMessage(content=answer)]}
+
+    def _remember(self, config, question, answer):
+        try:
+            self.app.update_state(config, self._cached_turn(question, answer), as_node="agent")
+        except Exception as e:
+            print(f"Could not record cached answer in thread: {e}")
+
+    async def _aremember(self, config, question, answer):
+        try:
+            await self.app.aupdate_state(config, self._cached_turn(question, answer), as_node="agent")
+        except Exception as e:
+            print(f"Could not record cached answer in thread: {e}")
 
     def query(self, question, thread_id="admin_session"):
         """
@@ -220,12 +485,90 @@ class AnalyticsAgent:
             return "I need a Gemini API Key to answer questions."
 
         try:
-            config = {"configurable": {"thread_id": thread_id}}
+            config = self._run_config(thread_id)
+            key, answer = self._cached_answer(question, config)
+            if answer is not None:
+                self._remember(config, question, answer)
+                return answer
             inputs = {"messages": [HumanMessage(content=question)]}
             result = self.app.invoke(inputs, config=config)
-            content = result["messages"][-1].content
-            if isinstance(content, list):
-                return " ".join([block['text'] for block in content if 'text' in block])
-            return content
+            answer = _message_text(result["messages"][-1])
+            self.answer_cache.put(key, answer, _llm_calls(result["messages"]))
+            return answer
+        except Exception as e:
+            return f"I encountered an error: {e}"
+
+    def _stream_inputs(self, question, thread_id):
+        config = self._run_config(thread_id)
+        inputs = {"messages": [HumanMessage(content=question)]}
+        return inputs, config
+
+    def stream_query(self, question, thread_id="admin_session"):
+        """
+        Streaming variant of `query`. Yields event dicts as the graph runs:
+        {"type": "tool_call"} / {"type": "tool_result"} for tool progress,
+        {"type": "token"} for answer text, then {"type": "done"} with the
+        full answer (or {"type": "error"}). A cached answer is a single
+        "done" event with "cached": true.
+        """
+        if not self.app:
+            yield {"type": "done", "answer": "I need a Gemini API Key to answer questions."}
+            return
+
+        try:
+            inputs, config = self._stream_inputs(question, thread_id)
+            key, answer = self._cached_answer(question, config)
+            if answer is not None:
+                self._remember(config, question, answer)
+                yield {"type": "done", "answer": answer, "cached": True}
+                return
+            events = _StreamEvents()
+            for mode, data in self.app.stream(inputs, config=config, stream_mode=["messages", "updates"]):
+                yield from events.feed(mode, data)
+            done = events.done()
+            self.answer_cache.put(key, done["answer"], max(events.llm_calls, 1))
+            yield done
+        except Exception as e:
+            yield {"type": "error", "message": f"I encountered an error: {e}"}
+
+    async def astream_query(self, question, thread_id="admin_session"):
+        """Async variant of `stream_query` for the ASGI entry point."""
+        if not self.app:
+            yield {"type": "done", "answer": "I need a Gemini API Key to answer questions."}
+            return
+
+        try:
+            inputs, config = self._stream_inputs(question, thread_id)
+            key, answer = await self._acached_answer(question, config)
+            if answer is not None:
+                await self._aremember(config, question, answer)
+                yield {"type": "done", "answer": answer, "cached": True}
+                return
+            events = _StreamEvents()
+            async for mode, data in self.app.astream(inputs, config=config, stream_mode=["messages", "updates"]):
+                for event in events.feed(mode, data):
+                    yield event
+            done = events.done()
+            self.answer_cache.put(key, done["answer"], max(events.llm_calls, 1))
+            yield done
+        except Exception as e:
+            yield {"type": "error", "message": f"I encountered an error: {e}"}
+
+    async def aquery(self, question, thread_id="admin_session"):
+        """Async variant of `query` for the ASGI entry point."""
+        if not self.app:
+            return "I need a Gemini API Key to answer questions."
+
+        try:
+            config = self._run_config(thread_id)
+            key, answer = await self._acached_answer(question, config)
+            if answer is not None:
+                await self._aremember(config, question, answer)
+                return answer
+            inputs = {"messages": [HumanMessage(content=question)]}
+            result = await self.app.ainvoke(inputs, config=config)
+            answer = _message_text(result["messages"][-1])
+            self.answer_cache.put(key, answer, _llm_calls(result["messages"]))
+            return answer
         except Exception as e:
             return f"I encountered an error: {e}"
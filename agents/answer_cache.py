@@ -0,0 +1,87 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+
+def normalize_question(question):
+    """Lower-cases and strips punctuation and extra spaces: "How many beginners?" -> "how many beginners"."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(question).lower()))
+
+
+class AnswerCache:
+    """
+    Caches admin answers keyed by (normalized question, dataset version).
+
+    Repeated questions against unchanged data are answered without a
+    ReAct run. Entries expire after `ttl` seconds and the table is an LRU
+    of `max_entries`. In thread-aware mode, a question asked in a thread
+    that already has turns bypasses the cache entirely, since its answer
+    may depend on that conversation; only answers given at the start of a
+    thread are stored and reused. Each entry
+    remembers how many LLM calls produced it, so `stats` can report the
+    calls saved.
+    """
+
+    def __init__(self, ttl=600, max_entries=256, thread_aware=True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.thread_aware = thread_aware
+        self._entries = OrderedDict()   # key -> (answer, llm_calls, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evicted = 0
+        self.llm_calls_saved = 0
+
+    def get(self, question, version, has_history=False):
+        """
+        Returns (key, answer). `answer` is None on a miss; `key` is None when
+        the question must bypass the cache (and must not be stored either).
+        `has_history` tells whether the question's thread already has turns.
+        """
+        text = normalize_question(question)
+        with self._lock:
+            if not text or version is None or (self.thread_aware and has_history):
+                self.bypassed += 1
+                return None, None
+            key = (text, version)
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[2] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return key, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.llm_calls_saved += entry[1]
+            return key, entry[0]
+
+    def put(self, key, answer, llm_calls=1):
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (answer, llm_calls, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "llm_calls_saved": self.llm_calls_saved,
+            }
@@ -0,0 +1,125 @@
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+import threading
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are built without it
+    brotli = None
+
+# Files the pages load from static/, and the pages themselves
+ASSETS = ("script.js", "admin.js", "style.css")
+PAGES = ("index.html", "admin.html")
+
+# Variants smaller than this fraction of the original are not worth sending
+MIN_SAVING = 0.9
+
+
+class Asset:
+    """One file held in memory with its precompressed variants."""
+
+    def __init__(self, name, data, mimetype=None):
+        self.name = name
+        self.mimetype = mimetype or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.variants = {"identity": data}
+        candidates = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(data, quality=11)
+        for encoding, body in candidates.items():
+            if len(body) < len(data) * MIN_SAVING:
+                self.variants[encoding] = body
+
+    def negotiate(self, accept_encodings):
+        """Returns (encoding, body) for the smallest variant the client accepts."""
+        best = ("identity", self.variants["identity"])
+        for encoding, body in self.variants.items():
+            if encoding != "identity" and accept_encodings[encoding] > 0 and len(body) < len(best[1]):
+                best = (encoding, body)
+        return best
+
+
+class AssetPipeline:
+    """
+    Serves the UI's static files from memory, fingerprinted and precompressed.
+
+    `build` reads every asset, names it by content hash (`script.3f2a1c9e.js`)
+    and prepares gzip and, if the brotli package is installed, brotli
+    variants. The HTML pages are rewritten to point at the hashed names, so
+    hashed assets can be cached forever and a deploy changes the URL rather
+    than the content behind it. Pages keep their URL and are revalidated
+    by ETag. With `reload`, files are rebuilt when they change on disk.
+    """
+
+    def __init__(self, static_dir, assets=ASSETS, pages=PAGES, prefix="/assets/", reload=False):
+        self.static_dir = static_dir
+        self.asset_names = assets
+        self.page_names = pages
+        self.prefix = prefix
+        self.reload = reload
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self.assets = {}   # hashed name -> Asset
+        self.urls = {}     # original name -> hashed URL
+        self.pages = {}    # page name -> Asset
+        self.builds = 0
+
+    def _read(self, name):
+        with open(os.path.join(self.static_dir, name), "rb") as f:
+            return f.read()
+
+    def _current_mtimes(self):
+        mtimes = []
+        for name in self.asset_names + self.page_names:
+            try:
+                mtimes.append(os.path.getmtime(os.path.join(self.static_dir, name)))
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def build(self):
+        mtimes = self._current_mtimes()   # taken first, so an edit during the build triggers another
+        assets, urls, pages = {}, {}, {}
+        for name in self.asset_names:
+            data = self._read(name)
+            stem, ext = os.path.splitext(name)
+            hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+            assets[hashed] = Asset(hashed, data, mimetypes.guess_type(name)[0])
+            urls[name] = self.prefix + hashed
+
+        # Pages refer to assets as "static/<name>" or "/static/<name>"
+        pattern = re.compile(r'(src|href)="/?static/(%s)"' % "|".join(re.escape(n) for n in self.asset_names))
+        for name in self.page_names:
+            html = self._read(name).decode("utf-8")
+            html = pattern.sub(lambda m: f'{m.group(1)}="{urls[m.group(2)]}"', html)
+            pages[name] = Asset(name, html.encode("utf-8"), "text/html")
+
+        with self._lock:
+            self.assets, self.urls, self.pages = assets, urls, pages
+            self._mtimes = mtimes
+            self.builds += 1
+        return self
+
+    def _fresh(self):
+        if self._mtimes is None or (self.reload and self._current_mtimes() != self._mtimes):
+            self.build()
+
+    def asset(self, hashed_name):
+        self._fresh()
+        return self.assets.get(hashed_name)
+
+    def page(self, name):
+        self._fresh()
+        return self.pages.get(name)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "builds": self.builds,
+                "brotli": brotli is not None,
+                "assets": {name: {enc: len(body) for enc, body in a.variants.items()}
+                           for name, a in list(self.assets.items()) + list(self.pages.items())},
+            }
@@ -0,0 +1,70 @@
+import threading
+
+# Bounded-choice answers the dashboard always aggregates.
+CATEGORICAL_COLUMNS = ["Domain", "Programming_Confidence", "AI_Experience", "Learning_Style"]
+
+# Spellings used for the choices the bot offers; other answers keep the
+# first spelling seen.
+SEED_LABELS = {
+    "Programming_Confidence": ["Low", "Medium", "High"],
+    "AI_Experience": ["Beginner", "Intermediate", "Advanced"],
+}
+
+MISSING = 0
+
+
+def normalize(value):
+    """Trims and collapses whitespace; None for missing or blank answers."""
+    if value is None or value != value:   # None or NaN
+        return None
+    label = " ".join(str(value).split())
+    return label or None
+
+
+class Vocabulary:
+    """
+    Append-only mapping between one column's labels and small integer codes.
+
+    Labels are matched after normalize() and case folding, so "medium",
+    "Medium " and "MEDIUM" share a code. Code 0 is reserved for missing
+    answers. Codes never change once handed out, so arrays encoded at
+    different times stay comparable.
+    """
+
+    def __init__(self, labels=()):
+        self.labels = [None]
+        self._codes = {}   # folded label -> code
+        self._seen = {}    # raw answer -> code, so repeated answers skip normalize()
+        self._lock = threading.Lock()
+        for label in labels:
+            self.code(label)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def code(self, value):
+        code = self._seen.get(value)
+        if code is not None:
+            return code
+        label = normalize(value)
+        if label is None:
+            return MISSING
+        key = label.casefold()
+        code = self._codes.get(key)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(key)
+                if code is None:
+                    code = self._codes[key] = len(self.labels)
+                    self.labels.append(label)
+        if isinstance(value, str):
+            self._seen[value] = code
+        return code
+
+    def label(self, code):
+        return self.labels[code]
+
+
+def vocabularies(columns=CATEGORICAL_COLUMNS):
+    """Fresh vocabularies for `columns`, seeded with the bot's spellings."""
+    return {col: Vocabulary(SEED_LABELS.get(col, ())) for col in columns}
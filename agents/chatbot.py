@@ -1,10 +1,14 @@
-import pandas as pd
 import os
-import uuid
-from datetime import datetime
+from agents import telemetry
+from agents.aggregates import aggregates_for
+from agents.rules import RuleEngine
+from agents.sessions import SessionManager
+from agents.storage import ResponseLog, log_path_for, make_record
+from agents.write_queue import WriteBehindQueue
 
 class WarmUpBot:
-    def __init__(self):
+    def __init__(self, write_behind=False, batch_size=64, flush_interval=0.05,
+                 session_ttl=1800, max_sessions=10000, session_store=None):
         self.questions = [
             "What’s your expectation for today?",
             "What’s your background domain? (e.g., Finance, Healthcare, Tech)",
@@ -13,80 +17,106 @@ class WarmUpBot:
             "What’s your experience in AI? (Beginner/Intermediate/Advanced)",
             "Do you prefer hands-on or conceptual explanations?"
         ]
-        self.sessions = {}
+        # In-progress sessions; abandoned ones expire after `session_ttl` seconds.
+        # Pass a shared `session_store` to serve participants from several processes.
+        if session_store is None:
+            session_store = SessionManager(ttl=session_ttl, max_sessions=max_sessions)
+        self.sessions = session_store
+        self.rules = RuleEngine()
         self.data_file = 'data/responses.xlsx'
+        self._log = None
+        # Optional group-commit queue: completed sessions are saved in the background
+        self.write_queue = None
+        if write_behind:
+            self.write_queue = WriteBehindQueue(self.commit, batch_size, flush_interval)
+
+    @property
+    def log(self):
+        """The append-only response log backing `data_file`."""
+        path = log_path_for(self.data_file)
+        if self._log is None or self._log.path != path:
+            self._log = ResponseLog(path)
+            self._import_legacy_xlsx()
+        return self._log
+
+    def _import_legacy_xlsx(self):
+        # Carry over responses saved to the workbook before the log existed.
+        if not self._log.segments() and os.path.exists(self.data_file):
+            self._log.import_xlsx_once(self.data_file)
 
     def get_response(self, user_id, message, user_data=None):
-        if user_id not in self.sessions:
-            self.sessions[user_id] = {'step': 0, 'responses': [], 'user_data': user_data}
+        session = self.sessions.get(user_id)
+        if session is None:
+            self.sessions.create(user_id, user_data)
             # If message is START_SESSION, just return the first question
             if message == "START_SESSION":
                  return f"Hi {user_data.get('name', 'there')}! " + self.questions[0]
             return self.questions[0]
 
-        session = self.sessions[user_id]
-        step = session['step']
-
-        # Validation & Reaction Logic
-        current_question = self.questions[step]
-        reaction = ""
-        
-        # Simple validation/reaction based on step
-        if step == 3: # Programming Confidence
-            valid_options = ["low", "medium", "high"]
-            if not any(opt in message.lower() for opt in valid_options):
-                return "Please answer with Low, Medium, or High so I can tailor the content."
-        
-        # Gibberish check (too short) - Only for Expectation (0) and Project Idea (2)
-        if len(message.split()) < 2 and step not in [1, 3, 4, 5]: 
-             return "Could you elaborate a bit more on that? I want to make sure I understand."
+        step = session.step
 
-        # Reactions
-        if "finance" in message.lower():
-            reaction = "Finance is a great domain for AI agents! 📈 "
-        elif "healthcare" in message.lower():
-            reaction = "Healthcare AI is very impactful! 🏥 "
-        elif "python" in message.lower() and "high" in message.lower():
-            reaction = "Awesome, you'll breeze through the code! 🐍 "
+        # Validation & Reaction Logic (see agents/rules.py)
+        error, reaction = self.rules.evaluate(step, message)
+        if error:
+            return error
 
         # Store the answer
         if step < len(self.questions):
-            session['responses'].append(message)
-            session['step'] += 1
+            session.responses.append(message)
+            session.step += 1
         
         # Check if we have more questions
-        if session['step'] < len(self.questions):
-            next_q = self.questions[session['step']]
+        if session.step < len(self.questions):
+            self.sessions.save(user_id, session)
+            next_q = self.questions[session.step]
             return f"{reaction}{next_q}"
         else:
             # Finished
-            self.save_response(session['responses'], session.get('user_data'))
-            del self.sessions[user_id]
+            self.save_response(session.responses, session.user_data)
+            self.sessions.complete(user_id)
             return f"{reaction}Thanks! I've recorded your profile. Sit tight, the workshop is about to begin! 🚀"
 
     def save_response(self, responses, user_data):
-        # Map responses to columns
-        columns = [
-            "Expectation", "Domain", "Project_Idea", 
-            "Programming_Confidence", "AI_Experience", "Learning_Style"
-        ]
-        
-        new_data = {col: [val] for col, val in zip(columns, responses)}
-        new_data['Timestamp'] = [datetime.now()]
-        
-        if user_data:
-            new_data['Name'] = [user_data.get('name')]
-            new_data['Email'] = [user_data.get('email')]
-        
-        # Add Unique ID
-        new_data['UUID'] = [str(uuid.uuid4())]
-        
-        df_new = pd.DataFrame(new_data)
-        
-        if os.path.exists(self.data_file):
-            df_existing = pd.read_excel(self.data_file)
-            df_final = pd.concat([df_existing, df_new], ignore_index=True)
+        record = make_record(responses, user_data)
+        if self.write_queue:
+            self.write_queue.submit(record)
         else:
-            df_final = df_new
-            
-        df_final.to_excel(self.data_file, index=False)
+            self.commit([record])
+        return record
+
+    @property
+    def aggregates(self):
+        """Running value counts and cross-tabs over the saved responses."""
+        self.log  # make sure a legacy workbook has been imported first
+        return aggregates_for(self.data_file)
+
+    def commit(self, records):
+        """Durably writes a batch of records in one append."""
+        with telemetry.span("storage", op="append"):
+            span = self.log.append(records)
+        # The records are stored now: a failure past this point must not make
+        # the write queue append them again. The aggregates catch up from
+        # the log on their next sync.
+        try:
+            self.aggregates.apply(records, span)
+        except Exception as e:
+            print(f"Aggregate update failed: {e}")
+        return span
+
+    def flush(self, timeout=None):
+        """Waits until every saved response is durable."""
+        if self.write_queue:
+            return self.write_queue.flush(timeout)
+        return True
+
+    def close(self):
+        if self.write_queue:
+            self.write_queue.close()
+
+    def export_xlsx(self):
+        """Materializes the response log to `data_file` for Excel users."""
+        self.flush()
+        log = self.log
+        self._import_legacy_xlsx()
+        with telemetry.span("storage", op="export_xlsx"):
+            return log.materialize(self.data_file)
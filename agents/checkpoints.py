@@ -0,0 +1,370 @@
+import os
+import time
+import random
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer that persists to SQLite and keeps memory flat.
+
+    Every checkpoint is written to a SQLite database (WAL mode, one
+    connection per thread and process, like SQLiteSessionStore). Only the
+    latest checkpoint of recently used threads is held in memory (checked
+    against the database's latest id, so several workers can share it): idle
+    threads are dropped after `idle_ttl` seconds or when more than
+    `max_threads` are hot, and are reloaded from disk on their next use.
+    Each thread keeps at most `max_checkpoints` checkpoints; older ones,
+    their pending writes and any channel values no longer referenced are
+    compacted away once a thread has doubled that. With `thread_ttl` set,
+    threads idle that long are deleted from disk too.
+    """
+
+    def __init__(self, path, max_checkpoints=20, max_threads=64, idle_ttl=900,
+                 thread_ttl=None, sweep_interval=60, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max_checkpoints
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        self.thread_ttl = thread_ttl
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._hot = OrderedDict()   # (thread_id, ns) -> latest checkpoint entry
+        self._last_sweep = time.time()
+        self.hits = 0
+        self.loads = 0
+        self.evicted = 0
+        self.compactions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                " thread_id TEXT, ns TEXT, checkpoint_id TEXT, parent_id TEXT,"
+                " type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB,"
+                " PRIMARY KEY (thread_id, ns, checkpoint_id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " thread_id TEXT, ns TEXT, channel TEXT, version TEXT, type TEXT, value BLOB,"
+                " PRIMARY KEY (thread_id, ns, channel, version))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS writes ("
+                " thread_id TEXT, ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER,"
+                " channel TEXT, type TEXT, value BLOB, task_path TEXT,"
+                " PRIMARY KEY (thread_id, ns, checkpoint_id, task_id, idx))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, last_used REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS threads_last_used ON threads(last_used)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # --- Loading ---
+    def _load(self, conn, thread_id, ns, checkpoint_id=None):
+        """Reads one checkpoint (the latest if no id) into a cache entry."""
+        query = ("SELECT checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata"
+                 " FROM checkpoints WHERE thread_id = ? AND ns = ?")
+        if checkpoint_id is None:
+            row = conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, ns)).fetchone()
+        else:
+            row = conn.execute(query + " AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)).fetchone()
+        if row is None:
+            return None
+        return self._entry(conn, thread_id, ns, row)
+
+    def _entry(self, conn, thread_id, ns, row):
+        checkpoint_id, parent_id, ctype, checkpoint, mtype, metadata = row
+        versions = self.serde.loads_typed((ctype, checkpoint))["channel_versions"]
+        blobs = {}
+        for channel, version in versions.items():
+            blob = conn.execute(
+                "SELECT type, value FROM blobs WHERE thread_id = ? AND ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, str(version))
+            ).fetchone()
+            if blob is not None:
+                blobs[channel] = (str(version), (blob[0], blob[1]))
+        writes = {
+            (task_id, idx): (task_id, channel, (wtype, value), task_path)
+            for task_id, idx, channel, wtype, value, task_path in conn.execute(
+                "SELECT task_id, idx, channel, type, value, task_path FROM writes"
+                " WHERE thread_id = ? AND ns = ? AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)
+            )
+        }
+        return {"id": checkpoint_id, "parent": parent_id, "checkpoint": (ctype, checkpoint),
+                "metadata": (mtype, metadata), "blobs": blobs, "writes": writes}
+
+    def _tuple(self, thread_id, ns, entry):
+        def config(checkpoint_id):
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint_id}}
+
+        checkpoint = self.serde.loads_typed(entry["checkpoint"])
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = entry["blobs"].get(channel)
+            if blob is not None and blob[0] == str(version) and blob[1][0] != "empty":
+                values[channel] = self.serde.loads_typed(blob[1])
+        writes = sorted(entry["writes"].items(), key=lambda kv: writes_sort_key(kv[1][3], *kv[0]))
+        return CheckpointTuple(
+            config=config(entry["id"]),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed(entry["metadata"]),
+            parent_config=config(entry["parent"]) if entry["parent"] else None,
+            pending_writes=[(task_id, channel, self.serde.loads_typed(value))
+                            for task_id, channel, value, _ in (w for _, w in writes)],
+        )
+
+    # --- Hot threads ---
+    def _remember(self, key, entry, now):
+        entry["last_used"] = now
+        self._hot[key] = entry
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.max_threads:
+            self._hot.popitem(last=False)
+            self.evicted += 1
+
+    def _touch(self, conn, thread_id, now):
+        conn.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, now))
+
+    def sweep(self, now=None):
+        """Drops idle threads from memory (and from disk past `thread_ttl`)."""
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        with self._lock:
+            # Ordered by last use, so idle threads are at the front.
+            while self._hot:
+                key, entry = next(iter(self._hot.items()))
+                if now - entry["last_used"] <= self.idle_ttl:
+                    break
+                self._hot.popitem(last=False)
+                self.evicted += 1
+        if self.thread_ttl is not None:
+            conn = self._conn()
+            stale = [row[0] for row in conn.execute(
+                "SELECT thread_id FROM threads WHERE last_used < ?", (now - self.thread_ttl,))]
+            for thread_id in stale:
+                self.delete_thread(thread_id)
+
+    def _maybe_sweep(self, now):
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+    # --- Compaction ---
+    def compact(self, thread_id, ns=""):
+        """Keeps the newest `max_checkpoints` checkpoints of a thread and the values they use."""
+        conn = self._conn()
+        with self._lock, conn:
+            old = [row[0] for row in conn.execute(
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND ns = ?"
+                " ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?", (thread_id, ns, self.max_checkpoints))]
+            if not old:
+                return 0
+            conn.executemany("DELETE FROM checkpoints WHERE thread_id = ? AND ns = ? AND checkpoint_id = ?",
+                             [(thread_id, ns, cid) for cid in old])
+            conn.executemany("DELETE FROM writes WHERE thread_id = ? AND ns = ? AND checkpoint_id = ?",
+                             [(thread_id, ns, cid) for cid in old])
+            used = set()
+            for ctype, checkpoint in conn.execute(
+                    "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND ns = ?", (thread_id, ns)):
+                versions = self.serde.loads_typed((ctype, checkpoint))["channel_versions"]
+                used.update((channel, str(version)) for channel, version in versions.items())
+            stored = conn.execute("SELECT channel, version FROM blobs WHERE thread_id = ? AND ns = ?",
+                                  (thread_id, ns)).fetchall()
+            conn.executemany("DELETE FROM blobs WHERE thread_id = ? AND ns = ? AND channel = ? AND version = ?",
+                             [(thread_id, ns, channel, version) for channel, version in stored
+                              if (channel, version) not in used])
+            self.compactions += 1
+        return len(old)
+
+    # --- BaseCheckpointSaver ---
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        now = time.time()
+        self._maybe_sweep(now)
+        conn = self._conn()
+        wanted = checkpoint_id
+        if wanted is None:
+            # Another worker process may have moved the thread on; the id lookup is cheap.
+            wanted = conn.execute("SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND ns = ?",
+                                  (thread_id, ns)).fetchone()[0]
+        with self._lock:
+            entry = self._hot.get((thread_id, ns))
+            if entry is not None and entry["id"] == wanted:
+                self.hits += 1
+                self._remember((thread_id, ns), entry, now)
+                return self._tuple(thread_id, ns, entry)
+
+        entry = self._load(conn, thread_id, ns, checkpoint_id)
+        if entry is None:
+            return None
+        if checkpoint_id is None:
+            with self._lock:
+                self.loads += 1
+                self._remember((thread_id, ns), entry, now)
+        return self._tuple(thread_id, ns, entry)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        query = ("SELECT thread_id, ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata"
+                 " FROM checkpoints WHERE 1 = 1")
+        params = []
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                query += " AND ns = ?"
+                params.append(config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            query += " AND checkpoint_id < ?"
+            params.append(get_checkpoint_id(before))
+        query += " ORDER BY checkpoint_id DESC"
+
+        conn = self._conn()
+        for row in conn.execute(query, params).fetchall():
+            if limit is not None and limit <= 0:
+                break
+            thread_id, ns = row[0], row[1]
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            yield self._tuple(thread_id, ns, self._entry(conn, thread_id, ns, row[2:]))
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        parent_id = config["configurable"].get("checkpoint_id")
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+        serialized = self.serde.dumps_typed(c)
+        meta = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        new_blobs = {
+            channel: (str(version), self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b""))
+            for channel, version in new_versions.items()
+        }
+        now = time.time()
+        self._maybe_sweep(now)
+
+        conn = self._conn()
+        with self._lock, conn:
+            conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (thread_id, ns, checkpoint["id"], parent_id, *serialized, *meta))
+            conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                             [(thread_id, ns, channel, version, *blob)
+                              for channel, (version, blob) in new_blobs.items()])
+            self._touch(conn, thread_id, now)
+
+            # Keep the new checkpoint hot if every value it uses is at hand.
+            previous = self._hot.pop((thread_id, ns), None)
+            blobs = dict(previous["blobs"]) if previous else {}
+            blobs.update(new_blobs)
+            if all(blobs.get(ch, (None,))[0] == str(v) for ch, v in checkpoint["channel_versions"].items()):
+                entry = {"id": checkpoint["id"], "parent": parent_id, "checkpoint": serialized,
+                         "metadata": meta, "writes": {},
+                         "blobs": {ch: blobs[ch] for ch in checkpoint["channel_versions"]}}
+                self._remember((thread_id, ns), entry, now)
+            count = conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ? AND ns = ?",
+                                 (thread_id, ns)).fetchone()[0]
+        if count >= 2 * self.max_checkpoints:
+            self.compact(thread_id, ns)
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            rows.append((thread_id, ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+                         channel, *self.serde.dumps_typed(value), task_path))
+
+        conn = self._conn()
+        with self._lock, conn:
+            # Regular writes are kept once; special ones (errors, interrupts) replace.
+            for row in rows:
+                verb = "INSERT OR IGNORE" if row[4] >= 0 else "INSERT OR REPLACE"
+                conn.execute(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            entry = self._hot.get((thread_id, ns))
+            if entry is not None and entry["id"] == checkpoint_id:
+                for row in rows:
+                    key = (task_id, row[4])
+                    if row[4] < 0 or key not in entry["writes"]:
+                        entry["writes"][key] = (task_id, row[5], (row[6], row[7]), task_path)
+
+    def delete_thread(self, thread_id):
+        conn = self._conn()
+        with self._lock, conn:
+            for table in ("checkpoints", "blobs", "writes", "threads"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [key for key in self._hot if key[0] == thread_id]:
+                del self._hot[key]
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current, channel):
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def stats(self):
+        conn = self._conn()
+        with self._lock:
+            hot = len(self._hot)
+        return {
+            "hot_threads": hot,
+            "threads": conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0],
+            "checkpoints": conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0],
+            "hits": self.hits,
+            "loads": self.loads,
+            "evicted": self.evicted,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,332 @@
+import re
+import zlib
+import threading
+from collections import Counter
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+    a an and are as at be build by can could create for from help how i in into is it
+    like make me my of on or our so some something that the this to use using want we
+    which will with would
+""".split())
+
+
+def tokenize(text):
+    """Words (minus stop words) and adjacent word pairs of a project idea."""
+    words = [w for w in TOKEN_RE.findall(str(text).lower()) if len(w) > 1 and w not in STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class _Matrix:
+    """Unit-length TF-IDF rows in CSR form (indptr, indices, data) plus row weights."""
+
+    def __init__(self, indptr, indices, data, weights):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.weights = weights
+
+    @property
+    def n(self):
+        return len(self.indptr) - 1
+
+    def take(self, rows):
+        """CSR arrays for a subset of rows."""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        pos = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return indptr, self.indices[pos], self.data[pos]
+
+
+class IdeaClusterer:
+    """
+    Groups project ideas into themes with spherical mini-batch k-means over
+    hashed TF-IDF features (words and word pairs), all in NumPy.
+
+    Ideas are deduplicated (ignoring case) and weighted by how many
+    participants gave them, so repeated answers cost nothing. `update` only
+    vectorizes ideas it has not seen and folds them into the centroids with
+    mini-batch steps; a full refit happens when the number of distinct ideas
+    has doubled since the last one, so the total work stays linear.
+    """
+
+    def __init__(self, n_clusters=8, n_features=2 ** 12, batch_size=1024, epochs=5, n_init=3,
+                 chunk_size=8192, seed=0):
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.n_features = n_features
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.keys = {}          # normalized idea -> row
+        self.examples = []      # first spelling seen per row
+        self.weights = []       # participants per row
+        self.unclustered = 0    # participants whose idea has no usable words
+        self._blocks = []       # (row lengths, bucket indices, term frequencies) per batch of new rows
+        self.df = np.zeros(self.n_features)
+        self.terms = {}         # bucket -> first term hashed into it
+        self._buckets = {}      # term -> bucket
+        self.centroids = None
+        self.center_weight = None
+        self.fitted_rows = 0
+        self.version = None
+        self._matrix = None
+
+    # --- Features ---
+    def _bucket(self, term):
+        bucket = self._buckets.get(term)
+        if bucket is None:
+            bucket = self._buckets[term] = zlib.crc32(term.encode("utf-8")) % self.n_features
+            self.terms.setdefault(bucket, term)
+        return bucket
+
+    def _add_rows(self, new):
+        """Vectorizes a batch of (key, idea, participants) not seen before."""
+        rows, buckets = [], []
+        for key, idea, weight in new:
+            terms = tokenize(idea)
+            if not terms:
+                self.unclustered += weight
+                self.keys[key] = None
+                continue
+            row = len(self.weights)
+            self.keys[key] = row
+            self.examples.append(str(idea).strip())
+            self.weights.append(weight)
+            rows.extend([row] * len(terms))
+            buckets.extend(self._bucket(term) for term in terms)
+        if not rows:
+            return
+
+        # One (row, bucket) pair per distinct term of a row, with its count
+        first = rows[0]
+        pairs, tf = np.unique(np.asarray(rows, dtype=np.int64) * self.n_features + buckets,
+                              return_counts=True)
+        indices = pairs % self.n_features
+        lengths = np.bincount(pairs // self.n_features - first)
+        self._blocks.append((lengths, indices, tf.astype(np.float64)))
+        self.df += np.bincount(indices, minlength=self.n_features)
+        self._matrix = None
+
+    def matrix(self):
+        if self._matrix is None:
+            lengths = np.concatenate([lengths for lengths, _, _ in self._blocks])
+            indptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+            indices = np.concatenate([indices for _, indices, _ in self._blocks])
+            tf = np.concatenate([tf for _, _, tf in self._blocks])
+            idf = np.log((1 + len(lengths)) / (1 + self.df)) + 1
+            data = (1 + np.log(tf)) * idf[indices]
+            norms = np.sqrt(np.add.reduceat(data ** 2, indptr[:-1]))
+            data /= np.repeat(norms, lengths)
+            self._matrix = _Matrix(indptr, indices, data, np.asarray(self.weights, dtype=np.float64))
+        else:
+            self._matrix.weights = np.asarray(self.weights, dtype=np.float64)
+        return self._matrix
+
+    # --- k-means ---
+    def _similarities(self, indptr, indices, data):
+        products = data[:, None] * self.centroids[:, indices].T
+        return np.add.reduceat(products, indptr[:-1], axis=0)
+
+    def _assign(self, m):
+        labels = np.empty(m.n, dtype=np.int64)
+        for start in range(0, m.n, self.chunk_size):
+            rows = np.arange(start, min(start + self.chunk_size, m.n))
+            labels[rows] = self._similarities(*m.take(rows)).argmax(axis=1)
+        return labels
+
+    def _row_similarity(self, m, row):
+        """Cosine similarity of every row to one row."""
+        vector = np.zeros(self.n_features)
+        lo, hi = m.indptr[row], m.indptr[row + 1]
+        vector[m.indices[lo:hi]] = m.data[lo:hi]
+        return np.add.reduceat(m.data * vector[m.indices], m.indptr[:-1])
+
+    def _init_centroids(self, m, rng):
+        """Greedy k-means++ seeding, weighted by participants per idea."""
+        k = min(self.n_clusters, m.n)
+        trials = 2 + int(np.log(k))
+        chosen = [rng.choice(m.n, p=m.weights / m.weights.sum())]
+        best = self._row_similarity(m, chosen[0])
+        while len(chosen) < k:
+            distance = np.clip(1 - best, 0, None) * m.weights
+            if distance.sum() <= 1e-12:
+                break
+            # Of a few sampled candidates, keep the one that leaves the least distance
+            candidates = rng.choice(m.n, size=trials, p=distance / distance.sum())
+            options = [np.maximum(best, self._row_similarity(m, row)) for row in candidates]
+            pick = int(np.argmin([(np.clip(1 - o, 0, None) * m.weights).sum() for o in options]))
+            chosen.append(candidates[pick])
+            best = options[pick]
+
+        self.centroids = np.zeros((len(chosen), self.n_features))
+        for c, row in enumerate(chosen):
+            lo, hi = m.indptr[row], m.indptr[row + 1]
+            self.centroids[c, m.indices[lo:hi]] = m.data[lo:hi]
+        self.center_weight = np.zeros(len(chosen))
+
+    def _step(self, m, rows):
+        """One weighted mini-batch update of the centroids."""
+        indptr, indices, data = m.take(rows)
+        assign = self._similarities(indptr, indices, data).argmax(axis=1)
+        weights = m.weights[rows]
+        lengths = np.diff(indptr)
+        k = len(self.centroids)
+
+        flat = np.repeat(assign, lengths) * self.n_features + indices
+        sums = np.bincount(flat, weights=data * np.repeat(weights, lengths),
+                           minlength=k * self.n_features).reshape(k, self.n_features)
+        batch_weight = np.bincount(assign, weights=weights, minlength=k)
+        moved = batch_weight > 0
+        total = self.center_weight + batch_weight
+        centroids = self.centroids[moved] * self.center_weight[moved, None] + sums[moved]
+        self.centroids[moved] = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.center_weight = total
+
+    def _fit(self, m):
+        """Fits from scratch, keeping the best of `n_init` seedings."""
+        rng = np.random.default_rng(self.seed)
+        best = None
+        for _ in range(self.n_init):
+            self._init_centroids(m, rng)
+            for _ in range(self.epochs):
+                # Each epoch is one pass of mini-batches; restarting the counts
+                # lets a pass move the centroids as far as the data says.
+                self.center_weight = np.zeros(len(self.centroids))
+                order = rng.permutation(m.n)
+                for start in range(0, m.n, self.batch_size):
+                    self._step(m, np.sort(order[start:start + self.batch_size]))
+            score = self._score(m)
+            if best is None or score > best[0]:
+                best = (score, self.centroids, self.center_weight)
+        _, self.centroids, self.center_weight = best
+        self.fitted_rows = m.n
+
+    def _score(self, m):
+        """Participant-weighted similarity of every idea to its centroid."""
+        score = 0.0
+        for start in range(0, m.n, self.chunk_size):
+            rows = np.arange(start, min(start + self.chunk_size, m.n))
+            score += (self._similarities(*m.take(rows)).max(axis=1) * m.weights[rows]).sum()
+        return score
+
+    def _partial_fit(self, m, rows):
+        for start in range(0, len(rows), self.batch_size):
+            self._step(m, rows[start:start + self.batch_size])
+
+    # --- Public API ---
+    def update(self, idea_counts, version=None):
+        """
+        Brings the clusters up to date with {idea: participants}. Passing the
+        dataset version makes repeated calls on unchanged data free.
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return self
+            merged = Counter()
+            spelling = {}
+            for idea, n in idea_counts.items():
+                key = str(idea).strip().lower()
+                merged[key] += int(n)
+                spelling.setdefault(key, idea)
+            if any(key not in merged for key in self.keys):
+                # Ideas disappeared (the data was reset): start over.
+                self.reset()
+
+            first_new = len(self.weights)
+            self.unclustered = 0
+            new = []
+            for key, n in merged.items():
+                row = self.keys.get(key, -1)
+                if row == -1:
+                    new.append((key, spelling[key], n))
+                elif row is None:
+                    self.unclustered += n
+                else:
+                    self.weights[row] = n
+            self._add_rows(new)
+
+            if self.weights:
+                m = self.matrix()
+                k = min(self.n_clusters, m.n)
+                if self.centroids is None or m.n >= 2 * self.fitted_rows or len(self.centroids) < k:
+                    self._fit(m)
+                elif m.n > first_new:
+                    self._partial_fit(m, np.arange(first_new, m.n))
+            self.version = version
+            return self
+
+    def _label(self, centroid):
+        """A strong word pair ("trading bot") if there is one, else the top two words."""
+        top = [b for b in np.argsort(-centroid)[:6] if centroid[b] > 0]
+        strongest = centroid[top[0]]
+        for b in top[:3]:
+            if " " in self.terms[b] and centroid[b] >= 0.8 * strongest:
+                return " ".join(w.capitalize() for w in self.terms[b].split())
+        words = [self.terms[b] for b in top if " " not in self.terms[b]][:2] or self.terms[top[0]].split()
+        return " / ".join(w.capitalize() for w in words)
+
+    def clusters(self, limit=None, examples=3):
+        """
+        Labelled clusters, largest first: [{"label", "count", "terms", "examples"}].
+        With `limit`, only that many clusters are listed; the participants of
+        the rest are counted under "Other" with the unclustered ones.
+        """
+        with self._lock:
+            result = []
+            other = self.unclustered
+            if self.weights:
+                m = self.matrix()
+                assign = self._assign(m)
+                counts = np.bincount(assign, weights=m.weights, minlength=len(self.centroids))
+                for c in np.argsort(-counts, kind="stable"):
+                    if counts[c] <= 0:
+                        continue
+                    if limit is not None and len(result) >= limit:
+                        other += int(counts[c])
+                        continue
+                    members = np.flatnonzero(assign == c)
+                    members = members[np.argsort(-m.weights[members], kind="stable")][:examples]
+                    top = np.argsort(-self.centroids[c])[:5]
+                    result.append({
+                        "label": self._label(self.centroids[c]),
+                        "count": int(counts[c]),
+                        "terms": [self.terms[b] for b in top if self.centroids[c, b] > 0],
+                        "examples": [self.examples[i] for i in members],
+                    })
+            if other:
+                result.append({"label": "Other", "count": other, "terms": [], "examples": []})
+        return result
+
+    def summary(self, limit=None):
+        """{label: participants} for the report and dashboard."""
+        summary = {}
+        for cluster in self.clusters(limit):
+            label = cluster["label"]
+            n = 2
+            while label in summary:
+                label = f"{cluster['label']} ({n})"
+                n += 1
+            summary[label] = cluster["count"]
+        return summary
+
+
+_clusterers = {}
+_clusterers_lock = threading.Lock()
+
+
+def clusterer_for(data_file):
+    """Returns the process-wide idea clusterer for a data file."""
+    with _clusterers_lock:
+        clusterer = _clusterers.get(data_file)
+        if clusterer is None:
+            clusterer = _clusterers[data_file] = IdeaClusterer()
+    return clusterer
@@ -0,0 +1,148 @@
+import os
+import threading
+
+from agents import telemetry
+from agents.storage import ResponseLog, log_path_for
+
+
+def dataset_version(data_file):
+    """
+    Returns a token identifying the current contents of a dataset, or None
+    if it does not exist. The response log is the source of truth when
+    present; otherwise the xlsx file's mtime and size are used.
+    """
+    log = ResponseLog(log_path_for(data_file))
+    if log.segments():
+        return f"log:{log.version()}"
+    try:
+        st = os.stat(data_file)
+    except FileNotFoundError:
+        return None
+    return f"xlsx:{st.st_mtime_ns}-{st.st_size}"
+
+
+def _snapshot(data_file, version):
+    """The columnar snapshot for a log-backed version, or None without pyarrow."""
+    from agents import snapshot   # pyarrow is optional and only loaded for analytics
+    if not version.startswith("log:") or not snapshot.available():
+        return None
+    with telemetry.span("storage", op="snapshot"):
+        return snapshot.snapshot_for(data_file).get(version[len("log:"):])
+
+
+def _read_dataset(data_file, version):
+    import pandas as pd
+    if version.startswith("log:"):
+        columnar = _snapshot(data_file, version)
+        if columnar is not None:
+            with telemetry.span("storage", op="read_snapshot"):
+                return columnar.frame()
+        with telemetry.span("storage", op="read_log"):
+            return ResponseLog(log_path_for(data_file)).read_frame()
+    with telemetry.span("storage", op="parse_xlsx"):
+        return pd.read_excel(data_file)
+
+
+class DatasetCache:
+    """
+    Process-wide cache of parsed datasets keyed on their version.
+
+    All analytics tools share one parsed DataFrame per data file and only
+    reparse it when the version changes. The cached frame is shared, so
+    callers must treat it as read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def get(self, data_file):
+        """Returns (version, frame); raises FileNotFoundError if there is no data."""
+        version = dataset_version(data_file)
+        if version is None:
+            raise FileNotFoundError(f"No data found for {data_file}")
+
+        with self._lock:
+            entry = self._entries.get(data_file)
+            if entry and entry[0] == version:
+                self.hits += 1
+                return entry
+            load_lock = self._load_locks.setdefault(data_file, threading.Lock())
+
+        # Only one thread parses a given file; the others wait for its result.
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(data_file)
+                if entry and entry[0] == version:
+                    self.hits += 1
+                    return entry
+            df = _read_dataset(data_file, version)
+            with self._lock:
+                if data_file in self._entries:
+                    self.reloads += 1
+                else:
+                    self.misses += 1
+                self._entries[data_file] = (version, df)
+            return version, df
+
+    def invalidate(self, data_file=None):
+        with self._lock:
+            if data_file is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(data_file, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "entries": len(self._entries),
+            }
+
+
+dataset_cache = DatasetCache()
+
+
+def load_dataset(data_file):
+    """Returns the shared, read-only DataFrame for `data_file`."""
+    return dataset_cache.get(data_file)[1]
+
+
+def load_columns(data_file, columns):
+    """
+    Returns a DataFrame with just `columns` (KeyError if one is missing).
+    With a columnar snapshot only those columns are read from the mapped
+    file; otherwise they are taken from the full parsed dataset.
+    """
+    columns = list(dict.fromkeys(columns))
+    version = dataset_version(data_file)
+    if version is None:
+        raise FileNotFoundError(f"No data found for {data_file}")
+    columnar = _snapshot(data_file, version)
+    if columnar is not None:
+        return columnar.frame(columns)
+    df = load_dataset(data_file)
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(missing[0])
+    return df[columns]
+
+
+def value_counts(data_file, column):
+    """{value: count} for one column, most common first (KeyError if it is missing)."""
+    version = dataset_version(data_file)
+    if version is None:
+        raise FileNotFoundError(f"No data found for {data_file}")
+    columnar = _snapshot(data_file, version)
+    if columnar is not None:
+        return columnar.value_counts(column)
+    df = load_dataset(data_file)
+    if column not in df.columns:
+        raise KeyError(column)
+    return {k: int(v) for k, v in df[column].value_counts().items()}
@@ -0,0 +1,40 @@
+import threading
+
+
+class Lazy:
+    """
+    Stands in for an object that is expensive to build.
+
+    `factory` runs on first attribute access (or `get()`), once, even when
+    several threads get there together. Reads and writes are then forwarded
+    to the built object, so callers use the proxy exactly like the real
+    thing. `loaded` tells whether it has been built yet without building it.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def get(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self.get(), name)
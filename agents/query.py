@@ -0,0 +1,168 @@
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from agents.categorical import MISSING, vocabularies
+from agents.dataset import dataset_cache
+
+
+class NgramIndex:
+    """
+    Inverted index from character n-grams to the strings containing them.
+
+    A substring query intersects the posting lists of its n-grams, starting
+    with the rarest, and verifies the few candidates left, so its cost
+    follows the number of matches rather than the number of strings.
+    Queries shorter than `n` scan the strings directly.
+    """
+
+    def __init__(self, texts, n=3):
+        self.n = n
+        self.texts = texts
+        postings = defaultdict(list)
+        for i, text in enumerate(texts):
+            for gram in {text[j:j + n] for j in range(len(text) - n + 1)}:
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def search(self, query):
+        """Ids of the strings containing `query`, ascending."""
+        if len(query) < self.n:
+            return np.array([i for i, text in enumerate(self.texts) if query in text], dtype=np.int32)
+        grams = {query[j:j + self.n] for j in range(len(query) - self.n + 1)}
+        lists = sorted((self.postings.get(g) for g in grams), key=lambda p: -1 if p is None else len(p))
+        if lists[0] is None:
+            return np.empty(0, dtype=np.int32)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        if len(query) == self.n:
+            return candidates
+        return np.array([i for i in candidates if query in self.texts[i]], dtype=np.int32)
+
+
+class CategoricalColumn:
+    """
+    One column as int32 codes into its distinct values (-1 for missing).
+
+    With a `vocabulary` the values are normalized through it, so the codes
+    and labels agree with the aggregate store's.
+    """
+
+    def __init__(self, values, vocabulary=None):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        if vocabulary is None:
+            self.codes = codes.astype(np.int32)
+            self.categories = [str(v) for v in uniques]
+        else:
+            # Position -1 of the lookup catches factorize's missing sentinel
+            lookup = np.array([vocabulary.code(v) for v in uniques] + [MISSING], dtype=np.int32)
+            self.codes = lookup[codes] - 1
+            self.categories = vocabulary.labels[1:]
+        self._rows = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _row_lists(self):
+        # Rows grouped by code: rows of code c are order[offsets[c + 1]:offsets[c + 2]]
+        if self._rows is None:
+            with self._lock:
+                if self._rows is None:
+                    shifted = self.codes + 1
+                    counts = np.bincount(shifted, minlength=len(self.categories) + 1)
+                    offsets = np.concatenate(([0], np.cumsum(counts)))
+                    self._rows = (np.argsort(shifted, kind="stable").astype(np.int32), offsets)
+        return self._rows
+
+    def rows_for(self, codes):
+        """Row ids holding any of `codes`, ascending."""
+        order, offsets = self._row_lists()
+        parts = [order[offsets[c + 1]:offsets[c + 2]] for c in codes]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+
+    def matching_codes(self, substring):
+        """Codes of the distinct values containing `substring`, ignoring case."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = NgramIndex([c.lower() for c in self.categories])
+        return self._index.search(str(substring).lower())
+
+
+class QueryEngine:
+    """
+    Filter, group-by and count over one version of the dataset.
+
+    Columns are dictionary-encoded on first use, the categorical ones
+    through vocabularies owned by this engine, so they go away with it when
+    the data changes. A substring filter is resolved against the distinct
+    values through their n-gram index and expanded to row ids through
+    per-value row lists; counting is then a single bincount over the group
+    column's codes at those rows.
+    """
+
+    def __init__(self, frame, version=None):
+        self.frame = frame
+        self.version = version
+        self.num_rows = len(frame)
+        self.vocabulary = vocabularies()
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def column(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            if name not in self.frame.columns:
+                raise KeyError(name)
+            with self._lock:
+                column = self._columns.get(name)
+                if column is None:
+                    column = self._columns[name] = CategoricalColumn(self.frame[name], self.vocabulary.get(name))
+        return column
+
+    def where(self, column, contains):
+        """Row ids whose `column` contains `contains` (case-insensitive)."""
+        col = self.column(column)
+        return col.rows_for(col.matching_codes(contains))
+
+    def count(self, column, rows=None):
+        """{value: count} of `column` over `rows` (default: all rows), most common first."""
+        col = self.column(column)
+        codes = col.codes if rows is None else col.codes[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(col.categories))
+        present = np.flatnonzero(counts)
+        # Stable sort keeps first-seen order among equal counts, like value_counts
+        present = present[np.argsort(-counts[present], kind="stable")]
+        return {col.categories[i]: int(counts[i]) for i in present}
+
+    def crosstab(self, row_col, col_col, rows=None):
+        """{(row value, col value): count} over `rows`; pairs with a missing side are skipped."""
+        r, c = self.column(row_col), self.column(col_col)
+        r_codes, c_codes = (r.codes, c.codes) if rows is None else (r.codes[rows], c.codes[rows])
+        keep = (r_codes >= 0) & (c_codes >= 0)
+        width = len(c.categories)
+        counts = np.bincount(r_codes[keep].astype(np.int64) * width + c_codes[keep],
+                             minlength=len(r.categories) * width)
+        return {(r.categories[i // width], c.categories[i % width]): int(counts[i])
+                for i in np.flatnonzero(counts)}
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def engine_for(data_file):
+    """The QueryEngine for the current version of `data_file`, rebuilt when the data changes."""
+    version, frame = dataset_cache.get(data_file)
+    with _engines_lock:
+        engine = _engines.get(data_file)
+        # Same frame object means same data; a reload drops the old encoding with it
+        if engine is None or engine.frame is not frame:
+            engine = _engines[data_file] = QueryEngine(frame, version)
+        return engine
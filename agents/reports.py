@@ -0,0 +1,176 @@
+import os
+import json
+import html
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+RULE = "=" * 50
+DIVIDER = "-" * 50
+
+# (text heading, markdown/html heading, analytics key)
+SECTIONS = [
+    ("1️⃣ EXPERIENCE LEVELS", "Experience levels", "experience_breakdown"),
+    ("2️⃣ PROGRAMMING CONFIDENCE", "Programming confidence", "confidence_breakdown"),
+    ("3️⃣ TOP DOMAINS", "Top domains", "top_domains"),
+    ("4️⃣ INTEREST CLUSTERS (What they want to build)", "Interest clusters (what they want to build)",
+     "interest_clusters"),
+]
+TITLE = "AI Workshop - Audience Intelligence Report"
+FOOTER = "Report generated by Agent 2 (Writer Agent)"
+
+
+def content_hash(analytics_data):
+    """Stable digest of the analytics dict; equal inputs render equal reports."""
+    payload = json.dumps(analytics_data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def _items(analytics_data, key):
+    return (analytics_data.get(key) or {}).items()
+
+
+# --- Renderers ---
+def render_text(data):
+    parts = [f"\n{RULE}\n🚀 {TITLE.upper()}\n{RULE}\n\n📊 TOTAL PARTICIPANTS: {data['total_participants']}\n"]
+    for heading, _, key in SECTIONS:
+        parts.append(f"\n{DIVIDER}\n{heading}\n{DIVIDER}\n")
+        parts.extend(f"- {label}: {count}\n" for label, count in _items(data, key))
+    parts.append(f"\n{RULE}\n{FOOTER}")
+    return "".join(parts)
+
+
+def _md_cell(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def render_markdown(data):
+    parts = [f"# {TITLE}\n\n**Total participants:** {data['total_participants']}\n"]
+    for _, heading, key in SECTIONS:
+        parts.append(f"\n## {heading}\n\n| | Count |\n|---|---:|\n")
+        parts.extend(f"| {_md_cell(label)} | {count} |\n" for label, count in _items(data, key))
+    parts.append(f"\n---\n_{FOOTER}_\n")
+    return "".join(parts)
+
+
+def render_html(data):
+    parts = [
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n',
+        f"<title>{html.escape(TITLE)}</title>\n</head>\n<body>\n",
+        f"<h1>{html.escape(TITLE)}</h1>\n",
+        f"<p><strong>Total participants:</strong> {html.escape(str(data['total_participants']))}</p>\n",
+    ]
+    for _, heading, key in SECTIONS:
+        parts.append(f"<h2>{html.escape(heading)}</h2>\n<table>\n<tr><th></th><th>Count</th></tr>\n")
+        parts.extend(f"<tr><td>{html.escape(str(label))}</td><td>{html.escape(str(count))}</td></tr>\n"
+                     for label, count in _items(data, key))
+        parts.append("</table>\n")
+    parts.append(f"<footer>{html.escape(FOOTER)}</footer>\n</body>\n</html>\n")
+    return "".join(parts)
+
+
+def render_json(data):
+    return json.dumps(data, indent=2, sort_keys=True, default=str, ensure_ascii=False) + "\n"
+
+
+# format -> (file extension, mimetype, renderer)
+FORMATS = {
+    "txt": (".txt", "text/plain; charset=utf-8", render_text),
+    "md": (".md", "text/markdown; charset=utf-8", render_markdown),
+    "html": (".html", "text/html; charset=utf-8", render_html),
+    "json": (".json", "application/json", render_json),
+}
+
+
+def atomic_write(path, data):
+    """Writes bytes to `path` via a temp file and rename, so readers never see a partial file."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)   # mkstemp creates 0600; reports are served as static files
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ReportRenderer:
+    """
+    Renders analytics dicts to every report format, cached by content hash.
+
+    `render` returns (digest, body) and only runs a renderer for inputs it
+    has not seen. `publish` writes the rendered files atomically and leaves
+    a file alone when it already holds the same bytes, so repeated analyses
+    of unchanged data don't touch the disk.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # (digest, format) -> body
+        self._published = {}            # path -> digest last written there
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.hits = 0
+        self.writes = 0
+        self.skipped = 0
+
+    def render(self, analytics_data, fmt, digest=None):
+        digest = digest or content_hash(analytics_data)
+        key = (digest, fmt)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return digest, self._entries[key]
+        body = FORMATS[fmt][2](analytics_data)
+        with self._lock:
+            self.renders += 1
+            self._entries[key] = body
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return digest, body
+
+    def publish(self, analytics_data, paths):
+        """Writes each format to its path ({format: path}); returns the content digest."""
+        digest = content_hash(analytics_data)
+        for fmt, path in paths.items():
+            if self._published.get(path) == digest and os.path.exists(path):
+                with self._lock:
+                    self.skipped += 1
+                continue
+            data = self.render(analytics_data, fmt, digest)[1].encode("utf-8")
+            if self._unchanged(path, data):
+                with self._lock:
+                    self.skipped += 1
+            else:
+                atomic_write(path, data)
+                with self._lock:
+                    self.writes += 1
+            self._published[path] = digest
+        return digest
+
+    @staticmethod
+    def _unchanged(path, data):
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except OSError:
+            return False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "renders": self.renders,
+                "hits": self.hits,
+                "writes": self.writes,
+                "skipped_writes": self.skipped,
+            }
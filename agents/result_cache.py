@@ -0,0 +1,98 @@
+import threading
+
+
+class VersionedResultCache:
+    """
+    Caches the latest result of an expensive computation against the
+    dataset version it was computed from, with stale-while-revalidate.
+
+    `get(version)` returns immediately when the cached result matches the
+    version. When the data has moved on, the last good result is returned
+    at once (marked stale) and a single background refresh recomputes it;
+    concurrent callers never start a second refresh. Only when nothing has
+    been computed yet does the caller wait for the first result.
+    """
+
+    def __init__(self, compute, should_cache=None):
+        self._compute = compute
+        self._should_cache = should_cache or (lambda value: True)
+        self._cond = threading.Condition()
+        self._value = None
+        self._version = None
+        self._refreshing = False
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, version, wait=False):
+        """
+        Returns (value, version_of_value, state) with state 'fresh' or 'stale'.
+        With `wait=True` a stale result is never returned: the caller waits
+        for (or runs) the recomputation instead.
+        """
+        with self._cond:
+            if self._version is not None and self._version == version:
+                self.hits += 1
+                return self._value, self._version, "fresh"
+            if self._version is not None and not wait:
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, args=(version,), daemon=True).start()
+                return self._value, self._version, "stale"
+
+            # Nothing usable cached: compute once, other callers wait for it.
+            self.misses += 1
+            while self._refreshing:
+                self._cond.wait()
+            if self._version is not None and self._version == version:
+                return self._value, self._version, "fresh"
+            self._refreshing = True
+
+        value = self._run(version)
+        return value, version, "fresh"
+
+    def _run(self, version):
+        try:
+            value = self._compute()
+        except Exception:
+            with self._cond:
+                self._refreshing = False
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            if self._should_cache(value):
+                self._value = value
+                self._version = version
+            self._refreshing = False
+            self._cond.notify_all()
+        return value
+
+    def _refresh(self, version):
+        self.refreshes += 1
+        try:
+            self._run(version)
+        except Exception as e:
+            print(f"Background refresh failed: {e}")
+
+    def wait(self, timeout=None):
+        """Blocks until no refresh is running (used by tests)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._refreshing, timeout)
+
+    def invalidate(self):
+        with self._cond:
+            self._value = None
+            self._version = None
+
+    def stats(self):
+        with self._cond:
+            return {
+                "version": self._version,
+                "refreshing": self._refreshing,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
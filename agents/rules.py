@@ -0,0 +1,98 @@
+import re
+
+ELABORATE = "Could you elaborate a bit more on that? I want to make sure I understand."
+
+# Declarative answer rules, keyed by question step. Rules under ANY_STEP
+# apply to every question and are checked after the step's own rules.
+#
+# Validators run in order and the first failing one rejects the answer:
+#   {"any": [keywords], "error": ...}   at least one keyword must appear
+#   {"min_words": n, "error": ...}      the answer needs n or more words
+# Reactions are tried in order and the first one whose keywords all
+# appear is prepended to the next question:
+#   {"all": [keywords], "reply": ...}
+# Keywords are matched case-insensitively as substrings.
+ANY_STEP = None
+RULES = {
+    0: {  # Expectation
+        "validators": [{"min_words": 2, "error": ELABORATE}],
+    },
+    2: {  # Project idea
+        "validators": [{"min_words": 2, "error": ELABORATE}],
+    },
+    3: {  # Programming confidence
+        "validators": [{
+            "any": ["low", "medium", "high"],
+            "error": "Please answer with Low, Medium, or High so I can tailor the content.",
+        }],
+    },
+    ANY_STEP: {
+        "reactions": [
+            {"all": ["finance"], "reply": "Finance is a great domain for AI agents! 📈 "},
+            {"all": ["healthcare"], "reply": "Healthcare AI is very impactful! 🏥 "},
+            {"all": ["python", "high"], "reply": "Awesome, you'll breeze through the code! 🐍 "},
+        ],
+    },
+}
+
+
+class RuleEngine:
+    """
+    Compiles the rules table into a single multi-pattern matcher.
+
+    Every keyword in the table goes into one regex that is run once over
+    the lower-cased message, so the per-message cost does not grow with the
+    number of rules. The regex tries the longest keyword first at each
+    position; shorter keywords that are prefixes of it are added from a
+    table built at compile time, so overlapping keywords are all found.
+    """
+
+    def __init__(self, rules=RULES):
+        self.rules = {}
+        common = rules.get(ANY_STEP, {})
+        steps = [s for s in rules if s is not ANY_STEP]
+        for step in steps + [ANY_STEP]:
+            own = rules.get(step, {}) if step is not ANY_STEP else {}
+            self.rules[step] = {
+                "validators": list(own.get("validators", [])) + list(common.get("validators", [])),
+                "reactions": list(own.get("reactions", [])) + list(common.get("reactions", [])),
+            }
+
+        keywords = set()
+        for step_rules in self.rules.values():
+            for rule in step_rules["validators"]:
+                keywords.update(kw.lower() for kw in rule.get("any", []))
+            for rule in step_rules["reactions"]:
+                keywords.update(kw.lower() for kw in rule["all"])
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._pattern = None
+        if ordered:
+            self._pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in ordered) + "))")
+        self._implied = {kw: frozenset(k for k in ordered if kw.startswith(k)) for kw in ordered}
+
+    def scan(self, message):
+        """Returns the set of table keywords that occur in `message`."""
+        hits = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(message.lower()):
+                hits |= self._implied[match.group(1)]
+        return hits
+
+    def evaluate(self, step, message):
+        """
+        Checks an answer against the rules for `step`.
+        Returns (error, reaction): `error` is None when the answer is accepted.
+        """
+        step_rules = self.rules.get(step, self.rules[ANY_STEP])
+        hits = self.scan(message)
+
+        for rule in step_rules["validators"]:
+            if "any" in rule and not any(kw.lower() in hits for kw in rule["any"]):
+                return rule["error"], ""
+            if "min_words" in rule and len(message.split()) < rule["min_words"]:
+                return rule["error"], ""
+
+        for rule in step_rules["reactions"]:
+            if all(kw.lower() in hits for kw in rule["all"]):
+                return None, rule["reply"]
+        return None, ""
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class Session:
+    """Progress of one participant through the warm-up questions."""
+    __slots__ = ('step', 'responses', 'user_data', 'last_seen')
+
+    def __init__(self, user_data=None, step=0, responses=None, last_seen=None):
+        self.step = step
+        self.responses = responses if responses is not None else []
+        self.user_data = user_data
+        self.last_seen = last_seen if last_seen is not None else time.monotonic()
+
+
+class SessionStore(ABC):
+    """
+    Interface for where WarmUpBot keeps in-progress sessions.
+
+    `get` returns a live Session (or None) and marks it used, `create`
+    starts one, `save` persists changes made to a Session after `get`,
+    and `complete` removes a session whose answers have been saved.
+    """
+
+    @abstractmethod
+    def get(self, user_id):
+        ...
+
+    @abstractmethod
+    def create(self, user_id, user_data=None):
+        ...
+
+    @abstractmethod
+    def save(self, user_id, session):
+        ...
+
+    @abstractmethod
+    def complete(self, user_id):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def stats(self):
+        ...
+
+    def __contains__(self, user_id):
+        return self.get(user_id) is not None
+
+
+class SessionManager(SessionStore):
+    """
+    Bounded in-process table of in-progress sessions.
+
+    Sessions idle for longer than `ttl` seconds are dropped, and once
+    `max_sessions` are live the least recently used one makes room for a
+    new one. The table is kept in last-access order, so expired sessions
+    are always at the front and the sweep (run every `sweep_interval`
+    seconds from normal traffic) only touches the ones it removes.
+    """
+
+    def __init__(self, ttl=1800, max_sessions=10000, sweep_interval=30):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.started = 0
+        self.completed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, user_id):
+        """Returns the live session for `user_id` (marking it used), or None."""
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            session = self._sessions.get(user_id)
+            if session is None:
+                return None
+            if now - session.last_seen > self.ttl:
+                del self._sessions[user_id]
+                self.expired += 1
+                return None
+            session.last_seen = now
+            self._sessions.move_to_end(user_id)
+            return session
+
+    def create(self, user_id, user_data=None):
+        now = time.monotonic()
+        session = Session(user_data, last_seen=now)
+        with self._lock:
+            self._maybe_sweep(now)
+            self._sessions[user_id] = session
+            self._sessions.move_to_end(user_id)
+            self.started += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def save(self, user_id, session):
+        # Sessions are live objects in this table: nothing to write back.
+        pass
+
+    def complete(self, user_id):
+        """Removes a session whose answers have been saved."""
+        with self._lock:
+            if self._sessions.pop(user_id, None) is not None:
+                self.completed += 1
+
+    def sweep(self, now=None):
+        """Drops every session idle for longer than the TTL. Returns how many."""
+        with self._lock:
+            return self._sweep(time.monotonic() if now is None else now)
+
+    def _maybe_sweep(self, now):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+
+    def _sweep(self, now):
+        self._last_sweep = now
+        removed = 0
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen <= self.ttl:
+                break
+            del self._sessions[user_id]
+            removed += 1
+        self.expired += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "live": len(self._sessions),
+                "started": self.started,
+                "completed": self.completed,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session table shared by every worker process on the machine.
+
+    Sessions live in a SQLite database in WAL mode, so any worker of a
+    pre-forking server can pick up a participant's next answer. Each
+    thread (and each forked process) opens its own connection lazily.
+    Idle-TTL and max-size limits match SessionManager; they are enforced
+    by an amortized sweep, and counters are kept in the database so
+    `stats` reports totals across all workers.
+    """
+
+    COUNTERS = ("started", "completed", "expired", "evicted")
+
+    def __init__(self, path, ttl=1800, max_sessions=10000, sweep_interval=30):
+        self.path = path
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " user_id TEXT PRIMARY KEY, step INTEGER, responses TEXT,"
+                " user_data TEXT, last_seen REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions(last_seen)")
+            conn.execute("CREATE TABLE IF NOT EXISTS session_stats (name TEXT PRIMARY KEY, value INTEGER)")
+            conn.executemany("INSERT OR IGNORE INTO session_stats VALUES (?, 0)",
+                             [(name,) for name in self.COUNTERS])
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _bump(self, conn, name, amount=1):
+        if amount:
+            conn.execute("UPDATE session_stats SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, user_id):
+        now = time.time()
+        conn = self._conn()
+        self._maybe_sweep(conn, now)
+        row = conn.execute(
+            "SELECT step, responses, user_data, last_seen FROM sessions WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        step, responses, user_data, last_seen = row
+        if now - last_seen > self.ttl:
+            with conn:
+                if conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,)).rowcount:
+                    self._bump(conn, "expired")
+            return None
+        with conn:
+            conn.execute("UPDATE sessions SET last_seen = ? WHERE user_id = ?", (now, user_id))
+        return Session(json.loads(user_data), step, json.loads(responses), now)
+
+    def create(self, user_id, user_data=None):
+        now = time.time()
+        session = Session(user_data, last_seen=now)
+        conn = self._conn()
+        self._maybe_sweep(conn, now)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                         (user_id, 0, "[]", json.dumps(user_data), now))
+            self._bump(conn, "started")
+        return session
+
+    def save(self, user_id, session):
+        session.last_seen = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE sessions SET step = ?, responses = ?, last_seen = ? WHERE user_id = ?",
+                (session.step, json.dumps(session.responses), session.last_seen, user_id)
+            )
+
+    def complete(self, user_id):
+        conn = self._conn()
+        with conn:
+            if conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,)).rowcount:
+                self._bump(conn, "completed")
+
+    def sweep(self, now=None):
+        """Drops idle sessions and trims the table to `max_sessions`. Returns how many."""
+        return self._sweep(self._conn(), time.time() if now is None else now)
+
+    def _maybe_sweep(self, conn, now):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(conn, now)
+
+    def _sweep(self, conn, now):
+        self._last_sweep = now
+        with conn:
+            expired = conn.execute("DELETE FROM sessions WHERE last_seen < ?", (now - self.ttl,)).rowcount
+            self._bump(conn, "expired", expired)
+            live = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            evicted = 0
+            if live > self.max_sessions:
+                evicted = conn.execute(
+                    "DELETE FROM sessions WHERE user_id IN"
+                    " (SELECT user_id FROM sessions ORDER BY last_seen LIMIT ?)",
+                    (live - self.max_sessions,)
+                ).rowcount
+                self._bump(conn, "evicted", evicted)
+        return expired + evicted
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions")
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def stats(self):
+        conn = self._conn()
+        stats = {"live": conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]}
+        stats.update(conn.execute("SELECT name, value FROM session_stats").fetchall())
+        return stats
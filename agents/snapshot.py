@@ -0,0 +1,189 @@
+import os
+import glob
+import json
+import threading
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:  # optional: reads fall back to parsing the log
+    pa = None
+
+from agents.storage import SCHEMA, ResponseLog, log_path_for
+
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".arrow"
+
+
+def available():
+    return pa is not None
+
+
+class ColumnarSnapshot:
+    """
+    The response log at one version as an uncompressed Arrow IPC file.
+
+    Reads go through a memory map and only the requested columns are
+    materialized, so `value_counts("Domain")` touches that column's
+    buffers and nothing else. The mapping is read-only and backed by the
+    page cache, so every process reading the same snapshot shares it.
+    The log position the snapshot covers is kept in its schema metadata;
+    the next version is built from it plus the records appended since.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._table = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self):
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    source = pa.memory_map(self.path, "r")
+                    self._table = pa.ipc.open_file(source).read_all()
+        return self._table
+
+    @property
+    def position(self):
+        raw = (self.table.schema.metadata or {}).get(b"log_position")
+        return tuple(json.loads(raw)) if raw else None
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    def columns(self, names):
+        """Projects the table onto `names`; raises KeyError for unknown columns."""
+        missing = [n for n in names if n not in self.table.column_names]
+        if missing:
+            raise KeyError(missing[0])
+        return self.table.select(names)
+
+    def frame(self, columns=None):
+        table = self.table if columns is None else self.columns(columns)
+        df = table.to_pandas()
+        if 'Timestamp' in df.columns:
+            import pandas as pd
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        return df
+
+    def value_counts(self, column):
+        """{value: count}, most common first, computed on the mapped column."""
+        counts = pc.value_counts(self.columns([column]).column(0).drop_null())
+        pairs = zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist())
+        return dict(sorted(pairs, key=lambda pair: -pair[1]))
+
+
+def _records_table(records):
+    arrays = [pa.array([None if r.get(col) is None else str(r.get(col)) for r in records], type=pa.string())
+              for col in SCHEMA]
+    return pa.Table.from_arrays(arrays, names=SCHEMA)
+
+
+def _write(path, table, position):
+    table = table.replace_schema_metadata({b"log_position": json.dumps(position).encode()})
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    """Keeps the Arrow snapshot of one response log in step with the log."""
+
+    def __init__(self, log):
+        self.log = log
+        self._current = None   # (version, ColumnarSnapshot)
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.incremental_builds = 0
+
+    def path_for(self, version):
+        return os.path.join(self.log.path, f"{SNAPSHOT_PREFIX}{version}{SNAPSHOT_SUFFIX}")
+
+    def get(self, version=None):
+        """Returns the snapshot for the log's current version, building it if needed."""
+        version = version or self.log.version()
+        current = self._current
+        if current and current[0] == version:
+            return current[1]
+        with self._lock:
+            if self._current and self._current[0] == version:
+                return self._current[1]
+            path = self.path_for(version)
+            if not os.path.exists(path):
+                # Another process may have written it already; otherwise build it
+                self._build(path, self._current[1] if self._current else self._latest_on_disk())
+            snapshot = ColumnarSnapshot(path)
+            snapshot.table   # map it now, before another process can replace it
+            self._current = (version, snapshot)
+            self._remove_stale(path)
+            return snapshot
+
+    def _latest_on_disk(self):
+        paths = sorted(glob.glob(os.path.join(self.log.path, f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")),
+                       key=os.path.getmtime)
+        return ColumnarSnapshot(paths[-1]) if paths else None
+
+    def _reusable(self, previous):
+        """True if `previous` covers a prefix of the log as it is now."""
+        try:
+            position = previous.position
+        except (OSError, pa.ArrowInvalid):
+            return False
+        if position is None:
+            return False
+        name, offset = position
+        segment = os.path.join(self.log.path, name)
+        return os.path.exists(segment) and os.path.getsize(segment) >= offset
+
+    def _build(self, path, previous):
+        if previous is not None and self._reusable(previous):
+            records, position = self.log.scan(previous.position)
+            table = previous.table.replace_schema_metadata(None)
+            if records:
+                table = pa.concat_tables([table, _records_table(records)])
+            self.incremental_builds += 1
+        else:
+            records, position = self.log.scan()
+            table = _records_table(records)
+        _write(path, table, position)
+        self.builds += 1
+
+    def _remove_stale(self, keep):
+        # Only older snapshots go; readers that still map one keep their
+        # pages until they drop it.
+        cutoff = os.path.getmtime(keep)
+        for path in glob.glob(os.path.join(self.log.path, f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")):
+            try:
+                if path != keep and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass   # already removed by another process
+
+    def stats(self):
+        current = self._current
+        return {
+            "version": current[0] if current else None,
+            "rows": current[1].num_rows if current else None,
+            "builds": self.builds,
+            "incremental_builds": self.incremental_builds,
+        }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def snapshot_for(data_file):
+    """Returns the shared SnapshotStore for a data file's response log."""
+    path = log_path_for(data_file)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SnapshotStore(ResponseLog(path))
+        return store
@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: appends rely on the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Fixed schema of a stored response: the six answers plus bookkeeping columns.
+ANSWER_COLUMNS = [
+    "Expectation", "Domain", "Project_Idea",
+    "Programming_Confidence", "AI_Experience", "Learning_Style"
+]
+SCHEMA = ANSWER_COLUMNS + ["Timestamp", "Name", "Email", "UUID"]
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+IMPORT_LOCK = "import.lock"
+
+
+def log_path_for(data_file):
+    """Returns the log directory that backs an xlsx export path."""
+    return os.path.splitext(data_file)[0] + ".log"
+
+
+def make_record(responses, user_data=None):
+    """Builds a schema-conformant record from the bot's answers."""
+    record = {col: None for col in SCHEMA}
+    for col, val in zip(ANSWER_COLUMNS, responses):
+        record[col] = val
+    record['Timestamp'] = datetime.now().isoformat()
+    if user_data:
+        record['Name'] = user_data.get('name')
+        record['Email'] = user_data.get('email')
+    record['UUID'] = str(uuid.uuid4())
+    return record
+
+
+class ResponseLog:
+    """
+    Append-only, segmented store of survey responses.
+
+    Every record is one JSON line. Appends open the active segment with
+    O_APPEND, write the whole batch with a single write() and fsync before
+    returning, so their cost does not depend on how much is already stored.
+    A segment is closed once it grows past `segment_bytes` and a new one is
+    started. Readers skip a torn trailing line left by a crash mid-write.
+    """
+
+    def __init__(self, path, segment_bytes=4 * 1024 * 1024):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._active = None
+        self._exported_version = None
+
+    # --- Segments ---
+    def segments(self):
+        if not os.path.isdir(self.path):
+            return []
+        names = [n for n in os.listdir(self.path)
+                 if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)]
+        return sorted(names)
+
+    def _segment_name(self, index):
+        return f"{SEGMENT_PREFIX}{index:015d}{SEGMENT_SUFFIX}"
+
+    def _segment_index(self, name):
+        return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def _active_segment(self):
+        """Returns the segment new records go to, rolling over when it is full."""
+        if self._active is not None:
+            try:
+                size = os.stat(os.path.join(self.path, self._active)).st_size
+            except FileNotFoundError:
+                # The directory was removed underneath us (e.g. a reset).
+                self._active = None
+            else:
+                if size < self.segment_bytes:
+                    return self._active
+
+        os.makedirs(self.path, exist_ok=True)
+        segments = self.segments()
+        if not segments:
+            # Number a fresh log from the clock so positions taken in a log
+            # that has since been cleared never match the new segments.
+            self._active = self._segment_name(time.time_ns() // 1_000_000)
+        else:
+            last = segments[-1]
+            size = os.path.getsize(os.path.join(self.path, last))
+            if size < self.segment_bytes:
+                self._active = last
+            else:
+                self._active = self._segment_name(self._segment_index(last) + 1)
+        return self._active
+
+    # --- Writes ---
+    def append(self, records):
+        """
+        Durably appends a batch of records and returns the (start, end)
+        log positions it occupies.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        if not records:
+            return None
+        payload = "".join(
+            json.dumps({col: rec.get(col) for col in SCHEMA}, default=str) + "\n"
+            for rec in records
+        ).encode("utf-8")
+
+        with self._lock:
+            name = self._active_segment()
+            fd = os.open(os.path.join(self.path, name),
+                         os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    # Writers in other processes hold it while writing, so
+                    # an unterminated tail seen under it was left by a crash
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._truncate_torn_tail(fd, name)
+                start = os.fstat(fd).st_size
+                try:
+                    os.write(fd, payload)
+                    os.fsync(fd)
+                except OSError:
+                    # All or nothing, so a caller retrying the batch does not store it twice
+                    os.ftruncate(fd, start)
+                    raise
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+            finally:
+                os.close(fd)
+        return (name, end - len(payload)), (name, end)
+
+    def _truncate_torn_tail(self, fd, name):
+        """Cuts a partial last line (a crash mid-write) so the next record starts on its own line."""
+        size = os.fstat(fd).st_size
+        if not size or os.pread(fd, 1, size - 1) == b"\n":
+            return
+        end = size
+        while end > 0:
+            start = max(0, end - 65536)
+            cut = os.pread(fd, end - start, start).rfind(b"\n")
+            if cut >= 0:
+                end = start + cut + 1
+                break
+            end = start
+        logger.warning("Dropping %d bytes of a torn record at the end of %s", size - end, name)
+        os.ftruncate(fd, end)
+
+    def clear(self):
+        # The directory only holds segments and files derived from them
+        # (columnar snapshots), so everything in it goes.
+        with self._lock:
+            if os.path.isdir(self.path):
+                for name in os.listdir(self.path):
+                    os.remove(os.path.join(self.path, name))
+            self._active = None
+            self._exported_version = None
+
+    # --- Reads ---
+    def version(self):
+        """
+        A cheap token that changes whenever records are appended. It is read
+        from the filesystem, so appends made by other processes are seen too.
+        """
+        segments = self.segments()
+        if not segments:
+            return "0"
+        last = segments[-1]
+        st = os.stat(os.path.join(self.path, last))
+        return f"{self._segment_index(last)}-{st.st_size}-{st.st_mtime_ns}"
+
+    def scan(self, position=None):
+        """
+        Reads every complete record after `position` (as returned by
+        `append` or a previous `scan`). Returns (records, new_position).
+        """
+        records = []
+        segments = self.segments()
+        start_name, start_offset = position if position else (None, 0)
+        if start_name is not None and start_name not in segments:
+            # The log was cleared or rewritten: start over.
+            start_name, start_offset = None, 0
+
+        end = position if start_name is not None else None
+        for name in segments:
+            if start_name is not None and name < start_name:
+                continue
+            offset = start_offset if name == start_name else 0
+            with open(os.path.join(self.path, name), "rb") as f:
+                f.seek(offset)
+                data = f.read()
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines():
+                if line.strip():
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        logger.warning("Skipping an undecodable record in %s: %.80r", name, line)
+            end = (name, offset + complete)
+        return records, end
+
+    def read_records(self):
+        records, _ = self.scan()
+        return records
+
+    def count(self):
+        return len(self.read_records())
+
+    def read_frame(self):
+        import pandas as pd
+        df = pd.DataFrame(self.read_records(), columns=SCHEMA)
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        return df
+
+    # --- Export ---
+    def materialize(self, xlsx_path):
+        """
+        Writes the whole log out as an xlsx workbook for people who open the
+        data in Excel. Skipped when nothing was appended since the last export.
+        Returns True if the file was (re)written.
+        """
+        version = self.version()
+        if version == self._exported_version and os.path.exists(xlsx_path):
+            return False
+        df = self.read_frame()
+        directory = os.path.dirname(xlsx_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{xlsx_path}.{os.getpid()}.tmp.xlsx"
+        df.to_excel(tmp_path, index=False)
+        os.replace(tmp_path, xlsx_path)
+        self._exported_version = version
+        return True
+
+    def import_xlsx_once(self, xlsx_path):
+        """
+        Seeds the log from a workbook unless it already has records. Workers
+        starting together serialize on a lock file, and the ones that get it
+        after the first find the log seeded and import nothing.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, IMPORT_LOCK), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if self.segments():
+                return 0
+            return self.import_xlsx(xlsx_path)
+
+    def import_xlsx(self, xlsx_path):
+        """Seeds the log from an existing workbook (one-off migration)."""
+        import pandas as pd
+        df = pd.read_excel(xlsx_path)
+        df = df.astype(object).where(df.notna(), None)
+        records = [{col: row.get(col) for col in SCHEMA}
+                   for row in df.to_dict(orient='records')]
+        self.append(records)
+        self._exported_version = self.version()
+        return len(records)
@@ -0,0 +1,264 @@
+"""
+Lightweight tracing and Prometheus metrics.
+
+`span(kind, **labels)` times a block of work: the duration goes into the
+`<kind>_duration_seconds` histogram and `<kind>_total` counts it by
+status. Spans opened while a trace is active (one per HTTP request) are
+also kept on that trace, and recent traces can be inspected by id. LLM
+and tool calls inside LangGraph runs are timed by `callback()`.
+Everything is in-process and dependency free; `render()` produces the
+Prometheus text format served on /metrics.
+"""
+import re
+import time
+import uuid
+import bisect
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+# Incoming X-Trace-Id values are reused only if they look like an id
+TRACE_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels(key + (('le', bound),))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(key + (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_labels(key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help)
+        return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def histogram(self, name, help=""):
+        return self._get(Histogram, name, help)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in sorted(metrics, key=lambda m: m.name):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+SPAN_HELP = {
+    "http_request": "HTTP requests handled",
+    "llm_call": "LLM round trips",
+    "tool_call": "Agent tool calls",
+    "storage": "Storage operations (log appends, dataset parses, exports)",
+}
+
+
+# --- Traces ---
+class Trace:
+    MAX_SPANS = 256
+
+    def __init__(self, trace_id=None):
+        if not (trace_id and TRACE_ID_RE.match(trace_id)):
+            trace_id = uuid.uuid4().hex[:16]
+        self.id = trace_id
+        self.started = time.time()
+        self.spans = []
+
+    def add(self, kind, labels, seconds, status):
+        if len(self.spans) < self.MAX_SPANS:
+            self.spans.append({"kind": kind, "labels": labels, "ms": round(seconds * 1000, 3), "status": status})
+
+    def to_dict(self):
+        return {"trace_id": self.id, "started": self.started, "spans": list(self.spans)}
+
+
+_current = contextvars.ContextVar("trace", default=None)
+_recent = deque(maxlen=200)
+_recent_lock = threading.Lock()
+
+
+def current_trace():
+    return _current.get()
+
+
+def start_trace(trace_id=None):
+    """Starts a trace for the current request; returns (trace, token for end_trace)."""
+    trace = Trace(trace_id)
+    return trace, _current.set(trace)
+
+
+def end_trace(token):
+    trace = _current.get()
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Streamed responses may finish in a different context
+        _current.set(None)
+    if trace is not None:
+        with _recent_lock:
+            _recent.append(trace)
+
+
+def recent_traces(limit=20):
+    with _recent_lock:
+        return [t.to_dict() for t in list(_recent)[-limit:]][::-1]
+
+
+def find_trace(trace_id):
+    with _recent_lock:
+        for trace in _recent:
+            if trace.id == trace_id:
+                return trace.to_dict()
+    return None
+
+
+# --- Spans ---
+def record(kind, seconds, status="ok", **labels):
+    REGISTRY.histogram(f"{kind}_duration_seconds", SPAN_HELP.get(kind, kind)).observe(seconds, **labels)
+    REGISTRY.counter(f"{kind}_total", SPAN_HELP.get(kind, kind)).inc(status=status, **labels)
+    trace = _current.get()
+    if trace is not None:
+        trace.add(kind, labels, seconds, status)
+
+
+@contextmanager
+def span(kind, **labels):
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        record(kind, time.perf_counter() - start, status, **labels)
+
+
+class CallTimer:
+    """Times LLM and tool calls made inside LangChain / LangGraph runs."""
+
+    def __init__(self):
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        model = (metadata or {}).get("ls_model_name", "unknown")
+        self._started[run_id] = (time.perf_counter(), "llm_call", {"model": model})
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        model = (metadata or {}).get("ls_model_name", "unknown")
+        self._started[run_id] = (time.perf_counter(), "llm_call", {"model": model})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name", "unknown")
+        self._started[run_id] = (time.perf_counter(), "tool_call", {"tool": name})
+
+    def _finish(self, run_id, status):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            start, kind, labels = started
+            record(kind, time.perf_counter() - start, status, **labels)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, "ok")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, "error")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, "error")
+
+
+_callback = None
+_callback_lock = threading.Lock()
+
+
+def callback():
+    """
+    The shared LangChain callback handler. langchain_core is only imported
+    here, so processes that never run an agent don't pay for it.
+    """
+    global _callback
+    with _callback_lock:
+        if _callback is None:
+            from langchain_core.callbacks import BaseCallbackHandler
+
+            class TelemetryCallback(CallTimer, BaseCallbackHandler):
+                pass
+
+            _callback = TelemetryCallback()
+        return _callback
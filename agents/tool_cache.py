@@ -0,0 +1,78 @@
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+
+
+class ToolCache:
+    """
+    Memoizes agent tool calls keyed by (tool name, normalized args, dataset version).
+
+    The ReAct loop tends to repeat the same lookups within a question and
+    across questions; while the dataset is unchanged those calls are
+    answered from here. Entries for older dataset versions are never hit
+    again and age out through the LRU bound. Only wrap idempotent tools.
+    """
+
+    def __init__(self, version, max_entries=512):
+        self.version = version        # callable returning the current dataset version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def wrap(self, name, func, fold_case=()):
+        """
+        Returns `func` memoized under `name`, with the same signature (so
+        StructuredTool still infers the schema). Arguments listed in
+        `fold_case` are matched case-insensitively by the tool and are
+        lower-cased for the key.
+        """
+        signature = inspect.signature(func)
+        with self._lock:
+            self._stats.setdefault(name, {"hits": 0, "misses": 0})
+
+        @functools.wraps(func)
+        def memoized(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, self._normalize(bound.arguments, fold_case), self.version())
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._stats[name]["hits"] += 1
+                    return self._entries[key]
+                self._stats[name]["misses"] += 1
+
+            result = func(*args, **kwargs)
+            if not (isinstance(result, str) and result.startswith("Error")):
+                with self._lock:
+                    self._entries[key] = result
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return result
+
+        return memoized
+
+    @staticmethod
+    def _normalize(arguments, fold_case):
+        items = []
+        for arg, value in sorted(arguments.items()):
+            if isinstance(value, str):
+                value = value.strip()
+                if arg in fold_case:
+                    value = value.lower()
+            items.append((arg, value))
+        return tuple(items)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            tools = {}
+            for name, counts in self._stats.items():
+                calls = counts["hits"] + counts["misses"]
+                tools[name] = dict(counts, hit_rate=round(counts["hits"] / calls, 3) if calls else None)
+            return {"entries": len(self._entries), "tools": tools}
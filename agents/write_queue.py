@@ -0,0 +1,160 @@
+import os
+import time
+import threading
+
+
+class WriteBehindQueue:
+    """
+    Hands completed sessions to a background flusher that group-commits them.
+
+    `submit` only appends to an in-memory list and returns, so request
+    threads never wait on disk. The flusher thread collects up to
+    `batch_size` records, waiting at most `flush_interval` seconds for a
+    batch to fill, and passes each batch to `commit` in one call. `flush`
+    is a barrier: it returns once everything submitted before the call has
+    been committed. `close` drains the queue and stops the thread.
+
+    `commit` must be all-or-nothing: a batch it raised on is retried as a
+    whole. After `max_retries` failed retries the batch is parked in
+    `failed` instead, so a persistent error cannot hold up the batches
+    behind it or the threads waiting in `flush`.
+    """
+
+    def __init__(self, commit, batch_size=64, flush_interval=0.05, name="write-behind", max_retries=3):
+        self._commit = commit
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._pending = []
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._committed = 0
+        self._settled = 0   # committed or given up on
+        self.failed = []
+        self._flush_waiters = 0
+        self._closing = False
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+        self.name = name
+        self._start()
+
+    def _start(self):
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Queues a record for commit and returns its sequence number."""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("write-behind queue is closed")
+            if self._pid != os.getpid():
+                # Forked by a pre-forking server: the flusher did not come along,
+                # and anything still pending belongs to the parent process.
+                self._pending = []
+                self._submitted = self._committed = self._settled = 0
+                self._start()
+            self._pending.append(record)
+            self._submitted += 1
+            seq = self._submitted
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+            return seq
+
+    def flush(self, timeout=None):
+        """
+        Blocks until all records submitted so far are durable. Returns False
+        on timeout, or if any of them had to be parked in `failed`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            failed_before = len(self.failed)
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._settled < target:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    if not self._thread.is_alive():
+                        return False
+                    self._cond.wait(remaining)
+                return len(self.failed) == failed_before
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout=None):
+        """Drains pending records and stops the flusher."""
+        with self._cond:
+            if self._closing and not self._thread.is_alive():
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "submitted": self._submitted,
+                "committed": self._committed,
+                "batches": self.batches,
+                "errors": self.errors,
+                "failed": len(self.failed),
+            }
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._closing:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Give the batch a chance to fill unless someone is waiting on it.
+            deadline = time.monotonic() + self.flush_interval
+            while (len(self._pending) < self.batch_size and not self._closing
+                   and not self._flush_waiters):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            return batch
+
+    def _run(self):
+        failures = 0
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._commit(batch)
+            except Exception as e:
+                print(f"Write-behind commit failed: {e}")
+                failures += 1
+                with self._cond:
+                    self.errors += 1
+                    self.last_error = e
+                    if failures <= self.max_retries:
+                        # Keep the records and retry after a short pause.
+                        self._pending[:0] = batch
+                    else:
+                        self.failed.extend(batch)
+                        self._settled += len(batch)
+                        failures = 0
+                        self._cond.notify_all()
+                        continue
+                time.sleep(self.flush_interval or 0.05)
+                continue
+            failures = 0
+            with self._cond:
+                self._committed += len(batch)
+                self._settled += len(batch)
+                self.batches += 1
+                self._cond.notify_all()
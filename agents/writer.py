@@ -1,54 +1,50 @@
+import os
+import hashlib
+import threading
+
+from agents.reports import FORMATS, ReportRenderer
+
+
 class WriterAgent:
-    def __init__(self, output_file='static/audience_report.txt'):
+    def __init__(self, output_file='static/audience_report.txt', formats=tuple(FORMATS)):
+        # The text report goes to `output_file`; the other formats are
+        # written next to it with their own extension.
         self.output_file = output_file
+        self.formats = formats
+        self.renderer = ReportRenderer()
+        self._latest = None   # (digest, analytics_data) of the last report written
+        self._lock = threading.Lock()
+
+    def path_for(self, fmt):
+        if fmt == "txt":
+            return self.output_file
+        return os.path.splitext(self.output_file)[0] + FORMATS[fmt][0]
 
     def write_report(self, analytics_data):
         if "error" in analytics_data:
             return f"Could not generate report: {analytics_data['error']}"
 
-        report = f"""
-==================================================
-🚀 AI WORKSHOP - AUDIENCE INTELLIGENCE REPORT
-==================================================
-
-📊 TOTAL PARTICIPANTS: {analytics_data['total_participants']}
-
---------------------------------------------------
-1️⃣ EXPERIENCE LEVELS
---------------------------------------------------
-"""
-        for level, count in analytics_data['experience_breakdown'].items():
-            report += f"- {level}: {count}\n"
-
-        report += """
---------------------------------------------------
-2️⃣ PROGRAMMING CONFIDENCE
---------------------------------------------------
-"""
-        for level, count in analytics_data['confidence_breakdown'].items():
-            report += f"- {level}: {count}\n"
-
-        report += """
---------------------------------------------------
-3️⃣ TOP DOMAINS
---------------------------------------------------
-"""
-        for domain, count in analytics_data['top_domains'].items():
-            report += f"- {domain}: {count}\n"
-
-        report += """
---------------------------------------------------
-4️⃣ INTEREST CLUSTERS (What they want to build)
---------------------------------------------------
-"""
-        for group, count in analytics_data['interest_clusters'].items():
-            report += f"- {group}: {count}\n"
-
-        report += "\n==================================================\n"
-        report += "Report generated by Agent 2 (Writer Agent)"
-
-        # Save to file
-        with open(self.output_file, 'w') as f:
-            f.write(report)
-
-        return report
+        digest = self.renderer.publish(analytics_data, {fmt: self.path_for(fmt) for fmt in self.formats})
+        with self._lock:
+            self._latest = (digest, analytics_data)
+        return self.renderer.render(analytics_data, "txt", digest)[1]
+
+    def report(self, fmt="txt"):
+        """
+        Returns (etag, body, mimetype) for the latest report, or None if
+        there is none. After a restart the file on disk is served instead.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}'. Use one of {tuple(FORMATS)}.")
+        mimetype = FORMATS[fmt][1]
+        with self._lock:
+            latest = self._latest
+        if latest is not None:
+            digest, body = self.renderer.render(latest[1], fmt, latest[0])
+            return f"{digest}-{fmt}", body.encode("utf-8"), mimetype
+        try:
+            with open(self.path_for(fmt), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        return hashlib.sha256(body).hexdigest()[:20], body, mimetype
@@ -1,9 +1,19 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context, g
 import os
-import pandas as pd
+import time
+import json
+import uuid
+import atexit
+import threading
+from agents import telemetry
 from agents.chatbot import WarmUpBot
-from agents.analytics import AnalyticsAgent
+from agents.assets import AssetPipeline
+from agents.lazy import Lazy
+from agents.reports import FORMATS as REPORT_FORMATS
 from agents.writer import WriterAgent
+from agents.dataset import dataset_cache, dataset_version
+from agents.result_cache import VersionedResultCache
+from agents.sessions import SQLiteSessionStore
 
 app = Flask(__name__)
 
@@ -11,49 +21,238 @@ app = Flask(__name__)
 os.makedirs('data', exist_ok=True)
 
 # Initialize Agents
-bot = WarmUpBot()
-analytics_agent = AnalyticsAgent()
+# SESSION_BACKEND=sqlite shares sessions between worker processes
+session_store = None
+if os.getenv("SESSION_BACKEND", "memory") == "sqlite":
+    session_store = SQLiteSessionStore(
+        os.getenv("SESSION_DB", "data/sessions.db"),
+        ttl=float(os.getenv("SESSION_TTL", "1800")),
+        max_sessions=int(os.getenv("MAX_SESSIONS", "10000")),
+    )
+
+# Completed sessions are group-committed by a background flusher
+bot = WarmUpBot(
+    write_behind=os.getenv("WRITE_BEHIND", "1") != "0",
+    batch_size=int(os.getenv("WRITE_BATCH_SIZE", "64")),
+    flush_interval=float(os.getenv("WRITE_FLUSH_INTERVAL", "0.05")),
+    session_ttl=float(os.getenv("SESSION_TTL", "1800")),
+    max_sessions=int(os.getenv("MAX_SESSIONS", "10000")),
+    session_store=session_store,
+)
+# How long a request waits for pending writes before giving up with a 503
+FLUSH_TIMEOUT = float(os.getenv("FLUSH_TIMEOUT", "5"))
+atexit.register(bot.close)
+# Rebuild the dashboard aggregates from storage once, up front
+bot.aggregates.sync()
 writer_agent = WriterAgent(output_file='static/audience_report.txt')
 
+def build_analytics_agent():
+    # langgraph, langchain, the Gemini client and pandas are only imported
+    # here; the participant chat never needs them.
+    from agents.analytics import AnalyticsAgent
+    return AnalyticsAgent()
+
+# Built on first admin use, or up front by warm_up()
+analytics_agent = Lazy(build_analytics_agent)
+
+def warm_up():
+    """Builds the analytics agent and loads the dataframe stack ahead of the first admin request."""
+    analytics_agent.get()
+    import pandas  # noqa: F401
+
+# WARM_UP=1 loads the admin side in the background right after boot
+if os.getenv("WARM_UP", "0") == "1":
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+# --- Tracing ---
+# Every request gets a trace id (the caller's X-Trace-Id if it sent one),
+# returned in the X-Trace-Id response header; LLM, tool and storage spans
+# opened while handling it are recorded on that trace.
+@app.before_request
+def start_request_trace():
+    g.trace, g.trace_token = telemetry.start_trace(request.headers.get('X-Trace-Id'))
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def finish_request_trace(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    telemetry.record("http_request", time.perf_counter() - g.request_started,
+                     status=str(response.status_code), method=request.method, route=route)
+    response.headers['X-Trace-Id'] = g.trace.id
+    return response
+
+@app.teardown_request
+def end_request_trace(exc):
+    token = g.pop('trace_token', None)
+    if token is not None:
+        telemetry.end_trace(token)
+
+@app.route('/metrics')
+def metrics():
+    return Response(telemetry.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/warmup', methods=['POST'])
+def admin_warmup():
+    start = time.perf_counter()
+    warm_up()
+    return jsonify({"status": "ready", "seconds": round(time.perf_counter() - start, 3)})
+
+@app.route('/api/admin/traces')
+def admin_traces():
+    trace_id = request.args.get('id')
+    if trace_id:
+        trace = telemetry.find_trace(trace_id)
+        return (jsonify(trace), 200) if trace else (jsonify({"error": "unknown trace"}), 404)
+    return jsonify(telemetry.recent_traces(int(request.args.get('limit', 20))))
+
+# --- Static assets ---
+# The UI is served from memory: scripts and styles under content-hashed
+# names with precompressed variants, pages revalidated by ETag.
+# ASSET_RELOAD=1 picks up edits to static/ without a restart.
+assets = AssetPipeline(app.static_folder, reload=os.getenv("ASSET_RELOAD", "0") == "1").build()
+
+def send_asset(asset, cache_control):
+    response = app.response_class(status=304)
+    if not request.if_none_match.contains_weak(asset.etag):
+        encoding, body = asset.negotiate(request.accept_encodings)
+        response = app.response_class(body, mimetype=asset.mimetype)
+        if encoding != "identity":
+            response.headers['Content-Encoding'] = encoding
+    # One weak ETag covers every encoding of the same content
+    response.set_etag(asset.etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.route('/assets/<name>')
+def hashed_asset(name):
+    asset = assets.asset(name)
+    if asset is None:
+        return jsonify({"error": "Unknown asset"}), 404
+    return send_asset(asset, 'public, max-age=31536000, immutable')
+
 @app.route('/')
 def index():
-    return app.send_static_file('index.html')
+    return send_asset(assets.page('index.html'), 'no-cache')
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     data = request.json
     user_message = data.get('message')
     user_data = data.get('user_data')
-    # Simple user ID simulation (IP address or session cookie would be better in prod)
-    user_id = request.remote_addr 
+    # Clients send a per-tab session id; fall back to the IP address for old clients
+    user_id = str(data.get('session_id') or request.remote_addr)[:64]
     
     response = bot.get_response(user_id, user_message, user_data)
     return jsonify({"response": response})
 
 @app.route('/admin')
 def admin():
-    return app.send_static_file('admin.html')
+    return send_asset(assets.page('admin.html'), 'no-cache')
+
+def admin_thread(data):
+    # Each dashboard tab sends its own session id and keeps its own
+    # conversation; a question without one gets a one-off thread, which
+    # the checkpointer's thread TTL removes later.
+    session_id = data.get('session_id')
+    return f"admin-{str(session_id)[:64]}" if session_id else f"admin-{uuid.uuid4().hex}"
 
 @app.route('/api/admin/chat', methods=['POST'])
 def admin_chat():
     data = request.json
     question = data.get('question')
-    # Use a static thread_id for the single admin user for now
-    answer = analytics_agent.query(question, thread_id="admin_dashboard")
+    answer = analytics_agent.query(question, thread_id=admin_thread(data))
     return jsonify({"answer": answer})
 
-@app.route('/api/analyze', methods=['POST'])
-def analyze():
-    # 1. Analyze data
+def sse(event):
+    """Formats an agent stream event as a Server-Sent Event."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.route('/api/admin/chat/stream', methods=['POST'])
+def admin_chat_stream():
+    data = request.json
+    events = analytics_agent.stream_query(data.get('question'), thread_id=admin_thread(data))
+    return Response(stream_with_context(sse(e) for e in events),
+                    mimetype='text/event-stream', headers=SSE_HEADERS)
+
+@app.route('/api/admin/stats')
+def admin_stats():
+    # Reading stats must not build the analytics agent
+    agent = analytics_agent.get() if analytics_agent.loaded else None
+    return jsonify({
+        "analysis_cache": analysis_cache.stats(),
+        "analytics_agent_loaded": agent is not None,
+        "checkpoints": agent.checkpointer.stats() if agent and agent.checkpointer else None,
+        "answer_cache": agent.answer_cache.stats() if agent else None,
+        "tool_cache": agent.tool_cache.stats() if agent else None,
+        "dataset_cache": dataset_cache.stats(),
+        "reports": writer_agent.renderer.stats(),
+        "static_assets": assets.stats(),
+        "sessions": bot.sessions.stats(),
+        "write_queue": bot.write_queue.stats() if bot.write_queue else None,
+    })
+
+def run_analysis():
+    # 1. Analyze data (straight from the response log; no xlsx export needed)
     analytics_results = analytics_agent.analyze()
     
     # 2. Write report
     report = writer_agent.write_report(analytics_results)
     
-    return jsonify({
+    return {
         "analytics": analytics_results,
         "report": report
-    })
+    }
+
+# Last analysis result, keyed on the dataset version it was computed from
+analysis_cache = VersionedResultCache(run_analysis, should_cache=lambda r: "error" not in r["analytics"])
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze():
+    # Wait for pending writes so the version covers every saved response
+    if not bot.flush(timeout=FLUSH_TIMEOUT):
+        return jsonify({"error": "Saved responses could not be written yet. Try again shortly."}), 503
+    version = dataset_version(analytics_agent.data_file) or "empty"
+    # Stale results are served while one background refresh runs, unless
+    # the client asks for a fresh one with Cache-Control: no-cache
+    result, result_version, state = analysis_cache.get(version, wait=request.cache_control.no_cache)
+
+    response = jsonify(result)
+    if "error" not in result["analytics"]:
+        if request.if_none_match.contains(result_version):
+            response = app.response_class(status=304)
+        response.set_etag(result_version)
+    response.headers['X-Analysis-State'] = state
+    return response
+
+@app.route('/api/admin/export')
+def admin_export():
+    # The xlsx workbook is only rebuilt on request; rewriting it is the
+    # slowest thing the app does, so analysis never waits on it
+    if not bot.flush(timeout=FLUSH_TIMEOUT):
+        return jsonify({"error": "Saved responses could not be written yet. Try again shortly."}), 503
+    bot.export_xlsx()
+    return send_file(os.path.abspath(bot.data_file), as_attachment=True, download_name='responses.xlsx')
+
+@app.route('/api/report')
+def report():
+    # ?format=txt|md|html|json; the ETag is the content hash of the analytics behind it
+    fmt = request.args.get('format', 'txt')
+    if fmt not in REPORT_FORMATS:
+        return jsonify({"error": f"Unknown format '{fmt}'", "formats": list(REPORT_FORMATS)}), 400
+    latest = writer_agent.report(fmt)
+    if latest is None:
+        return jsonify({"error": "No report yet. Run an analysis first."}), 404
+    etag, body, mimetype = latest
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/reset', methods=['POST'])
 def reset():
@@ -62,6 +261,11 @@ def reset():
         os.remove('data/responses.xlsx')
     if os.path.exists('data/audience_report.txt'):
         os.remove('data/audience_report.txt')
+    if not bot.flush(timeout=FLUSH_TIMEOUT):
+        return jsonify({"error": "Saved responses could not be written yet. Try again shortly."}), 503
+    bot.log.clear()
+    # Drops the counts and the vocabularies built from the old answers
+    bot.aggregates.sync()
     bot.sessions.clear()
     return jsonify({"status": "reset"})
 
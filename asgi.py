@@ -0,0 +1,250 @@
+"""
+ASGI entry point: serves the same app as app.py, but with the LLM-bound
+admin endpoints running as coroutines.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+`/api/admin/chat` awaits the LangGraph agent (`ainvoke`) on the event
+loop, and `/api/admin/chat/stream` sends its `astream` events as SSE as
+they arrive, so a slow Gemini ReAct loop holds no thread at all. Every other
+route is handed to the Flask app on a dedicated participant thread pool,
+except `/api/analyze` (answered from its versioned cache), the xlsx
+export and other
+blocking admin work such as tool calls, which run on a separate small
+admin pool.
+The analytics agent is built lazily; its first build also runs on the admin
+pool rather than on the event loop.
+Participant `/api/chat` requests therefore never queue behind LLM calls.
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from agents import telemetry
+from app import app as flask_app, bot, analytics_agent, admin_thread, sse, SSE_HEADERS
+
+def _participant_pool():
+    return ThreadPoolExecutor(max_workers=int(os.getenv("PARTICIPANT_THREADS", "32")),
+                              thread_name_prefix="participant")
+
+
+def _admin_pool():
+    return ThreadPoolExecutor(max_workers=int(os.getenv("ADMIN_THREADS", "4")), thread_name_prefix="admin")
+
+
+participant_executor = _participant_pool()
+admin_executor = _admin_pool()
+
+_started_loop = None
+
+
+def _startup():
+    global _started_loop, admin_executor, participant_executor
+    loop = asyncio.get_running_loop()
+    if loop is not _started_loop:
+        if _started_loop is not None:
+            # A finished loop shuts its default executor (the admin pool)
+            # down with it, and a lifespan shutdown closes both pools: a
+            # new loop in the same process (tests, reloaders) gets fresh ones
+            admin_executor = _admin_pool()
+            participant_executor.shutdown(wait=False)
+            participant_executor = _participant_pool()
+        # Sync tools called by the agent run on the loop's default executor:
+        # keep them on the admin pool, away from participant threads.
+        loop.set_default_executor(admin_executor)
+        _started_loop = loop
+
+
+def _shutdown():
+    bot.close()
+    participant_executor.shutdown(wait=False)
+    admin_executor.shutdown(wait=False)
+
+
+# --- Helpers ---
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def send_json(send, payload, status=200):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def build_environ(scope, body):
+    """Translates an ASGI HTTP scope into a WSGI environ."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "REMOTE_ADDR": client[0],
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def call_wsgi(wsgi_app, scope, receive, send, executor):
+    """
+    Runs a WSGI app on `executor`. Body chunks are sent as the app yields
+    them, so streaming responses keep streaming.
+    """
+    body = await read_body(receive)
+    environ = build_environ(scope, body)
+    loop = asyncio.get_running_loop()
+
+    def forward(message):
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    def run():
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+            return lambda data: None
+
+        def send_start():
+            forward({"type": "http.response.start",
+                     "status": response["status"], "headers": response["headers"]})
+
+        result = wsgi_app(environ, start_response)
+        try:
+            headers_sent = False
+            for chunk in result:
+                if not headers_sent:
+                    send_start()
+                    headers_sent = True
+                if chunk:
+                    forward({"type": "http.response.body", "body": chunk, "more_body": True})
+            if not headers_sent:
+                send_start()
+            forward({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+    await loop.run_in_executor(executor, run)
+
+
+# --- Async routes ---
+async def resolve_agent():
+    """The analytics agent; a first build (seconds of imports) runs on the admin pool, not the loop."""
+    if analytics_agent.loaded:
+        return analytics_agent.get()
+    return await asyncio.get_running_loop().run_in_executor(admin_executor, analytics_agent.get)
+
+
+async def admin_chat(scope, receive, send):
+    data = json.loads(await read_body(receive) or b"{}")
+    agent = await resolve_agent()
+    answer = await agent.aquery(data.get("question"), thread_id=admin_thread(data))
+    await send_json(send, {"answer": answer})
+
+
+async def admin_chat_stream(scope, receive, send):
+    data = json.loads(await read_body(receive) or b"{}")
+    agent = await resolve_agent()
+    headers = [(b"content-type", b"text/event-stream; charset=utf-8")]
+    headers += [(k.lower().encode(), v.encode()) for k, v in SSE_HEADERS.items()]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    async for event in agent.astream_query(data.get("question"), thread_id=admin_thread(data)):
+        await send({"type": "http.response.body", "body": sse(event).encode("utf-8"), "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+ASYNC_ROUTES = {
+    ("POST", "/api/admin/chat"): admin_chat,
+    ("POST", "/api/admin/chat/stream"): admin_chat_stream,
+}
+
+# Admin routes that stay in Flask but must not use participant threads.
+# /api/analyze is served from a versioned cache and refreshes in the background;
+# /api/admin/export rewrites the xlsx workbook.
+ADMIN_WSGI_ROUTES = {
+    ("POST", "/api/analyze"),
+    ("GET", "/api/admin/export"),
+}
+
+
+async def traced(handler, scope, receive, send):
+    """Runs an async route under a request trace, as Flask's hooks do for the rest."""
+    headers = dict(scope.get("headers", []))
+    trace, token = telemetry.start_trace(headers.get(b"x-trace-id", b"").decode("latin-1"))
+    started = time.perf_counter()
+    status = {"code": 500}
+
+    async def send_traced(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+            message = dict(message, headers=list(message.get("headers", [])) + [(b"x-trace-id", trace.id.encode())])
+        await send(message)
+
+    try:
+        await handler(scope, receive, send_traced)
+    finally:
+        telemetry.record("http_request", time.perf_counter() - started, status=str(status["code"]),
+                         method=scope["method"], route=scope["path"])
+        telemetry.end_trace(token)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                _startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                _shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+    _startup()
+    route = (scope["method"], scope["path"])
+    handler = ASYNC_ROUTES.get(route)
+    if handler is not None:
+        await traced(handler, scope, receive, send)
+    elif route in ADMIN_WSGI_ROUTES:
+        await call_wsgi(flask_app, scope, receive, send, admin_executor)
+    else:
+        await call_wsgi(flask_app, scope, receive, send, participant_executor)
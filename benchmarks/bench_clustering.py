@@ -0,0 +1,70 @@
+"""
+Project-idea clustering cost at workshop-to-conference scale.
+
+Ideas are generated from the populate_data pools with extra free-text
+words, so most of them are distinct. For each size the run measures a cold
+fit, an incremental update after 1% more participants arrive, and the
+assignment of every idea to its labelled cluster.
+
+    python -m benchmarks.bench_clustering --sizes 10000 100000
+"""
+import time
+import random
+import argparse
+from collections import Counter
+
+from agents.clustering import IdeaClusterer
+from utils.populate_data import DOMAINS, PROJECTS
+
+ADJECTIVES = ["smart", "simple", "personal", "automated", "voice", "mobile", "open source", "realtime"]
+AUDIENCES = ["students", "doctors", "small shops", "investors", "drivers", "teachers", "gamers", "families"]
+EXTRAS = [f"{word}{n}" for word in ("feature", "dataset", "module", "workflow") for n in range(250)]
+
+
+def make_ideas(n, rng):
+    ideas = Counter()
+    for _ in range(n):
+        idea = (f"I want to build a {rng.choice(ADJECTIVES)} {rng.choice(PROJECTS)} "
+                f"for {rng.choice(DOMAINS)} {rng.choice(AUDIENCES)} with {rng.choice(EXTRAS)}")
+        ideas[idea] += 1
+    return ideas
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(size, rng):
+    ideas = make_ideas(size, rng)
+    clusterer = IdeaClusterer()
+    _, cold = timed(lambda: clusterer.update(ideas, version="v1"))
+    _, unchanged = timed(lambda: clusterer.update(ideas, version="v1"))
+
+    more = ideas + make_ideas(size // 100, rng)
+    _, incremental = timed(lambda: clusterer.update(more, version="v2"))
+    clusters, assign = timed(clusterer.clusters)
+
+    print(f"\n== {size} participants, {len(more)} distinct ideas ==")
+    print(f"cold fit          {cold * 1000:9.1f}ms")
+    print(f"unchanged data    {unchanged * 1000:9.3f}ms")
+    print(f"+1% incremental   {incremental * 1000:9.1f}ms")
+    print(f"assign + label    {assign * 1000:9.1f}ms")
+    for cluster in clusters:
+        print(f"  {cluster['label']:<28} {cluster['count']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="participants per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        run(size, rng)
+
+
+if __name__ == "__main__":
+    main()
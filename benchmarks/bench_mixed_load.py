@@ -0,0 +1,148 @@
+"""
+Mixed participant + admin load: sync Flask worker pool vs the ASGI entry point.
+
+Admin questions are given a fixed simulated LLM latency (no Gemini key
+needed) and run alongside a stream of participant `/api/chat` requests.
+The sync mode serves everything from one pool of N worker threads, like
+`gunicorn --threads N`; the async mode drives `asgi.application`. The
+number to watch is participant latency while admin questions are in flight.
+
+    python -m benchmarks.bench_mixed_load --admin 8 --participants 200 --llm-latency 2
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import asgi
+from app import app, analytics_agent, bot
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def summarize(name, latencies):
+    return (f"{name:<12} n={len(latencies):<5} p50={percentile(latencies, 50) * 1000:8.1f}ms "
+            f"p95={percentile(latencies, 95) * 1000:8.1f}ms max={max(latencies) * 1000:8.1f}ms")
+
+
+def install_fake_llm(latency):
+    """Replaces the agent's LLM round trips with a fixed delay."""
+    def query(question, thread_id="admin_session"):
+        time.sleep(latency)
+        return "simulated answer"
+
+    async def aquery(question, thread_id="admin_session"):
+        await asyncio.sleep(latency)
+        return "simulated answer"
+
+    analytics_agent.query = query
+    analytics_agent.aquery = aquery
+
+
+def participant_message(i, step):
+    if step == 0:
+        return "START_SESSION"
+    return ["I want to learn about agents", "Finance", "A trading assistant",
+            "Medium", "Beginner", "Hands-on"][(step - 1) % 6]
+
+
+# --- Sync mode ---
+def run_sync(args):
+    client_local = threading.local()
+
+    def client():
+        if not hasattr(client_local, "client"):
+            client_local.client = app.test_client()
+        return client_local.client
+
+    # Latency is measured from submission, so time spent queued for a thread counts.
+    def admin_call(start):
+        client().post('/api/admin/chat', json={"question": "How many beginners?"})
+        return "admin", time.perf_counter() - start
+
+    def participant_call(i, start):
+        client().post('/api/chat', json={"message": participant_message(i, i % 7),
+                                         "user_data": {"name": f"P{i}"}},
+                      environ_base={"REMOTE_ADDR": f"10.0.{i // 250}.{i % 250}"})
+        return "participant", time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        futures = [pool.submit(admin_call, time.perf_counter()) for _ in range(args.admin)]
+        time.sleep(0.01)
+        futures += [pool.submit(participant_call, i, time.perf_counter()) for i in range(args.participants)]
+        return [f.result() for f in futures]
+
+
+# --- Async mode ---
+async def asgi_call(path, payload, client_ip="127.0.0.1"):
+    body = json.dumps(payload).encode()
+    scope = {"type": "http", "method": "POST", "path": path, "query_string": b"",
+             "headers": [(b"content-type", b"application/json")],
+             "client": (client_ip, 0), "server": ("localhost", 5000)}
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.sleep(3600)
+        received = True
+        return {"type": "http.request", "body": body}
+
+    async def send(message):
+        pass
+
+    await asgi.application(scope, receive, send)
+
+
+async def run_async(args):
+    async def admin_call():
+        start = time.perf_counter()
+        await asgi_call('/api/admin/chat', {"question": "How many beginners?"})
+        return "admin", time.perf_counter() - start
+
+    async def participant_call(i):
+        start = time.perf_counter()
+        await asgi_call('/api/chat', {"message": participant_message(i, i % 7), "user_data": {"name": f"P{i}"}},
+                        client_ip=f"10.1.{i // 250}.{i % 250}")
+        return "participant", time.perf_counter() - start
+
+    admin = [asyncio.create_task(admin_call()) for _ in range(args.admin)]
+    await asyncio.sleep(0.01)
+    participants = [asyncio.create_task(participant_call(i)) for i in range(args.participants)]
+    return await asyncio.gather(*admin, *participants)
+
+
+def report(mode, results):
+    print(f"\n== {mode} ==")
+    for kind in ("participant", "admin"):
+        latencies = [t for k, t in results if k == kind]
+        print(summarize(kind, latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--admin", type=int, default=8, help="concurrent admin questions")
+    parser.add_argument("--participants", type=int, default=200, help="participant requests")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="simulated seconds per admin question")
+    parser.add_argument("--threads", type=int, default=8, help="worker threads in sync mode")
+    args = parser.parse_args()
+
+    install_fake_llm(args.llm_latency)
+    # Keep simulated participants out of the real dataset
+    bot.data_file = os.path.join(tempfile.mkdtemp(), 'responses.xlsx')
+    report(f"sync Flask, {args.threads} threads", run_sync(args))
+    report("ASGI (asgi.application)", asyncio.run(run_async(args)))
+
+
+if __name__ == "__main__":
+    main()
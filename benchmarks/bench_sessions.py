@@ -0,0 +1,94 @@
+"""
+Session-store throughput: 1 vs N worker processes sharing participants.
+
+Every participant's answers are spread round-robin over the workers, the
+way a load balancer in front of a pre-forking server would spread them,
+so the run only completes correctly if all workers see the same sessions.
+
+    python -m benchmarks.bench_sessions --participants 2000 --workers 1 2 4
+"""
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import multiprocessing as mp
+
+from agents.chatbot import WarmUpBot
+from agents.sessions import SQLiteSessionStore
+from utils.populate_data import DOMAINS, PROJECTS, CONFIDENCE, EXPERIENCE, STYLES
+
+
+def participant_answers(rng):
+    return [
+        "START_SESSION",
+        "I want to learn about AI agents.",
+        rng.choice(DOMAINS),
+        f"I want to build a {rng.choice(PROJECTS)}",
+        rng.choice(CONFIDENCE),
+        rng.choice(EXPERIENCE),
+        rng.choice(STYLES),
+    ]
+
+
+def worker(worker_id, n_workers, participants, workdir, barrier, results):
+    store = SQLiteSessionStore(os.path.join(workdir, "sessions.db"))
+    bot = WarmUpBot(session_store=store)
+    bot.data_file = os.path.join(workdir, "responses.xlsx")
+    rng = random.Random(42)
+    answers = [participant_answers(rng) for _ in range(participants)]
+
+    barrier.wait()
+    start = time.perf_counter()
+    handled = 0
+    for step in range(7):
+        for p in range(participants):
+            if (p + step) % n_workers == worker_id:
+                bot.get_response(f"user-{p}", answers[p][step], {"name": f"User {p}"})
+                handled += 1
+        barrier.wait()
+    results.put((handled, time.perf_counter() - start))
+
+
+def run(participants, n_workers):
+    workdir = tempfile.mkdtemp()
+    try:
+        ctx = mp.get_context("fork")
+        barrier = ctx.Barrier(n_workers)
+        results = ctx.Queue()
+        procs = [ctx.Process(target=worker, args=(i, n_workers, participants, workdir, barrier, results))
+                 for i in range(n_workers)]
+        for p in procs:
+            p.start()
+        outcomes = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        requests = sum(h for h, _ in outcomes)
+        wall = max(t for _, t in outcomes)
+        bot = WarmUpBot()
+        bot.data_file = os.path.join(workdir, "responses.xlsx")
+        saved = bot.log.count()
+        return {"workers": n_workers, "requests": requests, "seconds": wall,
+                "req_per_s": requests / wall, "saved": saved}
+    finally:
+        shutil.rmtree(workdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'requests':>9} {'seconds':>8} {'req/s':>9} {'saved':>7}")
+    for n in args.workers:
+        r = run(args.participants, n)
+        print(f"{r['workers']:>8} {r['requests']:>9} {r['seconds']:>8.2f} {r['req_per_s']:>9.0f} {r['saved']:>7}")
+        if r["saved"] != args.participants:
+            print(f"⚠️ Expected {args.participants} saved responses, got {r['saved']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Wall time of LLM turns that emit several tool calls at once.
+
+Each simulated tool waits a fixed latency (like an MCP round trip or a
+slow query). The sequential loop is what the old tutorial tool_node did;
+the other columns run the analytics agent's own ReAct graph with a
+scripted model that asks for every call in one turn, at max_concurrency
+1 and N (the agent's TOOL_CONCURRENCY), synchronously and with asyncio.
+
+    python -m benchmarks.bench_tool_calls --calls 1 3 6 --latency 0.2 --workers 4
+"""
+import time
+import asyncio
+import argparse
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import create_react_agent
+
+
+def make_tool(latency):
+    def lookup(column: str) -> str:
+        """Simulated tool with a fixed latency."""
+        time.sleep(latency)
+        return f"{column}: 42"
+
+    async def alookup(column: str) -> str:
+        await asyncio.sleep(latency)
+        return f"{column}: 42"
+
+    return StructuredTool.from_function(lookup, coroutine=alookup, name="lookup", description="Look up a column.")
+
+
+def make_calls(n):
+    return [{"name": "lookup", "args": {"column": f"col{i}"}, "id": f"call-{i}"} for i in range(n)]
+
+
+class ScriptedModel(BaseChatModel):
+    """Asks for `n_calls` tool calls in one turn, then answers."""
+    n_calls: int = 3
+
+    @property
+    def _llm_type(self):
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if isinstance(messages[-1], ToolMessage):
+            message = AIMessage(content="done")
+        else:
+            message = AIMessage(content="", tool_calls=make_calls(self.n_calls))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def sequential(tool, calls):
+    return [ToolMessage(content=str(tool.invoke(c["args"])), tool_call_id=c["id"]) for c in calls]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 3, 6], help="tool calls per turn")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per tool call")
+    parser.add_argument("--workers", type=int, default=4, help="max_concurrency of the parallel runs")
+    args = parser.parse_args()
+
+    tool = make_tool(args.latency)
+    print(f"{'calls':>5} {'sequential':>10} {'agent x1':>10} {'agent xN':>10} {'async xN':>10}")
+    for n in args.calls:
+        calls = make_calls(n)
+        graph = create_react_agent(ScriptedModel(n_calls=n), tools=[tool])
+        inputs = {"messages": [HumanMessage(content="go")]}
+        parallel = {"max_concurrency": args.workers}
+        row = [
+            timed(lambda: sequential(tool, calls)),
+            timed(lambda: graph.invoke(inputs, config={"max_concurrency": 1})),
+            timed(lambda: graph.invoke(inputs, config=parallel)),
+            timed(lambda: asyncio.run(graph.ainvoke(inputs, config=parallel))),
+        ]
+        print(f"{n:>5} " + " ".join(f"{t * 1000:>8.0f}ms" for t in row))
+
+
+if __name__ == "__main__":
+    main()
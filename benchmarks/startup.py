@@ -0,0 +1,105 @@
+"""
+Cold-start profile: how long `import app` takes and where the time goes.
+
+Each measurement runs in a fresh interpreter. The import is timed a few
+times (best run counts against the budget), then `python -X importtime`
+gives a breakdown by top-level package and the slowest modules. The
+admin-only stack (langgraph, langchain, the Gemini client, pandas) must
+not be imported at startup; it loads on first admin use or via warm_up().
+
+    python -m benchmarks.startup                   # import app, 0.75s budget
+    python -m benchmarks.startup --module asgi --budget 1.0 --top 15
+
+Exits 1 if the budget is exceeded or a forbidden module was imported.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy packages the participant side must not pull in
+FORBIDDEN = ("pandas", "numpy", "langgraph", "langchain_core", "langchain_google_genai", "google.genai")
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.pop("WARM_UP", None)
+    return env
+
+
+def time_import(module, runs=3):
+    """Returns (best seconds, modules loaded) over `runs` fresh interpreters."""
+    best, modules = None, []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, env=_env(),
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best:
+            best, modules = result["seconds"], result["modules"]
+    return best, modules
+
+
+def import_profile(module):
+    """Parses `-X importtime` into (module, self seconds, cumulative seconds) rows."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=_env(),
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def by_package(rows):
+    totals = defaultdict(float)
+    for name, self_s, _ in rows:
+        totals[name.split(".")[0]] += self_s
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="module to import")
+    parser.add_argument("--budget", type=float, default=0.75, help="allowed import time in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="rows per breakdown")
+    args = parser.parse_args()
+
+    seconds, modules = time_import(args.module, args.runs)
+    rows = import_profile(args.module)
+
+    print(f"import {args.module}: {seconds * 1000:.0f}ms (best of {args.runs}), budget {args.budget * 1000:.0f}ms")
+    print("\nself time by package:")
+    for package, self_s in by_package(rows)[:args.top]:
+        print(f"  {package:<32} {self_s * 1000:8.1f}ms")
+    print("\nslowest modules (cumulative):")
+    for name, _, cumulative in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"  {name:<48} {cumulative * 1000:8.1f}ms")
+
+    failures = []
+    if seconds > args.budget:
+        failures.append(f"over budget by {(seconds - args.budget) * 1000:.0f}ms")
+    loaded = set(modules)
+    failures += [f"imported {name} at startup" for name in FORBIDDEN if name in loaded]
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Hot-path benchmark suite: chat throughput, save latency, analytics tools and Flask routes.
+
+For each dataset size a fresh response log is filled with synthetic
+participants built from the populate_data pools, then the suite measures
+
+  chat       full sessions driven through WarmUpBot.get_response
+  save       durable save_response latency (one fsync'd append each)
+  tools      each analytics tool, cold (dataset reparsed) and warm
+  routes     /api/chat, /api/admin/stats and /api/analyze via the Flask test client
+
+Results are written as JSON. With --baseline, every metric is compared to
+the stored run and the exit status is 1 if any got worse by more than
+--tolerance (metrics ending in _ms are lower-is-better, _per_sec higher).
+
+    python -m benchmarks.suite --sizes 100 10000 100000 --output bench.json --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+from agents.analytics import (get_dataset_info, count_values, filter_and_count,
+                              cross_tabulate, get_raw_data, get_interest_clusters)
+from agents.chatbot import WarmUpBot
+from agents.dataset import dataset_cache
+from agents.storage import ResponseLog, log_path_for, make_record
+from utils.populate_data import NAMES, DOMAINS, PROJECTS, CONFIDENCE, EXPERIENCE, STYLES
+
+DEFAULT_SIZES = (100, 10000, 100000)
+EXPECTATIONS = ["I want to learn about AI agents.", "Build something useful", "Networking",
+                "Understand LangGraph", "See real use cases"]
+
+
+# --- Synthetic participants ---
+def participant(i, rng):
+    name = NAMES[i % len(NAMES)]
+    user_data = {"name": f"{name} {i}", "email": f"{name.lower()}{i}@example.com"}
+    answers = [rng.choice(EXPECTATIONS), rng.choice(DOMAINS), f"I want to build a {rng.choice(PROJECTS)}",
+               rng.choice(CONFIDENCE), rng.choice(EXPERIENCE), rng.choice(STYLES)]
+    return user_data, answers
+
+
+def build_dataset(data_file, size, rng, batch=5000):
+    log = ResponseLog(log_path_for(data_file))
+    for start in range(0, size, batch):
+        records = []
+        for i in range(start, min(size, start + batch)):
+            user_data, answers = participant(i, rng)
+            records.append(make_record(answers, user_data))
+        log.append(records)
+
+
+# --- Measurements ---
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def timed(fn, repeat=1):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_tools(data_file, repeat):
+    calls = {
+        "get_dataset_info": lambda: get_dataset_info(data_file),
+        "count_values": lambda: count_values(data_file, "Domain"),
+        "filter_and_count": lambda: filter_and_count(data_file, "Domain", "fin", "AI_Experience"),
+        "filter_and_count_text": lambda: filter_and_count(data_file, "Project_Idea", "bot", "Domain"),
+        "cross_tabulate": lambda: cross_tabulate(data_file, "Domain", "AI_Experience"),
+        "get_raw_data": lambda: get_raw_data(data_file, 5),
+        "get_interest_clusters": lambda: get_interest_clusters(data_file),
+    }
+    def cold(call):
+        dataset_cache.invalidate(data_file)
+        call()
+
+    results = {}
+    for name, call in calls.items():
+        # Best of three, since a single cold call is noisy
+        results[f"tools.{name}.cold_ms"] = ms(min(timed(lambda: cold(call), 3)))
+        results[f"tools.{name}.warm_ms"] = ms(statistics.median(timed(call, repeat)))
+    return results
+
+
+def bench_chat(data_file, sessions, rng):
+    bot = WarmUpBot(write_behind=True)
+    bot.data_file = data_file
+    bot.aggregates.sync()
+    start = time.perf_counter()
+    messages = 0
+    for i in range(sessions):
+        user_id = f"bench-{i}"
+        user_data, answers = participant(i, rng)
+        for message in ["START_SESSION"] + answers:
+            bot.get_response(user_id, message, user_data)
+            messages += 1
+    bot.flush()
+    elapsed = time.perf_counter() - start
+    bot.close()
+    return {"chat.messages_per_sec": round(messages / elapsed, 1),
+            "chat.sessions_per_sec": round(sessions / elapsed, 1)}
+
+
+def bench_save(data_file, saves, rng):
+    bot = WarmUpBot(write_behind=False)
+    bot.data_file = data_file
+    bot.aggregates.sync()
+    latencies = []
+    for i in range(saves):
+        user_data, answers = participant(i, rng)
+        latencies += timed(lambda: bot.save_response(answers, user_data))
+    return {"save.p50_ms": ms(percentile(latencies, 50)),
+            "save.p95_ms": ms(percentile(latencies, 95))}
+
+
+def bench_routes(data_file, requests, rng):
+    from app import app, bot, analytics_agent, analysis_cache, writer_agent
+    bot.data_file = data_file
+    analytics_agent.data_file = data_file
+    analytics_agent.mode = "local"
+    writer_agent.output_file = os.path.join(os.path.dirname(data_file), "report.txt")
+    bot.aggregates.sync()
+    analysis_cache.invalidate()
+    client = app.test_client()
+
+    chat = []
+    for i in range(requests):
+        user_data, answers = participant(i, rng)
+        step = i % 7
+        message = "START_SESSION" if step == 0 else answers[step - 1]
+        environ = {"REMOTE_ADDR": f"10.2.{(i // 7) // 250}.{(i // 7) % 250}"}
+        chat += timed(lambda: client.post('/api/chat', json={"message": message, "user_data": user_data},
+                                          environ_base=environ))
+    bot.flush()
+    stats = timed(lambda: client.get('/api/admin/stats'), repeat=20)
+    no_cache = {"Cache-Control": "no-cache"}
+    analyze_cold = timed(lambda: client.post('/api/analyze', headers=no_cache))[0]
+    analyze_cached = timed(lambda: client.post('/api/analyze'), repeat=10)
+    return {
+        "routes.chat.p50_ms": ms(percentile(chat, 50)),
+        "routes.chat.p95_ms": ms(percentile(chat, 95)),
+        "routes.admin_stats.p50_ms": ms(percentile(stats, 50)),
+        "routes.analyze.cold_ms": ms(analyze_cold),
+        "routes.analyze.cached_ms": ms(statistics.median(analyze_cached)),
+    }
+
+
+def run_size(size, args):
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix=f"bench-{size}-")
+    data_file = os.path.join(workdir, "responses.xlsx")
+    try:
+        start = time.perf_counter()
+        build_dataset(data_file, size, rng)
+        print(f"\n== {size} rows (built in {time.perf_counter() - start:.1f}s) ==")
+        results = {}
+        results.update(bench_tools(data_file, args.repeat))
+        results.update(bench_routes(data_file, args.requests, rng))
+        results.update(bench_chat(data_file, args.sessions, rng))
+        results.update(bench_save(data_file, args.saves, rng))
+        for name, value in results.items():
+            print(f"  {name:<36} {value:>12}")
+        return results
+    finally:
+        dataset_cache.invalidate(data_file)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- Baseline comparison ---
+def compare(results, baseline, tolerance, min_delta_ms=1.0):
+    """
+    Returns (metric, baseline, current, change) for every metric that got
+    worse by more than `tolerance`. Timings that moved by less than
+    `min_delta_ms` are treated as noise.
+    """
+    regressions = []
+    for size, metrics in baseline.get("results", {}).items():
+        current = results.get("results", {}).get(size, {})
+        for name, before in metrics.items():
+            after = current.get(name)
+            if after is None or not before:
+                continue
+            if name.endswith("_per_sec"):
+                change = (before - after) / before
+            elif after - before < min_delta_ms:
+                continue
+            else:
+                change = (after - before) / before
+            if change > tolerance:
+                regressions.append((f"{size}:{name}", before, after, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="dataset sizes in rows")
+    parser.add_argument("--sessions", type=int, default=200, help="full chat sessions per size")
+    parser.add_argument("--saves", type=int, default=200, help="durable saves per size")
+    parser.add_argument("--requests", type=int, default=700, help="/api/chat requests per size")
+    parser.add_argument("--repeat", type=int, default=20, help="warm calls per analytics tool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore timing changes smaller than this")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": {str(size): run_size(size, args) for size in args.sizes},
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for name, before, after, change in regressions:
+            print(f"  REGRESSION {name}: {before} -> {after} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print("  no regressions")
+
+
+if __name__ == "__main__":
+    main()
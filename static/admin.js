@@ -1,12 +1,25 @@
 document.addEventListener('DOMContentLoaded', () => {
     // --- Charts Logic ---
     let experienceChart, confidenceChart, domainChart;
+    let analyticsEtag = null;
+    let refreshTimer = null;
 
     async function fetchAnalytics() {
         try {
-            const response = await fetch('/api/analyze', { method: 'POST' });
-            const data = await response.json();
-            updateCharts(data.analytics);
+            // Conditional request: the server answers 304 if our copy is current
+            const headers = analyticsEtag ? { 'If-None-Match': analyticsEtag } : {};
+            const response = await fetch('/api/analyze', { method: 'POST', headers });
+            if (response.status !== 304) {
+                const data = await response.json();
+                analyticsEtag = response.headers.get('ETag');
+                updateCharts(data.analytics);
+            }
+
+            // A stale result is being recomputed in the background: check back shortly
+            clearTimeout(refreshTimer);
+            if (response.headers.get('X-Analysis-State') === 'stale') {
+                refreshTimer = setTimeout(fetchAnalytics, 3000);
+            }
         } catch (error) {
             console.error("Failed to fetch analytics:", error);
         }
@@ -71,6 +84,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const chatWindow = document.getElementById('chat-window');
     const adminInput = document.getElementById('admin-input');
     const sendBtn = document.getElementById('admin-send-btn');
+    // This tab's conversation with the agent; another tab starts its own
+    const sessionId = window.crypto && crypto.randomUUID
+        ? crypto.randomUUID()
+        : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
 
     function addMessage(text, sender) {
         const div = document.createElement('div');
@@ -84,6 +101,12 @@ document.addEventListener('DOMContentLoaded', () => {
         chatWindow.scrollTop = chatWindow.scrollHeight;
     }
 
+    function parseEvent(block) {
+        // An SSE block is "event: <type>\ndata: <json>"
+        const dataLine = block.split('\n').find(line => line.startsWith('data: '));
+        return dataLine ? JSON.parse(dataLine.slice(6)) : null;
+    }
+
     async function sendAdminMessage() {
         const text = adminInput.value.trim();
         if (!text) return;
@@ -91,18 +114,55 @@ document.addEventListener('DOMContentLoaded', () => {
         addMessage(text, 'user');
         adminInput.value = '';
 
+        // The answer bubble fills in as tokens arrive
+        const div = document.createElement('div');
+        div.classList.add('message', 'bot-message');
+        div.textContent = 'Thinking...';
+        chatWindow.appendChild(div);
+
+        let answer = '';
+        const render = (markdown) => {
+            div.innerHTML = marked.parse(markdown);
+            chatWindow.scrollTop = chatWindow.scrollHeight;
+        };
+
         try {
-            const response = await fetch('/api/admin/chat', {
+            const response = await fetch('/api/admin/chat/stream', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ question: text })
+                body: JSON.stringify({ question: text, session_id: sessionId })
             });
 
-            const data = await response.json();
-            addMessage(data.answer, 'bot');
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const blocks = buffer.split('\n\n');
+                buffer = blocks.pop();
+
+                for (const block of blocks) {
+                    const event = parseEvent(block);
+                    if (!event) continue;
+                    if (event.type === 'tool_call' && !answer) {
+                        div.textContent = `Running ${event.name}...`;
+                    } else if (event.type === 'token') {
+                        answer += event.text;
+                        render(answer);
+                    } else if (event.type === 'done') {
+                        // Text streamed before a tool call is not part of the final answer
+                        answer = event.answer;
+                        render(answer);
+                    } else if (event.type === 'error') {
+                        render(event.message);
+                    }
+                }
+            }
         } catch (error) {
             console.error('Error:', error);
-            addMessage("Error querying analytics agent.", 'bot');
+            render("Error querying analytics agent.");
         }
     }
 
@@ -7,6 +7,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const userEmailInput = document.getElementById('user-email');
 
     let userData = { name: null, email: null };
+    // Identifies this chat to the server, so participants behind one address don't share a session
+    const sessionId = window.crypto && crypto.randomUUID
+        ? crypto.randomUUID()
+        : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
 
     startChatBtn.addEventListener('click', () => {
         const name = userNameInput.value.trim();
@@ -66,7 +70,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 },
                 body: JSON.stringify({
                     message: text,
-                    user_data: userData
+                    user_data: userData,
+                    session_id: sessionId
                 })
             });
 
@@ -0,0 +1,16 @@
+"""Scripted stand-ins for Gemini, shared by the agent and checkpointer tests."""
+import itertools
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import create_react_agent
+
+
+class FakeModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_graph(checkpointer, **kwargs):
+    """A ReAct graph whose model answers "reply 0", "reply 1", ... in turn."""
+    replies = (AIMessage(content=f"reply {i}") for i in itertools.count())
+    return create_react_agent(FakeModel(messages=replies), tools=[], checkpointer=checkpointer, **kwargs)
@@ -0,0 +1,94 @@
+import unittest
+import json
+import asyncio
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+import asgi
+from app import app, analytics_agent
+
+AGENT = {"langgraph_node": "agent"}
+
+def fake_run():
+    call = {"name": "count_values", "args": {"column": "Domain"}, "id": "1"}
+    yield "updates", {"agent": {"messages": [AIMessage(content="", tool_calls=[call])]}}
+    yield "updates", {"tools": {"messages": [ToolMessage(content="Finance: 2", name="count_values", tool_call_id="1")]}}
+    yield "messages", (AIMessageChunk(content="Finance "), AGENT)
+    yield "messages", (AIMessageChunk(content="leads."), AGENT)
+    yield "updates", {"agent": {"messages": [AIMessage(content="Finance leads.")]}}
+
+
+class FakeGraph:
+    def __init__(self):
+        self.gate = None
+
+    def stream(self, inputs, config=None, stream_mode=None):
+        return fake_run()
+
+    async def astream(self, inputs, config=None, stream_mode=None):
+        for i, item in enumerate(fake_run()):
+            if i == 3 and self.gate is not None:
+                # Hold the rest of the answer until the first token was sent
+                await self.gate.wait()
+            yield item
+
+
+def parse_sse(body):
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+class TestAdminStream(unittest.TestCase):
+    def setUp(self):
+        self.saved = analytics_agent.app
+        analytics_agent.app = FakeGraph()
+        analytics_agent.answer_cache.clear()
+
+    def tearDown(self):
+        analytics_agent.app = self.saved
+        analytics_agent.answer_cache.clear()
+
+    def test_flask_stream_events(self):
+        rv = app.test_client().post('/api/admin/chat/stream', json={"question": "Top domain?"})
+        self.assertEqual(rv.mimetype, 'text/event-stream')
+        events = parse_sse(rv.data)
+        self.assertEqual([name for name, _ in events],
+                         ["tool_call", "tool_result", "token", "token", "done"])
+        self.assertEqual(events[0][1]["args"], {"column": "Domain"})
+        self.assertEqual(events[-1][1]["answer"], "Finance leads.")
+
+    def test_asgi_sends_tokens_before_the_answer_is_finished(self):
+        graph = analytics_agent.app
+
+        async def scenario():
+            graph.gate = asyncio.Event()
+            body = json.dumps({"question": "Top domain?"}).encode()
+            scope = {"type": "http", "method": "POST", "path": "/api/admin/chat/stream",
+                     "query_string": b"", "headers": [], "client": ("127.0.0.1", 0)}
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": body}
+
+            async def send(message):
+                sent.append(message)
+                if b"event: token" in message.get("body", b""):
+                    graph.gate.set()
+
+            await asyncio.wait_for(asgi.application(scope, receive, send), 5)
+            return sent
+
+        sent = asyncio.run(scenario())
+        self.assertIn((b"content-type", b"text/event-stream; charset=utf-8"), sent[0]["headers"])
+        events = parse_sse(b"".join(m.get("body", b"") for m in sent[1:]))
+        self.assertEqual(events[-1], ("done", {"type": "done", "answer": "Finance leads."}))
+
+    def test_without_api_key(self):
+        analytics_agent.app = None
+        events = list(analytics_agent.stream_query("hi"))
+        self.assertEqual(events[0]["type"], "done")
+        self.assertIn("Gemini API Key", events[0]["answer"])
+
+if __name__ == '__main__':
+    unittest.main()
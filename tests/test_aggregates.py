@@ -0,0 +1,61 @@
+import unittest
+import os
+import json
+import random
+import shutil
+import tempfile
+import pandas as pd
+from agents.aggregates import AggregateStore
+from agents.analytics import count_values, cross_tabulate
+from agents.chatbot import WarmUpBot
+from agents.storage import ResponseLog, make_record
+from utils.populate_data import DOMAINS, CONFIDENCE, EXPERIENCE, STYLES
+
+class TestAggregateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bot = WarmUpBot()
+        self.bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        random.seed(7)
+        for _ in range(40):
+            self.bot.save_response([
+                "Learn agents", random.choice(DOMAINS), "Trading Bot",
+                random.choice(CONFIDENCE), random.choice(EXPERIENCE), random.choice(STYLES)
+            ], None)
+        self.df = self.bot.log.read_frame()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_counts_match_pandas(self):
+        for col in ["Domain", "Programming_Confidence", "AI_Experience", "Learning_Style"]:
+            self.assertEqual(self.bot.aggregates.value_counts(col), self.df[col].value_counts().to_dict())
+        self.assertEqual(self.bot.aggregates.total, 40)
+
+    def test_tools_answer_from_aggregates(self):
+        counts = json.loads(count_values(self.bot.data_file, "Domain"))
+        self.assertEqual(counts, self.df["Domain"].value_counts().to_dict())
+        for a, b in [("Domain", "AI_Experience"), ("Learning_Style", "Programming_Confidence")]:
+            expected = pd.crosstab(self.df[a], self.df[b]).to_json()
+            self.assertEqual(cross_tabulate(self.bot.data_file, a, b), expected)
+
+    def test_rebuilt_from_storage(self):
+        # A fresh store (e.g. after a restart) rebuilds from the log
+        store = AggregateStore(ResponseLog(self.bot.log.path)).sync()
+        self.assertEqual(store.total, 40)
+        self.assertEqual(store.value_counts("Domain"), self.bot.aggregates.value_counts("Domain"))
+
+    def test_catches_up_with_foreign_writes(self):
+        # Another process appends directly to the log
+        other = ResponseLog(self.bot.log.path)
+        other.append(make_record(["Learn", "Finance", "Bot", "High", "Advanced", "Mix"]))
+        self.bot.save_response(["Learn", "Finance", "Bot", "Low", "Beginner", "Mix"], None)
+        self.assertEqual(self.bot.aggregates.total, 42)
+
+    def test_reset_on_clear(self):
+        self.bot.log.clear()
+        self.bot.save_response(["Learn", "Finance", "Bot", "Low", "Beginner", "Mix"], None)
+        self.assertEqual(self.bot.aggregates.value_counts("Domain"), {"Finance": 1})
+
+if __name__ == '__main__':
+    unittest.main()
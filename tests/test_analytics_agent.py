@@ -1,5 +1,6 @@
 import unittest
 import os
+import shutil
 import pandas as pd
 from agents.analytics import AnalyticsAgent
 from dotenv import load_dotenv
@@ -69,6 +70,7 @@ class TestAnalyticsAgent(unittest.TestCase):
             os.remove(bot.data_file)
             
         bot.save_response(responses, user_data)
+        bot.export_xlsx()
         
         df = pd.read_excel(bot.data_file)
         self.assertIn("UUID", df.columns)
@@ -77,6 +79,7 @@ class TestAnalyticsAgent(unittest.TestCase):
         # Cleanup
         if os.path.exists(bot.data_file):
             os.remove(bot.data_file)
+        shutil.rmtree(bot.log.path, ignore_errors=True)
 
     def test_generate_report(self):
         if not os.getenv("GEMINI_API_KEY"):
@@ -0,0 +1,76 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pandas as pd
+from unittest.mock import MagicMock
+from langchain_core.messages import AIMessage
+from agents.analytics import AnalyticsAgent, compute_summary
+from agents.chatbot import WarmUpBot
+from agents.writer import WriterAgent
+
+class TestAnalysisModes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bot = WarmUpBot()
+        self.bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        rows = [
+            ["Learn", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"],
+            ["Learn", "Finance", "trading bot", "Low", "Beginner", "Hands-on"],
+            ["Learn", "Healthcare", "Diagnosis Helper", "Low", "Beginner", "Conceptual"],
+        ]
+        for row in rows:
+            self.bot.save_response(row, None)
+        self.agent = AnalyticsAgent(data_file=self.bot.data_file, mode="local")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_summary_is_computed_locally(self):
+        summary = compute_summary(self.bot.data_file)
+        self.assertEqual(summary, {
+            "total_participants": 3,
+            "experience_breakdown": {"Beginner": 2, "Advanced": 1},
+            "confidence_breakdown": {"Low": 2, "High": 1},
+            "top_domains": {"Finance": 2, "Healthcare": 1},
+        })
+
+    def test_local_mode_needs_no_llm(self):
+        result = self.agent.analyze()
+        self.assertEqual(result["total_participants"], 3)
+        self.assertEqual(result["interest_clusters"], {"Trading Bot": 2, "Diagnosis Helper": 1})
+        report = WriterAgent(output_file=os.path.join(self.tmp, 'report.txt')).write_report(result)
+        self.assertIn("TOTAL PARTICIPANTS: 3", report)
+
+    def test_hybrid_mode_uses_llm_only_for_clusters(self):
+        self.agent.llm = MagicMock()
+        self.agent.llm.invoke.return_value = AIMessage(content='```json\n{"Finance bots": 2, "Health": 1}\n```')
+        result = self.agent.analyze(mode="hybrid")
+        self.assertEqual(result["interest_clusters"], {"Finance bots": 2, "Health": 1})
+        self.assertEqual(result["top_domains"], {"Finance": 2, "Healthcare": 1})
+        self.assertEqual(self.agent.llm.invoke.call_count, 1)
+
+    def test_hybrid_falls_back_to_local_grouping(self):
+        self.agent.llm = MagicMock()
+        self.agent.llm.invoke.return_value = AIMessage(content="not json")
+        result = self.agent.analyze(mode="hybrid")
+        self.assertEqual(result["interest_clusters"]["Trading Bot"], 2)
+
+    def test_plain_workbook_and_missing_data(self):
+        xlsx = os.path.join(self.tmp, 'plain.xlsx')
+        pd.DataFrame({"AI_Experience": ["Beginner"], "Domain": ["Edu"]}).to_excel(xlsx, index=False)
+        result = AnalyticsAgent(data_file=xlsx, mode="local").analyze()
+        self.assertEqual(result["total_participants"], 1)
+        self.assertEqual(result["confidence_breakdown"], {})
+        missing = AnalyticsAgent(data_file=os.path.join(self.tmp, 'none.xlsx'), mode="local").analyze()
+        self.assertIn("error", missing)
+
+    def test_llm_mode_without_key(self):
+        agent = AnalyticsAgent(data_file=self.bot.data_file, mode="llm")
+        agent.app = None
+        self.assertEqual(agent.analyze(), {"error": "Gemini API Key missing."})
+        with self.assertRaises(ValueError):
+            AnalyticsAgent(mode="bogus")
+
+if __name__ == '__main__':
+    unittest.main()
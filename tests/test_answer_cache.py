@@ -0,0 +1,122 @@
+import unittest
+import os
+import time
+import shutil
+import tempfile
+from unittest.mock import patch
+from agents.answer_cache import AnswerCache, normalize_question
+from agents.analytics import AnalyticsAgent
+from agents.checkpoints import SQLiteCheckpointer
+from agents.chatbot import WarmUpBot
+from tests.fake_llm import make_graph
+
+
+class TestAnswerCache(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_question("  How many   Beginners?"), "how many beginners")
+        cache = AnswerCache()
+        key, _ = cache.get("how many beginners?", "v1")
+        cache.put(key, "12 beginners", llm_calls=3)
+        self.assertEqual(cache.get("How many beginners", "v1")[1], "12 beginners")
+        self.assertIsNone(cache.get("How many beginners", "v2")[1])
+        self.assertEqual(cache.stats()["llm_calls_saved"], 3)
+
+    def test_ttl_and_lru(self):
+        cache = AnswerCache(ttl=60, max_entries=2)
+        for q in ("one", "two", "three"):
+            cache.put(cache.get(q, "v")[0], q.upper())
+        self.assertIsNone(cache.get("one", "v")[1])
+        self.assertEqual(cache.stats()["evicted"], 1)
+        with patch("agents.answer_cache.time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get("three", "v")[1])
+        self.assertEqual(cache.stats()["expired"], 1)
+
+    def test_threads_with_history_bypass_in_thread_aware_mode(self):
+        cache = AnswerCache()
+        key, answer = cache.get("How many beginners?", "v", has_history=True)
+        self.assertIsNone(key)
+        self.assertEqual(cache.stats()["bypassed"], 1)
+        # Wording does not matter, only the thread does
+        self.assertIsNotNone(cache.get("Is that also true for Finance?", "v")[0])
+        self.assertIsNotNone(AnswerCache(thread_aware=False).get("How many beginners?", "v", has_history=True)[0])
+
+
+class TestAgentAnswerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bot = WarmUpBot()
+        self.bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.bot.save_response(["Learn", "Finance", "Bot", "High", "Beginner", "Hands-on"], None)
+        self.checkpointer = SQLiteCheckpointer(os.path.join(self.tmp, 'checkpoints.db'))
+        self.agent = AnalyticsAgent(data_file=self.bot.data_file, checkpointer=self.checkpointer)
+        self.agent.app = make_graph(self.checkpointer)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def thread(self, thread_id):
+        state = self.agent.app.get_state({"configurable": {"thread_id": thread_id}})
+        return [m.content for m in state.values["messages"]]
+
+    def test_repeated_question_skips_the_agent(self):
+        self.assertEqual(self.agent.query("How many beginners?", thread_id="a"), "reply 0")
+        self.assertEqual(self.agent.query("how many beginners", thread_id="b"), "reply 0")
+        # The cached exchange is still part of the conversation
+        self.assertEqual(self.thread("b"), ["how many beginners", "reply 0"])
+        self.assertEqual(self.agent.answer_cache.stats()["llm_calls_saved"], 1)
+
+        # New data: the question is answered again
+        self.bot.save_response(["Learn", "Health", "Bot", "Low", "Beginner", "Mix"], None)
+        self.assertEqual(self.agent.query("How many beginners?", thread_id="c"), "reply 1")
+
+    def test_thread_with_history_bypasses(self):
+        self.assertEqual(self.agent.query("How many beginners?", thread_id="a"), "reply 0")
+        # Same words, but thread "a" now has a conversation the answer could depend on
+        self.assertEqual(self.agent.query("How many beginners?", thread_id="a"), "reply 1")
+        self.assertEqual(self.agent.answer_cache.stats()["bypassed"], 1)
+
+    def test_streamed_answers_are_cached(self):
+        events = list(self.agent.stream_query("Top domain?", thread_id="s1"))
+        self.assertEqual(events[-1], {"type": "done", "answer": "reply 0"})
+        events = list(self.agent.stream_query("Top domain", thread_id="s2"))
+        self.assertEqual(events, [{"type": "done", "answer": "reply 0", "cached": True}])
+
+
+class TestAdminChatRoute(unittest.TestCase):
+    def setUp(self):
+        from app import app, analytics_agent
+        self.tmp = tempfile.mkdtemp()
+        self.client = app.test_client()
+        self.agent = analytics_agent.get()
+        self.saved = (self.agent.app, self.agent.checkpointer, self.agent.data_file)
+        bot = WarmUpBot()
+        bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        bot.save_response(["Learn", "Finance", "Bot", "High", "Beginner", "Hands-on"], None)
+        self.agent.checkpointer = SQLiteCheckpointer(os.path.join(self.tmp, 'checkpoints.db'))
+        self.agent.app = make_graph(self.agent.checkpointer)
+        self.agent.data_file = bot.data_file
+        self.agent.answer_cache.clear()
+
+    def tearDown(self):
+        self.agent.app, self.agent.checkpointer, self.agent.data_file = self.saved
+        self.agent.answer_cache.clear()
+        shutil.rmtree(self.tmp)
+
+    def ask(self, **payload):
+        return self.client.post('/api/admin/chat', json=payload).get_json()["answer"]
+
+    def test_repeated_question_is_served_from_the_cache(self):
+        hits = self.agent.answer_cache.stats()["hits"]
+        self.assertEqual(self.ask(question="How many beginners?"), "reply 0")
+        self.assertEqual(self.ask(question="How many beginners?"), "reply 0")
+        self.assertEqual(self.agent.answer_cache.stats()["hits"], hits + 1)
+
+    def test_dashboard_tabs_keep_their_own_threads(self):
+        self.assertEqual(self.ask(question="Top domain?", session_id="tab-1"), "reply 0")
+        # Another tab opens with the same question: cached
+        self.assertEqual(self.ask(question="Top domain?", session_id="tab-2"), "reply 0")
+        # A follow-up in the first tab builds on its conversation instead
+        self.assertEqual(self.ask(question="Top domain?", session_id="tab-1"), "reply 1")
+
+if __name__ == '__main__':
+    unittest.main()
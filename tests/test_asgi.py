@@ -0,0 +1,139 @@
+import unittest
+import os
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+from unittest.mock import AsyncMock, patch
+import asgi
+from agents.lazy import Lazy
+from app import bot, analytics_agent
+
+async def call(method, path, payload=None, client_ip="127.0.0.1"):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"",
+             "headers": [(b"content-type", b"application/json")],
+             "client": (client_ip, 0), "server": ("localhost", 5000)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.application(scope, receive, send)
+    status = sent[0]["status"]
+    return status, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+class TestASGIEntryPoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data_file = bot.data_file
+        bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.aquery = analytics_agent.aquery
+
+    def tearDown(self):
+        bot.data_file = self.data_file
+        analytics_agent.aquery = self.aquery
+        shutil.rmtree(self.tmp)
+
+    def test_flask_routes_are_bridged(self):
+        status, body = asyncio.run(call("GET", "/admin"))
+        self.assertEqual(status, 200)
+        self.assertIn(b'Admin Dashboard', body)
+
+        status, body = asyncio.run(call("POST", "/api/chat", {
+            "message": "START_SESSION", "user_data": {"name": "Test User"}}))
+        self.assertEqual(status, 200)
+        self.assertIn("Hi Test User!", json.loads(body)["response"])
+
+    def test_participants_do_not_wait_for_admin(self):
+        async def slow_query(question, thread_id="admin_session"):
+            await asyncio.sleep(1.0)
+            return "slow answer"
+        analytics_agent.aquery = slow_query
+
+        async def scenario():
+            admin = asyncio.create_task(call("POST", "/api/admin/chat", {"question": "How many?"}))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            await asyncio.gather(*[
+                call("POST", "/api/chat", {"message": "START_SESSION", "user_data": {"name": f"U{i}"}},
+                     client_ip=f"10.9.0.{i}")
+                for i in range(20)
+            ])
+            participant_time = time.perf_counter() - start
+            status, body = await admin
+            return participant_time, json.loads(body)
+
+        participant_time, admin_body = asyncio.run(scenario())
+        self.assertLess(participant_time, 0.9)
+        self.assertEqual(admin_body["answer"], "slow answer")
+
+    def test_agent_build_does_not_block_the_loop(self):
+        class Agent:
+            async def aquery(self, question, thread_id="admin_session"):
+                return "built"
+
+        def slow_build():
+            time.sleep(1.0)   # stands in for the langgraph / langchain imports
+            return Agent()
+
+        async def scenario():
+            admin = asyncio.create_task(call("POST", "/api/admin/chat", {"question": "How many?"}))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            await call("POST", "/api/chat", {"message": "START_SESSION", "user_data": {"name": "U"}},
+                       client_ip="10.9.1.1")
+            participant_time = time.perf_counter() - start
+            status, body = await admin
+            return participant_time, json.loads(body)
+
+        with patch.object(asgi, "analytics_agent", Lazy(slow_build)):
+            participant_time, admin_body = asyncio.run(scenario())
+        self.assertLess(participant_time, 0.9)
+        self.assertEqual(admin_body["answer"], "built")
+
+    def test_cached_answer_lookup_runs_off_the_loop(self):
+        agent = analytics_agent.get()
+        threads = []
+
+        def cached_answer(question, config):
+            threads.append(threading.current_thread().name)
+            return None, "cached"
+
+        with patch.object(agent, "app", AsyncMock()), patch.object(agent, "_cached_answer", cached_answer):
+            status, body = asyncio.run(call("POST", "/api/admin/chat", {"question": "How many?"}))
+        self.assertEqual(json.loads(body)["answer"], "cached")
+        self.assertTrue(threads[0].startswith("admin"), threads)
+
+    def test_second_lifespan_cycle(self):
+        async def serve():
+            shutdown = asyncio.Event()
+
+            async def receive():
+                if not hasattr(receive, "started"):
+                    receive.started = True
+                    return {"type": "lifespan.startup"}
+                await shutdown.wait()
+                return {"type": "lifespan.shutdown"}
+
+            async def send(message):
+                pass
+
+            lifespan = asyncio.create_task(asgi.application({"type": "lifespan"}, receive, send))
+            status, _ = await call("GET", "/admin")
+            shutdown.set()
+            await lifespan
+            return status
+
+        # A server started again in the same process, as reloaders and tests do
+        with patch.object(asgi.bot, "close"):
+            self.assertEqual([asyncio.run(serve()) for _ in range(2)], [200, 200])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import re
+import gzip
+import shutil
+import tempfile
+import unittest
+from agents.assets import AssetPipeline
+from app import app
+
+
+class TestAssetPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.write('script.js', 'console.log("hello");\n' * 50)
+        self.write('admin.js', 'console.log("admin");\n')
+        self.write('style.css', 'body { color: red; }\n' * 50)
+        self.write('index.html', '<link href="static/style.css"><script src="static/script.js"></script>')
+        self.write('admin.html', '<script src="/static/admin.js"></script>')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name, text):
+        with open(os.path.join(self.tmp, name), 'w') as f:
+            f.write(text)
+
+    def test_pages_point_at_hashed_assets(self):
+        pipeline = AssetPipeline(self.tmp).build()
+        html = pipeline.page('index.html').variants['identity'].decode()
+        self.assertRegex(html, r'href="/assets/style\.[0-9a-f]{10}\.css"')
+        self.assertRegex(html, r'src="/assets/script\.[0-9a-f]{10}\.js"')
+        hashed = pipeline.urls['script.js'][len('/assets/'):]
+        asset = pipeline.asset(hashed)
+        self.assertEqual(gzip.decompress(asset.variants['gzip']), asset.variants['identity'])
+        # Tiny files are not worth compressing
+        admin_js = pipeline.asset(pipeline.urls['admin.js'][len('/assets/'):])
+        self.assertEqual(list(admin_js.variants), ['identity'])
+
+    def test_reload_renames_changed_assets(self):
+        pipeline = AssetPipeline(self.tmp, reload=True).build()
+        before = pipeline.urls['script.js']
+        self.write('script.js', 'console.log("changed");\n' * 50)
+        os.utime(os.path.join(self.tmp, 'script.js'), (1, 1))
+        html = pipeline.page('index.html').variants['identity'].decode()
+        after = pipeline.urls['script.js']
+        self.assertNotEqual(after, before)
+        self.assertIn(after, html)
+        self.assertIn(b'changed', pipeline.asset(after[len('/assets/'):]).variants['identity'])
+
+
+class TestAssetRoutes(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_index_is_compressed_and_revalidated(self):
+        response = self.client.get('/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        html = gzip.decompress(response.data).decode()
+        self.assertIn('/assets/script.', html)
+
+        cached = self.client.get('/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b'')
+
+        plain = self.client.get('/', headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(plain.get_data(as_text=True), html)
+
+    def test_hashed_assets_are_immutable(self):
+        html = self.client.get('/admin').get_data(as_text=True)
+        for url in re.findall(r'"(/assets/[^"]+)"', html):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertEqual(self.client.get('/assets/script.0000000000.js').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
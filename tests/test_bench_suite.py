@@ -0,0 +1,36 @@
+import unittest
+from benchmarks.suite import compare
+
+
+class TestBenchCompare(unittest.TestCase):
+    def setUp(self):
+        self.baseline = {"results": {"100": {
+            "save.p50_ms": 10.0,
+            "tools.count_values.warm_ms": 0.05,
+            "chat.messages_per_sec": 1000.0,
+        }}}
+
+    def run_compare(self, **metrics):
+        current = dict(self.baseline["results"]["100"], **metrics)
+        return [r[0] for r in compare({"results": {"100": current}}, self.baseline, tolerance=0.5)]
+
+    def test_no_change(self):
+        self.assertEqual(self.run_compare(), [])
+
+    def test_slower_timing_is_a_regression(self):
+        self.assertEqual(self.run_compare(**{"save.p50_ms": 16.0}), ["100:save.p50_ms"])
+        self.assertEqual(self.run_compare(**{"save.p50_ms": 14.0}), [])
+
+    def test_lower_throughput_is_a_regression(self):
+        self.assertEqual(self.run_compare(**{"chat.messages_per_sec": 400.0}), ["100:chat.messages_per_sec"])
+        self.assertEqual(self.run_compare(**{"chat.messages_per_sec": 5000.0}), [])
+
+    def test_sub_millisecond_noise_is_ignored(self):
+        self.assertEqual(self.run_compare(**{"tools.count_values.warm_ms": 0.5}), [])
+
+    def test_missing_size_is_skipped(self):
+        self.assertEqual(compare({"results": {}}, self.baseline, tolerance=0.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
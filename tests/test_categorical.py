@@ -0,0 +1,65 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from agents.aggregates import AggregateStore
+from agents.analytics import filter_and_count
+from agents.categorical import Vocabulary, normalize
+from agents.dataset import dataset_cache
+from agents.storage import ResponseLog, log_path_for, make_record
+
+
+class TestVocabulary(unittest.TestCase):
+    def test_spellings_share_a_code(self):
+        vocab = Vocabulary(["Low", "Medium", "High"])
+        codes = {vocab.code(v) for v in ["medium", "Medium ", "MEDIUM", "  medium\t"]}
+        self.assertEqual(codes, {2})
+        self.assertEqual(vocab.label(2), "Medium")
+        # Unseen answers keep their first spelling
+        self.assertEqual(vocab.label(vocab.code("Very   high")), "Very high")
+        self.assertEqual(vocab.code("VERY HIGH"), 4)
+
+    def test_missing_answers(self):
+        vocab = Vocabulary()
+        for value in [None, float("nan"), "", "   "]:
+            self.assertIsNone(normalize(value))
+            self.assertEqual(vocab.code(value), 0)
+        self.assertEqual(len(vocab), 1)
+
+
+class TestNormalizedAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.log = ResponseLog(log_path_for(self.data_file))
+        self.log.append([
+            make_record(["Learn", "Finance", "Trading bot", "medium", "Beginner", "Mix"]),
+            make_record(["Learn", "finance ", "Chat bot", "MEDIUM", "beginner", "Mix"]),
+            make_record(["Learn", "Healthcare", "Triage bot", "High", None, "Mix"]),
+        ])
+
+    def tearDown(self):
+        dataset_cache.invalidate(self.data_file)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_counts_merge_spellings(self):
+        store = AggregateStore(self.log).sync()
+        self.assertEqual(store.value_counts("Programming_Confidence"), {"Medium": 2, "High": 1})
+        self.assertEqual(store.value_counts("Domain"), {"Finance": 2, "Healthcare": 1})
+        self.assertEqual(store.crosstab("AI_Experience", "Domain"), {("Beginner", "Finance"): 2})
+
+    def test_vocabulary_starts_over_after_clear(self):
+        store = AggregateStore(self.log).sync()
+        self.log.clear()
+        self.log.append(make_record(["Learn", "Retail", "Shop bot", "low", "Advanced", "Mix"]))
+        self.assertEqual(store.value_counts("Domain"), {"Retail": 1})
+        self.assertEqual(store.vocabulary["Domain"].labels, [None, "Retail"])
+
+    def test_query_engine_agrees(self):
+        counts = json.loads(filter_and_count(self.data_file, "Project_Idea", "bot", "Programming_Confidence"))
+        self.assertEqual(counts, {"Medium": 2, "High": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import os
+import time
+import shutil
+import asyncio
+import tempfile
+from unittest.mock import MagicMock, patch
+from langchain_core.messages import HumanMessage
+from agents.checkpoints import SQLiteCheckpointer
+from agents.analytics import AnalyticsAgent, _trim_history
+from tests.fake_llm import make_graph
+
+
+def ask(graph, thread_id, text):
+    result = graph.invoke({"messages": [HumanMessage(content=text)]},
+                          config={"configurable": {"thread_id": thread_id}})
+    return [m.content for m in result["messages"]]
+
+
+class TestSQLiteCheckpointer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'checkpoints.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_conversation_survives_restart(self):
+        graph = make_graph(SQLiteCheckpointer(self.path))
+        ask(graph, "admin", "first question")
+
+        checkpointer = SQLiteCheckpointer(self.path)
+        messages = ask(make_graph(checkpointer), "admin", "second question")
+        self.assertEqual(messages[0], "first question")
+        self.assertEqual(messages[-2], "second question")
+        self.assertEqual(checkpointer.stats()["loads"], 1)
+
+    def test_checkpoints_per_thread_are_capped(self):
+        checkpointer = SQLiteCheckpointer(self.path, max_checkpoints=3)
+        graph = make_graph(checkpointer)
+        for i in range(10):
+            messages = ask(graph, "admin", f"q{i}")
+        self.assertEqual(len(messages), 20)
+        stored = list(checkpointer.list({"configurable": {"thread_id": "admin"}}))
+        self.assertLess(len(stored), 6)
+        self.assertGreater(checkpointer.stats()["compactions"], 0)
+        # Channel values of compacted checkpoints are gone too
+        conn = checkpointer._conn()
+        versions = conn.execute("SELECT COUNT(*) FROM blobs WHERE channel = 'messages'").fetchone()[0]
+        self.assertLessEqual(versions, len(stored))
+
+    def test_idle_threads_leave_memory_and_reload(self):
+        checkpointer = SQLiteCheckpointer(self.path, max_threads=2, idle_ttl=60)
+        graph = make_graph(checkpointer)
+        for thread in ("a", "b", "c"):
+            ask(graph, thread, f"hello {thread}")
+        self.assertEqual(checkpointer.stats()["hot_threads"], 2)
+
+        checkpointer.sweep(now=time.time() + 61)
+        self.assertEqual(checkpointer.stats()["hot_threads"], 0)
+        self.assertEqual(ask(graph, "a", "back again")[0], "hello a")
+
+    def test_thread_ttl_deletes_from_disk(self):
+        checkpointer = SQLiteCheckpointer(self.path, thread_ttl=3600)
+        ask(make_graph(checkpointer), "old", "hi")
+        checkpointer.sweep(now=time.time() + 3601)
+        self.assertIsNone(checkpointer.get_tuple({"configurable": {"thread_id": "old"}}))
+        self.assertEqual(checkpointer.stats()["threads"], 0)
+
+    def test_async_interface(self):
+        graph = make_graph(SQLiteCheckpointer(self.path))
+
+        async def scenario():
+            config = {"configurable": {"thread_id": "async"}}
+            await graph.ainvoke({"messages": [HumanMessage(content="one")]}, config=config)
+            result = await graph.ainvoke({"messages": [HumanMessage(content="two")]}, config=config)
+            return [m.content for m in result["messages"]]
+
+        self.assertEqual(asyncio.run(scenario())[::2], ["one", "two"])
+
+
+class TestBoundedThreads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'checkpoints.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_old_turns_are_dropped_from_the_thread(self):
+        graph = make_graph(SQLiteCheckpointer(self.path), pre_model_hook=_trim_history(2))
+        for i in range(5):
+            messages = ask(graph, "admin", f"q{i}")
+        self.assertEqual(messages, ["q3", "reply 3", "q4", "reply 4"])
+        # What is stored is trimmed too, not just the prompt
+        reloaded = make_graph(SQLiteCheckpointer(self.path))
+        state = reloaded.get_state({"configurable": {"thread_id": "admin"}})
+        self.assertEqual(len(state.values["messages"]), 4)
+
+    def test_agent_threads_expire_by_default(self):
+        env = {"GEMINI_API_KEY": "test-key", "CHECKPOINT_DB": self.path}
+        with patch.dict(os.environ, env):
+            agent = AnalyticsAgent(data_file=os.path.join(self.tmp, 'responses.xlsx'))
+        self.assertEqual(agent.checkpointer.thread_ttl, 86400)
+
+
+class TestAnalysisThreads(unittest.TestCase):
+    def test_llm_analysis_leaves_no_thread_behind(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            checkpointer = SQLiteCheckpointer(os.path.join(tmp, 'checkpoints.db'))
+            agent = AnalyticsAgent(data_file=os.path.join(tmp, 'responses.xlsx'), mode="llm",
+                                   checkpointer=checkpointer)
+            agent.app = make_graph(checkpointer)
+            agent._parse_analysis = MagicMock(return_value={"total_participants": 0})
+            for _ in range(3):
+                agent.analyze()
+            self.assertEqual(checkpointer.stats()["threads"], 0)
+            self.assertEqual(checkpointer.stats()["checkpoints"], 0)
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main()
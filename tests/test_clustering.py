@@ -0,0 +1,79 @@
+import unittest
+import os
+import shutil
+import tempfile
+from agents.clustering import IdeaClusterer, tokenize
+from agents.analytics import local_interest_clusters
+from agents.chatbot import WarmUpBot
+
+IDEAS = {
+    "I want to build a trading bot": 3,
+    "Crypto trading bot": 2,
+    "A stock trading bot": 1,
+    "Diagnosis helper for doctors": 2,
+    "Medical diagnosis helper": 1,
+    "Maths tutor for kids": 2,
+    "Homework tutor for kids": 1,
+}
+
+class TestIdeaClusterer(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize("I want to build a Trading Bot!"), ["trading", "bot", "trading bot"])
+
+    def test_groups_similar_ideas(self):
+        clusterer = IdeaClusterer(n_clusters=3).update(IDEAS)
+        clusters = clusterer.clusters()
+        self.assertEqual(sum(c["count"] for c in clusters), sum(IDEAS.values()))
+        by_label = {c["label"]: c for c in clusters}
+        self.assertEqual(by_label["Trading Bot"]["count"], 6)
+        self.assertEqual(by_label["Trading Bot"]["examples"][0], "I want to build a trading bot")
+        self.assertEqual(by_label["Diagnosis Helper"]["count"], 3)
+        self.assertEqual(by_label["Tutor Kids"]["count"], 3)
+
+    def test_incremental_updates(self):
+        clusterer = IdeaClusterer(n_clusters=3).update(IDEAS, version="v1")
+        fitted = clusterer.fitted_rows
+        # Same version: nothing to do
+        self.assertIs(clusterer.update({}, version="v1"), clusterer)
+
+        more = dict(IDEAS, **{"Trading bot with alerts": 4, "I want to build a trading bot": 5})
+        clusterer.update(more, version="v2")
+        self.assertEqual(clusterer.fitted_rows, fitted)  # folded in without a refit
+        summary = clusterer.summary()
+        self.assertEqual(summary["Trading Bot"], 12)
+        self.assertEqual(sum(summary.values()), sum(more.values()))
+
+        # Ideas vanished (data reset): rebuilt from scratch
+        clusterer.update({"Tutor bot": 1}, version="v3")
+        self.assertEqual(clusterer.summary(), {"Tutor Bot": 1})
+
+    def test_limit_folds_the_rest_into_other(self):
+        clusterer = IdeaClusterer(n_clusters=3).update(dict(IDEAS, **{"???": 2}))
+        summary = clusterer.summary(limit=1)
+        self.assertEqual(summary, {"Trading Bot": 6, "Other": 8})
+        self.assertEqual(sum(summary.values()), sum(IDEAS.values()) + 2)
+
+    def test_ideas_without_words(self):
+        summary = IdeaClusterer().update({"???": 2, "Trading bot": 1}).summary()
+        self.assertEqual(summary, {"Other": 2, "Trading Bot": 1})
+
+
+class TestLocalInterestClusters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bot = WarmUpBot()
+        self.bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_follows_new_responses(self):
+        self.bot.save_response(["Learn", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"], None)
+        self.assertEqual(local_interest_clusters(self.bot.data_file), {"Trading Bot": 1})
+        self.bot.save_response(["Learn", "Finance", "trading bot", "Low", "Beginner", "Mix"], None)
+        self.bot.save_response(["Learn", "Health", "Diagnosis Helper", "Low", "Beginner", "Mix"], None)
+        self.assertEqual(local_interest_clusters(self.bot.data_file),
+                         {"Trading Bot": 2, "Diagnosis Helper": 1})
+
+if __name__ == '__main__':
+    unittest.main()
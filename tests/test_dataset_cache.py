@@ -0,0 +1,60 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import pandas as pd
+from agents.dataset import DatasetCache, dataset_cache
+from agents.storage import ResponseLog, log_path_for, make_record
+from agents.analytics import filter_and_count, get_dataset_info, get_raw_data
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.log = ResponseLog(log_path_for(self.data_file))
+        self.log.append([
+            make_record(["Learn", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"]),
+            make_record(["Learn", "Healthcare", "Diagnosis", "Low", "Beginner", "Conceptual"]),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        dataset_cache.invalidate(self.data_file)
+
+    def test_reload_only_on_version_change(self):
+        cache = DatasetCache()
+        v1, df1 = cache.get(self.data_file)
+        v2, df2 = cache.get(self.data_file)
+        self.assertIs(df1, df2)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        self.log.append(make_record(["Learn", "Finance", "Bot", "Medium", "Beginner", "Mix"]))
+        v3, df3 = cache.get(self.data_file)
+        self.assertNotEqual(v1, v3)
+        self.assertEqual(len(df3), 3)
+        self.assertEqual(cache.stats()["reloads"], 1)
+
+    def test_xlsx_without_log(self):
+        xlsx = os.path.join(self.tmp, 'plain.xlsx')
+        pd.DataFrame({"Domain": ["Edu", "Edu", "Finance"]}).to_excel(xlsx, index=False)
+        cache = DatasetCache()
+        _, df = cache.get(xlsx)
+        self.assertEqual(len(df), 3)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(os.path.join(self.tmp, 'missing.xlsx'))
+
+    def test_tools_share_one_parse(self):
+        before = dataset_cache.stats()
+        self.assertIn("Shape: (2,", get_dataset_info(self.data_file))
+        self.assertEqual(len(json.loads(get_raw_data(self.data_file, 5))), 2)
+        after = dataset_cache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        # The query engine encodes the same shared frame (see test_query.py)
+        counts = json.loads(filter_and_count(self.data_file, "Project_Idea", "bot", "Domain"))
+        self.assertEqual(counts, {"Finance": 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 import json
 import os
 import shutil
-from app import app
+from app import app, bot
 
 class TestAudienceSystem(unittest.TestCase):
     def setUp(self):
@@ -35,6 +35,7 @@ class TestAudienceSystem(unittest.TestCase):
             print(f"Bot: {data['response']}")
 
         # 2. Verify Data Storage
+        bot.export_xlsx()
         self.assertTrue(os.path.exists('data/responses.xlsx'))
         
         # 3. Trigger Analytics & Report
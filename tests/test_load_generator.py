@@ -0,0 +1,83 @@
+import os
+import time
+import shutil
+import tempfile
+import argparse
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+from werkzeug.serving import make_server
+from app import app, bot
+from utils import populate_data
+from utils.populate_data import run_load
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.original_data_file = bot.data_file
+        bot.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        bot.flush()
+        bot.data_file = self.original_data_file
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_participants_complete_over_http(self):
+        args = argparse.Namespace(url=f"http://127.0.0.1:{self.server.server_port}", participants=30,
+                                  concurrency=8, rate=0, analyze_rate=0, admin_chat_rate=0,
+                                  timeout=10, seed=7, output=None)
+        rows = run_load(args)
+
+        chat = rows["/api/chat"]
+        self.assertEqual(chat["requests"], 30 * 7)
+        self.assertEqual(chat["errors"], 0)
+        self.assertLessEqual(chat["p50_ms"], chat["p95_ms"])
+        self.assertLessEqual(chat["p95_ms"], chat["p99_ms"])
+        # Every participant has its own session id, so all 30 profiles are saved
+        bot.flush()
+        self.assertEqual(bot.log.count(), 30)
+
+
+class TestLatencyAccounting(unittest.TestCase):
+    def test_queueing_delay_is_counted(self):
+        class InstantClient:
+            def post(self, path, payload=None):
+                return 200, b"{}"
+
+        stats = populate_data.LoadStats()
+        # This participant was due half a second ago but only got a thread now
+        late = time.perf_counter() - 0.5
+        populate_data.participant_flow(InstantClient(), stats, 0, 0, scheduled=late)
+        latencies = sorted(stats._latencies["/api/chat"])
+        self.assertGreaterEqual(latencies[-1], 0.5)
+        self.assertLess(latencies[0], 0.5)
+
+
+class TestInProcessPopulate(unittest.TestCase):
+    def test_counts_saved_responses(self):
+        tmp = tempfile.mkdtemp()
+        data_file = os.path.join(tmp, 'responses.xlsx')
+
+        class TempBot(populate_data.WarmUpBot):
+            def __init__(self):
+                super().__init__()
+                self.data_file = data_file
+
+        out = StringIO()
+        try:
+            with patch.object(populate_data, 'WarmUpBot', TempBot), redirect_stdout(out):
+                populate_data.populate(3)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.assertIn("New records added: 3", out.getvalue())
+        self.assertNotIn("Error", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
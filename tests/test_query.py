@@ -0,0 +1,103 @@
+import os
+import json
+import random
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from agents.analytics import filter_and_count
+from agents.dataset import dataset_cache
+from agents.query import NgramIndex, QueryEngine, engine_for
+from agents.storage import ResponseLog, log_path_for, make_record
+
+
+class TestNgramIndex(unittest.TestCase):
+    def setUp(self):
+        self.texts = ["trading bot", "chat bot for clinics", "fraud detection", "", "bo"]
+        self.index = NgramIndex(self.texts)
+
+    def expected(self, query):
+        return [i for i, t in enumerate(self.texts) if query in t]
+
+    def test_matches_plain_substring_search(self):
+        for query in ["bot", "bot ", "t bo", "fraud detection", "o", "bo", "", "xyz", "clinicsx"]:
+            self.assertEqual(list(self.index.search(query)), self.expected(query), query)
+
+    def test_candidates_come_from_postings(self):
+        # Only strings sharing every trigram of the query are looked at
+        self.assertEqual(list(self.index.postings["bot"]), [0, 1])
+        self.assertEqual(len(self.index.search("zzz")), 0)
+
+
+class TestQueryEngine(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        ideas = ["Trading Bot", "Chatbot for clinics", "Fraud detection", "Crop yield model", None]
+        self.frame = pd.DataFrame({
+            "Project_Idea": [rng.choice(ideas) for _ in range(500)],
+            "Domain": [rng.choice(["Finance", "Healthcare", "Agri", None]) for _ in range(500)],
+            "AI_Experience": [rng.choice(["Beginner", "Advanced"]) for _ in range(500)],
+        })
+        self.engine = QueryEngine(self.frame)
+
+    def test_filter_count_matches_pandas(self):
+        for pattern in ["bot", "BOT", "o", "crop yield", "detect", "nothing here"]:
+            mask = self.frame["Project_Idea"].str.contains(pattern, case=False, regex=False, na=False)
+            rows = self.engine.where("Project_Idea", pattern)
+            self.assertEqual(list(rows), list(np.flatnonzero(mask)), pattern)
+            expected = self.frame[mask]["Domain"].value_counts().to_dict()
+            self.assertEqual(self.engine.count("Domain", rows), expected, pattern)
+
+    def test_count_is_most_common_first(self):
+        counts = self.engine.count("AI_Experience")
+        self.assertEqual(counts, self.frame["AI_Experience"].value_counts().to_dict())
+        self.assertEqual(list(counts.values()), sorted(counts.values(), reverse=True))
+
+    def test_crosstab_matches_pandas(self):
+        rows = self.engine.where("Project_Idea", "bot")
+        filtered = self.frame.iloc[rows]
+        expected = filtered.groupby(["Domain", "AI_Experience"]).size().to_dict()
+        self.assertEqual(self.engine.crosstab("Domain", "AI_Experience", rows), expected)
+
+    def test_unknown_column(self):
+        with self.assertRaises(KeyError):
+            self.engine.where("Nope", "x")
+
+
+class TestFilterAndCount(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.log = ResponseLog(log_path_for(self.data_file))
+        self.log.append([
+            make_record(["Learn", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"]),
+            make_record(["Learn", "Healthcare", "Chatbot (triage)", "Low", "Beginner", "Conceptual"]),
+            make_record(["Learn", "Finance", "Fraud detection", "Low", "Beginner", "Mix"]),
+        ])
+
+    def tearDown(self):
+        dataset_cache.invalidate(self.data_file)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_tool_output(self):
+        counts = json.loads(filter_and_count(self.data_file, "Project_Idea", "BOT", "Domain"))
+        self.assertEqual(counts, {"Finance": 1, "Healthcare": 1})
+        # Patterns are literal text, not regular expressions
+        self.assertEqual(json.loads(filter_and_count(self.data_file, "Project_Idea", "(triage", "Domain")),
+                         {"Healthcare": 1})
+        self.assertEqual(filter_and_count(self.data_file, "Project_Idea", "robot", "Domain"),
+                         "No matching records found.")
+        self.assertIn("Error", filter_and_count(self.data_file, "Project_Idea", "bot", "Nope"))
+
+    def test_engine_follows_the_log(self):
+        engine = engine_for(self.data_file)
+        self.assertIs(engine_for(self.data_file), engine)
+        self.log.append(make_record(["Learn", "Retail", "Stock bot", "High", "Beginner", "Mix"]))
+        self.assertIsNot(engine_for(self.data_file), engine)
+        counts = json.loads(filter_and_count(self.data_file, "Project_Idea", "bot", "Domain"))
+        self.assertEqual(counts["Retail"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
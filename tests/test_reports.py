@@ -0,0 +1,96 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from agents import reports
+from agents.reports import ReportRenderer, content_hash, render_html
+from agents.writer import WriterAgent
+from app import app, writer_agent
+
+DATA = {
+    "total_participants": 3,
+    "experience_breakdown": {"Beginner": 2, "Advanced": 1},
+    "confidence_breakdown": {"Low": 2, "High": 1},
+    "top_domains": {"Finance": 2, "Healthcare": 1},
+    "interest_clusters": {"Trading <Bots>": 2, "Health": 1},
+}
+
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.writer = WriterAgent(output_file=os.path.join(self.tmp, 'report.txt'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_all_formats_are_written(self):
+        text = self.writer.write_report(DATA)
+        self.assertIn("TOTAL PARTICIPANTS: 3", text)
+        self.assertIn("- Beginner: 2\n", text)
+        self.assertEqual(sorted(os.listdir(self.tmp)), ['report.html', 'report.json', 'report.md', 'report.txt'])
+        with open(os.path.join(self.tmp, 'report.json')) as f:
+            self.assertEqual(json.load(f), DATA)
+        with open(os.path.join(self.tmp, 'report.md')) as f:
+            self.assertIn("| Finance | 2 |", f.read())
+        self.assertIn("Trading &lt;Bots&gt;", render_html(DATA))
+
+    def test_content_hash_ignores_key_order(self):
+        reordered = dict(reversed(list(DATA.items())))
+        self.assertEqual(content_hash(DATA), content_hash(reordered))
+        self.assertNotEqual(content_hash(DATA), content_hash(dict(DATA, total_participants=4)))
+
+    def test_unchanged_report_is_not_rewritten(self):
+        self.writer.write_report(DATA)
+        with patch.object(reports, 'atomic_write') as write:
+            self.writer.write_report(dict(DATA))
+            # A fresh renderer (e.g. after a restart) compares bytes on disk
+            WriterAgent(output_file=self.writer.output_file).write_report(DATA)
+        write.assert_not_called()
+        self.assertEqual(self.writer.renderer.stats()["writes"], 4)
+
+        self.writer.write_report(dict(DATA, total_participants=4))
+        self.assertEqual(self.writer.renderer.stats()["writes"], 8)
+        with open(self.writer.output_file) as f:
+            self.assertIn("TOTAL PARTICIPANTS: 4", f.read())
+
+    def test_renders_are_cached_by_content(self):
+        renderer = ReportRenderer()
+        with patch.dict(reports.FORMATS, {"txt": (".txt", "text/plain", reports.render_text)}):
+            renderer.render(DATA, "txt")
+            renderer.render(dict(DATA), "txt")
+        self.assertEqual(renderer.stats()["renders"], 1)
+        self.assertEqual(renderer.stats()["hits"], 1)
+
+    def test_failed_write_leaves_old_file(self):
+        self.writer.write_report(DATA)
+        with patch.object(reports.os, 'replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.writer.write_report(dict(DATA, total_participants=9))
+        with open(self.writer.output_file) as f:
+            self.assertIn("TOTAL PARTICIPANTS: 3", f.read())
+        self.assertFalse([n for n in os.listdir(self.tmp) if n.startswith('.tmp-')])
+
+    def test_report_endpoint_etag(self):
+        client = app.test_client()
+        saved = writer_agent.output_file
+        writer_agent.output_file = os.path.join(self.tmp, 'served.txt')
+        try:
+            writer_agent.write_report(DATA)
+            response = client.get('/api/report?format=html')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.content_type.startswith('text/html'))
+            etag = response.headers['ETag']
+
+            cached = client.get('/api/report?format=html', headers={'If-None-Match': etag})
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(client.get('/api/report?format=md', headers={'If-None-Match': etag}).status_code, 200)
+            self.assertEqual(client.get('/api/report?format=pdf').status_code, 400)
+        finally:
+            writer_agent.output_file = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import threading
+from agents.result_cache import VersionedResultCache
+from app import app, bot, analytics_agent, analysis_cache
+
+class TestVersionedResultCache(unittest.TestCase):
+    def test_fresh_stale_and_single_refresh(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(2)
+            return {"n": len(calls)}
+
+        cache = VersionedResultCache(compute)
+        self.assertEqual(cache.get("v1"), ({"n": 1}, "v1", "fresh"))
+        self.assertEqual(cache.get("v1"), ({"n": 1}, "v1", "fresh"))
+
+        # Data moved on: the old result is served while one refresh runs
+        for _ in range(5):
+            self.assertEqual(cache.get("v2"), ({"n": 1}, "v1", "stale"))
+        release.set()
+        cache.wait(2)
+        self.assertEqual(cache.get("v2"), ({"n": 2}, "v2", "fresh"))
+        self.assertEqual(len(calls), 2)
+
+    def test_wait_skips_stale(self):
+        counter = iter(range(100))
+        cache = VersionedResultCache(lambda: next(counter))
+        cache.get("v1")
+        self.assertEqual(cache.get("v2", wait=True), (1, "v2", "fresh"))
+
+    def test_uncacheable_results(self):
+        counter = iter(range(100))
+        cache = VersionedResultCache(lambda: next(counter), should_cache=lambda v: v > 0)
+        self.assertEqual(cache.get("v1")[0], 0)
+        self.assertEqual(cache.get("v1")[0], 1)
+        self.assertEqual(cache.get("v1")[0], 1)
+
+
+class TestAnalyzeEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        self.tmp = tempfile.mkdtemp()
+        self.saved = (bot.data_file, analytics_agent.data_file, analytics_agent.mode)
+        bot.data_file = analytics_agent.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        analytics_agent.mode = "local"
+        analysis_cache.invalidate()
+        bot.save_response(["Learn", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"], None)
+
+    def tearDown(self):
+        analysis_cache.wait(5)
+        analysis_cache.invalidate()
+        bot.data_file, analytics_agent.data_file, analytics_agent.mode = self.saved
+        shutil.rmtree(self.tmp)
+
+    def test_etag_and_conditional_requests(self):
+        rv = self.client.post('/api/analyze')
+        self.assertEqual(rv.status_code, 200)
+        etag = rv.headers['ETag']
+        self.assertEqual(json.loads(rv.data)['analytics']['total_participants'], 1)
+
+        rv = self.client.post('/api/analyze', headers={'If-None-Match': etag})
+        self.assertEqual(rv.status_code, 304)
+
+        # New data: last good result comes back immediately, then refreshes
+        bot.save_response(["Learn", "Healthcare", "Diagnosis", "Low", "Beginner", "Mix"], None)
+        rv = self.client.post('/api/analyze', headers={'If-None-Match': etag})
+        self.assertEqual(rv.headers['X-Analysis-State'], 'stale')
+        analysis_cache.wait(5)
+        rv = self.client.post('/api/analyze', headers={'If-None-Match': etag})
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.headers['X-Analysis-State'], 'fresh')
+        self.assertEqual(json.loads(rv.data)['analytics']['total_participants'], 2)
+
+    def test_no_cache_forces_fresh_result(self):
+        self.client.post('/api/analyze')
+        bot.save_response(["Learn", "Healthcare", "Diagnosis", "Low", "Beginner", "Mix"], None)
+        rv = self.client.post('/api/analyze', headers={'Cache-Control': 'no-cache'})
+        self.assertEqual(rv.headers['X-Analysis-State'], 'fresh')
+        self.assertEqual(json.loads(rv.data)['analytics']['total_participants'], 2)
+
+    def test_xlsx_is_only_written_on_export(self):
+        self.client.post('/api/analyze')
+        self.assertFalse(os.path.exists(bot.data_file))
+        rv = self.client.get('/api/admin/export')
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn('responses.xlsx', rv.headers['Content-Disposition'])
+        rv.close()
+        self.assertTrue(os.path.exists(bot.data_file))
+
+if __name__ == '__main__':
+    unittest.main()
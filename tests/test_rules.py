@@ -0,0 +1,44 @@
+import unittest
+from agents.rules import RuleEngine, ANY_STEP, ELABORATE
+
+class TestRuleEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RuleEngine()
+
+    def test_confidence_validation(self):
+        error, _ = self.engine.evaluate(3, "Not sure")
+        self.assertIn("Please answer with Low, Medium, or High", error)
+        error, _ = self.engine.evaluate(3, "Pretty MEDIUM I guess")
+        self.assertIsNone(error)
+
+    def test_short_answers(self):
+        self.assertEqual(self.engine.evaluate(0, "learn")[0], ELABORATE)
+        self.assertEqual(self.engine.evaluate(2, "bot")[0], ELABORATE)
+        # Single-word answers are fine for the multiple-choice questions
+        self.assertIsNone(self.engine.evaluate(1, "Finance")[0])
+        self.assertIsNone(self.engine.evaluate(4, "Beginner")[0])
+
+    def test_reactions_in_priority_order(self):
+        self.assertIn("Finance", self.engine.evaluate(1, "Finance")[1])
+        self.assertIn("Finance", self.engine.evaluate(1, "healthcare and finance")[1])
+        self.assertIn("Awesome", self.engine.evaluate(3, "High, I use Python daily")[1])
+        self.assertEqual(self.engine.evaluate(3, "High")[1], "")
+
+    def test_overlapping_keywords(self):
+        engine = RuleEngine({
+            ANY_STEP: {"reactions": [
+                {"all": ["ai", "air"], "reply": "both"},
+            ]},
+        })
+        self.assertEqual(engine.scan("Airline"), {"ai", "air"})
+        self.assertEqual(engine.evaluate(0, "airline ops")[1], "both")
+
+    def test_many_rules_single_scan(self):
+        rules = {ANY_STEP: {"reactions": [
+            {"all": [f"domain{i:03d}"], "reply": f"r{i}"} for i in range(100)
+        ]}}
+        engine = RuleEngine(rules)
+        self.assertEqual(engine.evaluate(1, "I work in DOMAIN042")[1], "r42")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import time
+import shutil
+import tempfile
+import os
+import multiprocessing as mp
+from agents.sessions import Session, SessionManager, SessionStore, SQLiteSessionStore
+from agents.chatbot import WarmUpBot
+
+class TestSessionManager(unittest.TestCase):
+    def test_session_record_is_compact(self):
+        session = Session({"name": "Alice"})
+        self.assertFalse(hasattr(session, '__dict__'))
+        with self.assertRaises(AttributeError):
+            session.extra = 1
+
+    def test_incomplete_store_fails_early(self):
+        class GetOnly(SessionStore):
+            def get(self, user_id):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+    def test_idle_sessions_expire(self):
+        manager = SessionManager(ttl=60, sweep_interval=1000)
+        manager.create("u1")
+        manager.create("u2")
+        now = time.monotonic()
+        manager.get("u2").last_seen = now + 100  # u2 stays active
+        self.assertEqual(manager.sweep(now=now + 90), 1)
+        self.assertIsNone(manager.get("u1"))
+        self.assertEqual(manager.stats()["expired"], 1)
+
+    def test_expired_on_access(self):
+        manager = SessionManager(ttl=0.01, sweep_interval=1000)
+        manager.create("u1")
+        time.sleep(0.02)
+        self.assertIsNone(manager.get("u1"))
+        self.assertEqual(manager.stats()["live"], 0)
+
+    def test_lru_eviction(self):
+        manager = SessionManager(max_sessions=2)
+        manager.create("u1")
+        manager.create("u2")
+        manager.get("u1")  # u2 is now least recently used
+        manager.create("u3")
+        self.assertIn("u1", manager)
+        self.assertNotIn("u2", manager)
+        self.assertEqual(manager.stats()["evicted"], 1)
+
+    def test_bot_counts_completed_sessions(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            bot = WarmUpBot()
+            bot.data_file = os.path.join(tmp, 'responses.xlsx')
+            bot.get_response("u1", "START_SESSION", {"name": "Alice"})
+            for answer in ["I want to learn", "Finance", "A trading bot", "High", "Beginner", "Hands-on"]:
+                bot.get_response("u1", answer)
+            stats = bot.sessions.stats()
+            self.assertEqual(stats["completed"], 1)
+            self.assertEqual(stats["live"], 0)
+            self.assertEqual(bot.log.count(), 1)
+        finally:
+            shutil.rmtree(tmp)
+
+
+def _answer_in_child(db_path, data_file, message):
+    bot = WarmUpBot(session_store=SQLiteSessionStore(db_path))
+    bot.data_file = data_file
+    bot.get_response("u1", message)
+
+
+class TestSQLiteSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, 'sessions.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_sessions_shared_between_stores(self):
+        a = SQLiteSessionStore(self.db_path)
+        b = SQLiteSessionStore(self.db_path)
+        a.create("u1", {"name": "Alice"})
+        session = b.get("u1")
+        session.responses.append("I want to learn")
+        session.step += 1
+        b.save("u1", session)
+
+        session = a.get("u1")
+        self.assertEqual(session.step, 1)
+        self.assertEqual(session.responses, ["I want to learn"])
+        self.assertEqual(session.user_data, {"name": "Alice"})
+        a.complete("u1")
+        self.assertEqual(b.stats()["completed"], 1)
+        self.assertEqual(b.stats()["live"], 0)
+
+    def test_ttl_and_size_limits(self):
+        store = SQLiteSessionStore(self.db_path, ttl=60, max_sessions=2, sweep_interval=1000)
+        for uid in ["u1", "u2", "u3"]:
+            store.create(uid)
+        self.assertEqual(store.sweep(), 1)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.sweep(now=time.time() + 120), 2)
+        stats = store.stats()
+        self.assertEqual((stats["evicted"], stats["expired"]), (1, 2))
+
+    def test_answers_across_processes(self):
+        data_file = os.path.join(self.tmp, 'responses.xlsx')
+        bot = WarmUpBot(session_store=SQLiteSessionStore(self.db_path))
+        bot.data_file = data_file
+        bot.get_response("u1", "START_SESSION", {"name": "Alice"})
+        answers = ["I want to learn", "Finance", "A trading bot", "High", "Beginner", "Hands-on"]
+        ctx = mp.get_context("fork")
+        for i, answer in enumerate(answers):
+            if i % 2:
+                bot.get_response("u1", answer)
+            else:
+                p = ctx.Process(target=_answer_in_child, args=(self.db_path, data_file, answer))
+                p.start()
+                p.join()
+        self.assertEqual(bot.log.count(), 1)
+        self.assertEqual(bot.log.read_records()[0]["Domain"], "Finance")
+
+if __name__ == '__main__':
+    unittest.main()
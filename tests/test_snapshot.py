@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from agents import snapshot
+from agents.dataset import dataset_cache, load_columns, value_counts
+from agents.snapshot import SnapshotStore
+from agents.storage import ResponseLog, log_path_for, make_record
+
+
+def record(domain, idea="Bot"):
+    return make_record(["Learn", domain, idea, "High", "Beginner", "Mix"], {"name": "P", "email": "p@x"})
+
+
+@unittest.skipUnless(snapshot.available(), "pyarrow is not installed")
+class TestColumnarSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.tmp, 'responses.xlsx')
+        self.log = ResponseLog(log_path_for(self.data_file))
+        self.log.append([record("Finance"), record("Finance"), record("Healthcare")])
+
+    def tearDown(self):
+        dataset_cache.invalidate(self.data_file)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def snapshots(self):
+        return sorted(n for n in os.listdir(self.log.path) if n.startswith("snapshot-"))
+
+    def test_column_projection(self):
+        store = SnapshotStore(self.log)
+        snap = store.get()
+        self.assertEqual(snap.value_counts("Domain"), {"Finance": 2, "Healthcare": 1})
+        df = snap.frame(["Domain"])
+        self.assertEqual(list(df.columns), ["Domain"])
+        self.assertEqual(len(df), 3)
+        with self.assertRaises(KeyError):
+            snap.frame(["Nope"])
+        self.assertEqual(self.snapshots(), [f"snapshot-{self.log.version()}.arrow"])
+
+    def test_incremental_rebuild_replaces_old_file(self):
+        store = SnapshotStore(self.log)
+        store.get()
+        self.log.append(record("Retail"))
+        snap = store.get()
+        self.assertEqual(snap.num_rows, 4)
+        self.assertEqual(store.stats()["incremental_builds"], 1)
+        self.assertEqual(len(self.snapshots()), 1)
+        self.assertEqual(snap.value_counts("Domain")["Retail"], 1)
+
+    def test_other_process_reuses_snapshot_on_disk(self):
+        SnapshotStore(self.log).get()
+        other = SnapshotStore(ResponseLog(self.log.path))
+        self.assertEqual(other.get().num_rows, 3)
+        self.assertEqual(other.stats()["builds"], 0)
+        # ...and extends it incrementally once the log grows
+        self.log.append(record("Retail"))
+        self.assertEqual(other.get().num_rows, 4)
+        self.assertEqual(other.stats()["incremental_builds"], 1)
+
+    def test_clear_drops_snapshots(self):
+        store = SnapshotStore(self.log)
+        store.get()
+        self.log.clear()
+        self.log.append(record("Education"))
+        self.assertEqual(store.get().value_counts("Domain"), {"Education": 1})
+
+    def test_dataset_helpers_use_snapshot(self):
+        before = dataset_cache.stats()
+        self.assertEqual(value_counts(self.data_file, "Domain"), {"Finance": 2, "Healthcare": 1})
+        df = load_columns(self.data_file, ["Domain", "Project_Idea", "Domain"])
+        self.assertEqual(list(df.columns), ["Domain", "Project_Idea"])
+        # No full parse was needed
+        self.assertEqual(dataset_cache.stats()["misses"], before["misses"])
+
+
+class TestWithoutPyarrow(unittest.TestCase):
+    def test_helpers_fall_back_to_full_frame(self):
+        tmp = tempfile.mkdtemp()
+        data_file = os.path.join(tmp, 'responses.xlsx')
+        try:
+            ResponseLog(log_path_for(data_file)).append([record("Finance"), record("Tech")])
+            with patch.object(snapshot, 'pa', None):
+                self.assertEqual(value_counts(data_file, "Domain"), {"Finance": 1, "Tech": 1})
+                self.assertEqual(list(load_columns(data_file, ["Domain"]).columns), ["Domain"])
+                with self.assertRaises(KeyError):
+                    value_counts(data_file, "Nope")
+            self.assertFalse([n for n in os.listdir(log_path_for(data_file)) if n.startswith("snapshot-")])
+        finally:
+            dataset_cache.invalidate(data_file)
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+import json
+import threading
+import unittest
+import subprocess
+from agents.lazy import Lazy
+from benchmarks.startup import FORBIDDEN, ROOT
+
+PROBE = """
+import sys, json
+import app
+before = sorted(sys.modules)
+stats = app.app.test_client().get('/api/admin/stats').json
+print(json.dumps({"modules": before, "loaded": app.analytics_agent.loaded, "stats_loaded": stats["analytics_agent_loaded"]}))
+"""
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_import_app_skips_admin_stack(self):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        modules = set(result["modules"])
+        self.assertEqual([m for m in FORBIDDEN if m in modules], [])
+        # Reading the admin stats does not build the agent either
+        self.assertFalse(result["loaded"])
+        self.assertFalse(result["stats_loaded"])
+
+    def test_lazy_builds_once(self):
+        builds = []
+        barrier = threading.Barrier(8)
+
+        class Target:
+            value = 1
+
+        def factory():
+            builds.append(1)
+            return Target()
+
+        lazy = Lazy(factory)
+        self.assertFalse(lazy.loaded)
+
+        def touch():
+            barrier.wait()
+            lazy.value
+
+        threads = [threading.Thread(target=touch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(lazy.loaded)
+
+        lazy.value = 5
+        self.assertEqual(lazy.get().value, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
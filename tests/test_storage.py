@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import pandas as pd
+from unittest.mock import patch
+from agents.storage import ResponseLog, SCHEMA, make_record
+
+class TestResponseLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.log = ResponseLog(os.path.join(self.tmp, 'responses.log'), segment_bytes=512)
+        self.answers = ["Learn agents", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_append_and_read_back(self):
+        for i in range(10):
+            self.log.append(make_record(self.answers, {"name": f"User {i}", "email": "u@example.com"}))
+
+        records = self.log.read_records()
+        self.assertEqual(len(records), 10)
+        self.assertEqual(list(records[0].keys()), SCHEMA)
+        self.assertEqual(records[3]['Name'], "User 3")
+        # Small segments force a rollover
+        self.assertGreater(len(self.log.segments()), 1)
+
+    def test_scan_from_position(self):
+        self.log.append(make_record(self.answers))
+        _, pos = self.log.scan()
+        self.log.append([make_record(self.answers), make_record(self.answers)])
+        new_records, _ = self.log.scan(pos)
+        self.assertEqual(len(new_records), 2)
+
+    def test_torn_tail_is_ignored(self):
+        self.log.append(make_record(self.answers))
+        last = os.path.join(self.log.path, self.log.segments()[-1])
+        with open(last, 'ab') as f:
+            f.write(b'{"Expectation": "half writ')
+        self.assertEqual(self.log.count(), 1)
+
+    def test_append_after_torn_tail(self):
+        self.log.append(make_record(self.answers))
+        last = os.path.join(self.log.path, self.log.segments()[-1])
+        with open(last, 'ab') as f:
+            f.write(b'{"Expectation": "half writ')
+        # A restarted writer cuts the fragment instead of gluing onto it
+        ResponseLog(self.log.path, segment_bytes=512).append(make_record(self.answers))
+        self.assertEqual(self.log.count(), 2)
+        with open(last, 'rb') as f:
+            self.assertNotIn(b'half writ', f.read())
+
+    def test_undecodable_line_is_skipped(self):
+        self.log.append(make_record(self.answers))
+        last = os.path.join(self.log.path, self.log.segments()[-1])
+        with open(last, 'ab') as f:
+            f.write(b'{"Expectation": "half writ{"Expectation": "glued"}\n')
+        self.log.append(make_record(self.answers))
+        with self.assertLogs('agents.storage', 'WARNING'):
+            self.assertEqual(self.log.count(), 2)
+
+    def test_materialize_xlsx(self):
+        xlsx = os.path.join(self.tmp, 'responses.xlsx')
+        self.log.append(make_record(self.answers, {"name": "Test User", "email": "t@example.com"}))
+        self.assertTrue(self.log.materialize(xlsx))
+        # Nothing new appended: export is skipped
+        self.assertFalse(self.log.materialize(xlsx))
+
+        df = pd.read_excel(xlsx)
+        self.assertEqual(list(df.columns), SCHEMA)
+        self.assertEqual(df.iloc[0]['Name'], "Test User")
+
+    def test_failed_sync_rolls_back_the_write(self):
+        self.log.append(make_record(self.answers))
+        with patch('agents.storage.os.fsync', side_effect=OSError("EIO")):
+            with self.assertRaises(OSError):
+                self.log.append(make_record(self.answers))
+        self.assertEqual(self.log.count(), 1)
+
+    def test_concurrent_legacy_import_runs_once(self):
+        xlsx = os.path.join(self.tmp, 'legacy.xlsx')
+        pd.DataFrame([make_record(self.answers) for _ in range(3)], columns=SCHEMA).to_excel(xlsx, index=False)
+        # One ResponseLog per worker, as in separate processes
+        barrier = threading.Barrier(4)
+        imported = []
+
+        def worker():
+            log = ResponseLog(self.log.path)
+            barrier.wait()
+            imported.append(log.import_xlsx_once(xlsx))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(imported), [0, 0, 0, 3])
+        self.assertEqual(self.log.count(), 3)
+
+    def test_version_changes_on_append_and_clear(self):
+        v0 = self.log.version()
+        self.log.append(make_record(self.answers))
+        v1 = self.log.version()
+        self.assertNotEqual(v0, v1)
+        self.log.clear()
+        self.assertEqual(self.log.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
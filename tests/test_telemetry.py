@@ -0,0 +1,106 @@
+import time
+import unittest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from agents import telemetry
+from agents.telemetry import Registry
+from app import app
+
+
+def sample(text, name):
+    """Returns the value of the first exposition line starting with `name`."""
+    for line in text.splitlines():
+        if line.startswith(name):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_histogram_exposition(self):
+        registry = Registry()
+        histogram = registry.histogram("demo_duration_seconds", "Demo")
+        histogram.observe(0.003, op="read")
+        histogram.observe(0.2, op="read")
+        histogram.observe(100, op="read")
+        registry.counter("demo_total", "Demo").inc(status="ok", op="read")
+        text = registry.render()
+
+        self.assertIn("# TYPE demo_duration_seconds histogram", text)
+        self.assertEqual(sample(text, 'demo_duration_seconds_bucket{op="read",le="0.001"}'), 0)
+        self.assertEqual(sample(text, 'demo_duration_seconds_bucket{op="read",le="0.005"}'), 1)
+        self.assertEqual(sample(text, 'demo_duration_seconds_bucket{op="read",le="0.25"}'), 2)
+        self.assertEqual(sample(text, 'demo_duration_seconds_bucket{op="read",le="+Inf"}'), 3)
+        self.assertEqual(sample(text, 'demo_duration_seconds_count{op="read"}'), 3)
+        self.assertAlmostEqual(sample(text, 'demo_duration_seconds_sum{op="read"}'), 100.203)
+        self.assertEqual(sample(text, 'demo_total{op="read",status="ok"}'), 1)
+
+    def test_span_records_errors_on_trace(self):
+        trace, token = telemetry.start_trace("test-trace-1")
+        with telemetry.span("storage", op="unit_test"):
+            pass
+        with self.assertRaises(KeyError):
+            with telemetry.span("storage", op="unit_test"):
+                raise KeyError("boom")
+        telemetry.end_trace(token)
+
+        self.assertIsNone(telemetry.current_trace())
+        recorded = telemetry.find_trace("test-trace-1")
+        self.assertEqual([s["status"] for s in recorded["spans"]], ["ok", "error"])
+        text = telemetry.REGISTRY.render()
+        self.assertGreaterEqual(sample(text, 'storage_total{op="unit_test",status="error"}'), 1)
+
+    def test_callback_times_llm_and_tool_calls(self):
+        @tool
+        def shout(text: str) -> str:
+            """Upper-cases text."""
+            return text.upper()
+
+        config = {"callbacks": [telemetry.callback()]}
+        llm = GenericFakeChatModel(messages=iter([AIMessage(content="hi")]))
+        trace, token = telemetry.start_trace()
+        llm.invoke("hello", config=config)
+        shout.invoke({"text": "hey"}, config=config)
+        telemetry.end_trace(token)
+
+        kinds = [s["kind"] for s in trace.spans]
+        self.assertEqual(kinds, ["llm_call", "tool_call"])
+        self.assertEqual(trace.spans[1]["labels"], {"tool": "shout"})
+        self.assertIn('tool_call_duration_seconds_count{tool="shout"}', telemetry.REGISTRY.render())
+
+    def test_trace_id_header(self):
+        response = self.client.get('/api/admin/stats', headers={'X-Trace-Id': 'abc-123'})
+        self.assertEqual(response.headers['X-Trace-Id'], 'abc-123')
+
+        generated = self.client.get('/api/admin/stats').headers['X-Trace-Id']
+        self.assertRegex(generated, r'^[0-9a-f]{16}$')
+        # Unusable incoming ids are replaced, not echoed
+        bad = self.client.get('/api/admin/stats', headers={'X-Trace-Id': 'x' * 200}).headers['X-Trace-Id']
+        self.assertRegex(bad, r'^[0-9a-f]{16}$')
+
+        self.assertEqual(self.client.get('/api/admin/traces?id=abc-123').json["trace_id"], 'abc-123')
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/admin/stats')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertGreaterEqual(sample(text, 'http_request_total{method="GET",route="/api/admin/stats",status="200"}'), 1)
+
+    def test_span_overhead_is_small(self):
+        n = 20000
+        start = time.perf_counter()
+        for _ in range(n):
+            with telemetry.span("storage", op="overhead"):
+                pass
+        per_span = (time.perf_counter() - start) / n
+        self.assertLess(per_span, 100e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from agents.tool_cache import ToolCache
+from agents.analytics import count_values
+from agents.dataset import dataset_version
+from agents.chatbot import WarmUpBot
+
+class TestToolCache(unittest.TestCase):
+    def setUp(self):
+        self.version = "v1"
+        self.calls = []
+        self.cache = ToolCache(lambda: self.version, max_entries=3)
+
+    def tool(self, column: str, limit: int = 5):
+        self.calls.append((column, limit))
+        return f"{column}:{limit}"
+
+    def test_hits_normalized_arguments(self):
+        tool = self.cache.wrap("tool", self.tool)
+        tool("Domain")
+        tool("Domain ", limit=5)
+        tool(column="Domain", limit=5)
+        self.assertEqual(len(self.calls), 1)
+        tool("domain")  # case matters unless folded
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.stats()["tools"]["tool"], {"hits": 2, "misses": 2, "hit_rate": 0.5})
+
+    def test_fold_case(self):
+        tool = self.cache.wrap("tool", self.tool, fold_case=("column",))
+        tool("Finance")
+        tool("finance")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_new_dataset_version_misses(self):
+        tool = self.cache.wrap("tool", self.tool)
+        tool("Domain")
+        self.version = "v2"
+        tool("Domain")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_lru_bound_and_errors(self):
+        tool = self.cache.wrap("tool", self.tool)
+        for column in ("a", "b", "c", "d"):
+            tool(column)
+        self.assertEqual(self.cache.stats()["entries"], 3)
+        tool("a")  # evicted
+        self.assertEqual(len(self.calls), 5)
+
+        failing = self.cache.wrap("failing", lambda: "Error: boom")
+        failing()
+        failing()
+        self.assertEqual(self.cache.stats()["tools"]["failing"]["misses"], 2)
+
+
+class TestMemoizedAnalyticsTool(unittest.TestCase):
+    def test_follows_dataset_changes(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            bot = WarmUpBot()
+            bot.data_file = os.path.join(tmp, 'responses.xlsx')
+            cache = ToolCache(lambda: dataset_version(bot.data_file))
+            tool = cache.wrap("count_values", lambda column: count_values(bot.data_file, column))
+
+            bot.save_response(["Learn", "Finance", "Bot", "High", "Advanced", "Hands-on"], None)
+            self.assertEqual(json.loads(tool("Domain")), {"Finance": 1})
+            self.assertEqual(json.loads(tool("Domain")), {"Finance": 1})
+            bot.save_response(["Learn", "Finance", "Bot", "Low", "Beginner", "Mix"], None)
+            self.assertEqual(json.loads(tool("Domain")), {"Finance": 2})
+            self.assertEqual(cache.stats()["tools"]["count_values"]["hits"], 1)
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import json
 import os
 import shutil
 import pandas as pd
-from app import app
+from app import app, bot
 
 class TestUserPanel(unittest.TestCase):
     def setUp(self):
@@ -61,6 +61,7 @@ class TestUserPanel(unittest.TestCase):
         rv = self.app.post('/api/chat', json={'message': "Hands-on", 'user_data': user_data})
         
         # 5. Verify Data Storage
+        bot.export_xlsx()
         self.assertTrue(os.path.exists('data/responses.xlsx'))
         df = pd.read_excel('data/responses.xlsx')
         self.assertEqual(df.iloc[0]['Name'], "Test User")
@@ -0,0 +1,106 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+from agents.aggregates import AggregateStore
+from agents.write_queue import WriteBehindQueue
+from agents.chatbot import WarmUpBot
+
+class TestWriteBehindQueue(unittest.TestCase):
+    def test_batches_and_flush_barrier(self):
+        batches = []
+        queue = WriteBehindQueue(batches.append, batch_size=10, flush_interval=5)
+        for i in range(25):
+            queue.submit(i)
+        # The barrier does not wait for the flush interval
+        self.assertTrue(queue.flush(timeout=2))
+        self.assertEqual(sum(batches, []), list(range(25)))
+        self.assertTrue(all(len(b) <= 10 for b in batches))
+        queue.close()
+
+    def test_close_drains_pending(self):
+        committed = []
+        queue = WriteBehindQueue(committed.extend, batch_size=1000, flush_interval=5)
+        for i in range(50):
+            queue.submit(i)
+        queue.close(timeout=2)
+        self.assertEqual(committed, list(range(50)))
+        with self.assertRaises(RuntimeError):
+            queue.submit(1)
+
+    def test_failed_commit_is_retried(self):
+        committed = []
+        attempts = []
+
+        def flaky_commit(batch):
+            attempts.append(batch)
+            if len(attempts) == 1:
+                raise IOError("disk hiccup")
+            committed.extend(batch)
+
+        queue = WriteBehindQueue(flaky_commit, batch_size=4, flush_interval=0.01)
+        queue.submit("a")
+        self.assertTrue(queue.flush(timeout=2))
+        self.assertEqual(committed, ["a"])
+        self.assertEqual(queue.stats()["errors"], 1)
+        queue.close()
+
+    def test_persistent_failure_is_parked(self):
+        attempts = []
+
+        def broken_commit(batch):
+            attempts.append(batch)
+            raise IOError("disk full")
+
+        queue = WriteBehindQueue(broken_commit, batch_size=4, flush_interval=0.01, max_retries=2)
+        queue.submit("a")
+        # flush returns instead of waiting forever, and reports the failure
+        self.assertFalse(queue.flush(timeout=2))
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(queue.failed, ["a"])
+        self.assertEqual(queue.stats()["failed"], 1)
+        # Later flushes only report their own records
+        self.assertTrue(queue.flush(timeout=2))
+        queue.close(timeout=2)
+
+    def test_stored_batch_is_not_appended_twice(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            bot = WarmUpBot(write_behind=True, flush_interval=0.01)
+            bot.data_file = os.path.join(tmp, 'responses.xlsx')
+            answers = ["Learn agents", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"]
+            with patch.object(AggregateStore, 'apply', side_effect=RuntimeError("boom")):
+                bot.save_response(answers, None)
+                self.assertTrue(bot.flush(timeout=2))
+            self.assertEqual(bot.log.count(), 1)
+            # The aggregates catch up from the log
+            self.assertEqual(bot.aggregates.value_counts("Domain"), {"Finance": 1})
+            bot.close()
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_bot_group_commit(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            bot = WarmUpBot(write_behind=True, batch_size=50, flush_interval=0.05)
+            bot.data_file = os.path.join(tmp, 'responses.xlsx')
+            answers = ["Learn agents", "Finance", "Trading Bot", "High", "Advanced", "Hands-on"]
+
+            threads = [threading.Thread(target=bot.save_response, args=(answers, {"name": f"U{i}"}))
+                       for i in range(100)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertTrue(bot.flush(timeout=5))
+            self.assertEqual(bot.log.count(), 100)
+            self.assertLess(bot.write_queue.stats()["batches"], 100)
+            bot.close()
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict, Annotated, List
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
@@ -45,18 +46,29 @@ def agent_node(state: AgentState) -> dict:
 # Define the tool node
 def tool_node(state: AgentState) -> dict:
     """
-    The tool node that executes the tool call.
+    The tool node that executes the tool calls.
+    When the LLM asks for several tools in one turn, they run concurrently
+    on a small thread pool; the results keep the order of the calls.
     """
     messages = state["messages"]
     last_message = messages[-1]
     tool_calls = last_message.tool_calls
-    tool_outputs = []
-    for tool_call in tool_calls:
+    tools = {"search_tool": search_tool}
+
+    def run(tool_call):
         tool_name = tool_call["name"]
         tool_args = tool_call["args"]
-        if tool_name == "search_tool":
-            output = search_tool.invoke(tool_args)
-            tool_outputs.append(ToolMessage(content=str(output), tool_call_id=tool_call["id"]))
+        if tool_name not in tools:
+            return ToolMessage(content=f"Error: unknown tool '{tool_name}'", tool_call_id=tool_call["id"], status="error")
+        try:
+            output = tools[tool_name].invoke(tool_args)
+        except Exception as e:
+            # A failing tool only produces an error for its own call
+            return ToolMessage(content=f"Error: {e}", tool_call_id=tool_call["id"], status="error")
+        return ToolMessage(content=str(output), tool_call_id=tool_call["id"])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        tool_outputs = list(pool.map(run, tool_calls))
     return {"messages": tool_outputs}
 
 
@@ -1,5 +1,26 @@
-import random
+"""
+Synthetic participants, in-process or as concurrent HTTP load.
+
+    python -m utils.populate_data                      # 20 users through WarmUpBot, in-process
+    python -m utils.populate_data --url http://localhost:5000 \
+        --participants 5000 --concurrency 100 --rate 200 --analyze-rate 0.5 --admin-chat-rate 0.1
+
+Over HTTP, participants arrive at `--rate` per second (0 = all at once) and
+walk through the six-question flow on `/api/chat`, at most `--concurrency`
+at a time, each with its own session id. Admin `/api/analyze` and
+`/api/admin/chat` requests are mixed in at their own rates. Throughput and
+p50/p95/p99 latency are reported per endpoint.
+"""
+import json
 import time
+import random
+import argparse
+import itertools
+import threading
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
 from agents.chatbot import WarmUpBot
 
 # Test Data Pools
@@ -9,6 +30,8 @@ PROJECTS = ["Trading Bot", "Diagnosis Helper", "Tutor Bot", "Shopper Assistant",
 CONFIDENCE = ["Low", "Medium", "High"]
 EXPERIENCE = ["Beginner", "Intermediate", "Advanced"]
 STYLES = ["Hands-on", "Conceptual", "Mix"]
+ADMIN_QUESTIONS = ["How many participants are beginners?", "Which domain is most common?",
+                   "What do people from Finance want to build?", "How confident are people with Python?"]
 
 def generate_random_user(index):
     name = NAMES[index % len(NAMES)]
@@ -17,26 +40,31 @@ def generate_random_user(index):
         "email": f"{name.lower()}{random.randint(1, 100)}@example.com"
     }
 
-def populate():
-    print("🚀 Starting Data Population (20 Users)...")
+def random_answers(rng=random):
+    """The six answers of one participant, all valid for the rule engine."""
+    return [
+        "I want to learn about AI agents.",
+        rng.choice(DOMAINS),
+        f"I want to build a {rng.choice(PROJECTS)}",
+        rng.choice(CONFIDENCE),
+        rng.choice(EXPERIENCE),
+        rng.choice(STYLES),
+    ]
+
+def populate(count=20):
+    print(f"🚀 Starting Data Population ({count} Users)...")
     bot = WarmUpBot()
     
-    # Check initial count
-    initial_count = 0
-    if os.path.exists(bot.data_file):
-        try:
-            df = pd.read_excel(bot.data_file)
-            initial_count = len(df)
-            print(f"Initial data count: {initial_count}")
-        except:
-            print("Could not read existing data file.")
+    # Check initial count (responses are stored in the log, not the workbook)
+    initial_count = bot.log.count()
+    print(f"Initial data count: {initial_count}")
 
-    for i in range(20):
+    for i in range(count):
         try:
             user_data = generate_random_user(i)
             user_id = f"sim_user_{i}_{int(time.time())}" # Unique ID
             
-            print(f"\n[{i+1}/20] Simulating {user_data['name']} ({user_id})...")
+            print(f"\n[{i+1}/{count}] Simulating {user_data['name']} ({user_id})...")
             
             # 1. Start Session
             resp = bot.get_response(user_id, "START_SESSION", user_data)
@@ -77,14 +105,172 @@ def populate():
 
     print("\n✅ Data Population Complete!")
     
-    if os.path.exists(bot.data_file):
-        df = pd.read_excel(bot.data_file)
-        print(f"Final data count: {len(df)}")
-        print(f"New records added: {len(df) - initial_count}")
+    final_count = bot.log.count()
+    print(f"Final data count: {final_count}")
+    print(f"New records added: {final_count - initial_count}")
+    if final_count == initial_count:
+        print("❌ Error: No responses were saved.")
+
+
+# --- HTTP load ---
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+class LoadStats:
+    """Latencies and error counts per endpoint, shared by all client threads."""
+
+    def __init__(self):
+        self._latencies = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self._latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed):
+        with self._lock:
+            rows = {}
+            for endpoint, latencies in sorted(self._latencies.items()):
+                rows[endpoint] = {
+                    "requests": len(latencies),
+                    "errors": self._errors.get(endpoint, 0),
+                    "throughput": round(len(latencies) / elapsed, 1),
+                    "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                    "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                    "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                }
+            return rows
+
+class HttpClient:
+    """Keep-alive JSON client with one connection per thread."""
+
+    def __init__(self, url, timeout=60):
+        parts = urlsplit(url)
+        self.conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.conn_class(self.netloc, timeout=self.timeout)
+        return conn
+
+    def post(self, path, payload=None):
+        """Returns (status, body); status is 0 if the request failed outright."""
+        body = json.dumps(payload or {})
+        try:
+            conn = self._conn()
+            conn.request("POST", self.prefix + path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self._local.conn = None
+            return 0, b""
+
+def timed_post(client, stats, endpoint, payload=None, scheduled=None):
+    # Latency counts from when the request was due, not when a free thread
+    # got to send it, so time spent queued behind a saturated client is
+    # not left out of the numbers (coordinated omission)
+    start = time.perf_counter() if scheduled is None else scheduled
+    status, body = client.post(endpoint, payload)
+    stats.record(endpoint, time.perf_counter() - start, status in (200, 304))
+    return status, body
+
+def participant_flow(client, stats, index, seed, scheduled=None):
+    rng = random.Random(seed + index)
+    user_data = generate_random_user(index)
+    session_id = f"load-{seed}-{index}"
+    for message in ["START_SESSION"] + random_answers(rng):
+        timed_post(client, stats, "/api/chat",
+                   {"message": message, "user_data": user_data, "session_id": session_id}, scheduled)
+        # Later answers follow the previous reply, whenever it came
+        scheduled = None
+
+def admin_loop(client, stats, endpoint, rate, done, seed):
+    # Fixed-rate admin traffic until the participants are done; a request
+    # due while the previous one is still running is sent right after it
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for k in itertools.count(1):
+        scheduled = start + k / rate
+        if done.wait(max(0, scheduled - time.perf_counter())):
+            return
+        payload = {"question": rng.choice(ADMIN_QUESTIONS)} if endpoint == "/api/admin/chat" else None
+        timed_post(client, stats, endpoint, payload, scheduled)
+
+def run_load(args):
+    client = HttpClient(args.url, timeout=args.timeout)
+    stats = LoadStats()
+    done = threading.Event()
+    admin = []
+    for endpoint, rate in (("/api/analyze", args.analyze_rate), ("/api/admin/chat", args.admin_chat_rate)):
+        if rate > 0:
+            thread = threading.Thread(target=admin_loop, args=(client, stats, endpoint, rate, done, args.seed),
+                                      daemon=True)
+            thread.start()
+            admin.append(thread)
+
+    print(f"🚀 {args.participants} participants -> {args.url} "
+          f"(concurrency {args.concurrency}, arrival rate {args.rate or 'unbounded'}/s)")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = []
+        for i in range(args.participants):
+            scheduled = None
+            if args.rate > 0:
+                # Open-loop arrivals: participant i arrives at i / rate
+                scheduled = start + i / args.rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(participant_flow, client, stats, i, args.seed, scheduled))
+        for future in futures:
+            future.result()
+    done.set()
+    for thread in admin:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    rows = stats.report(elapsed)
+    print(f"\n{'endpoint':<18} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, row in rows.items():
+        print(f"{endpoint:<18} {row['requests']:>9} {row['errors']:>7} {row['throughput']:>8} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+    print(f"\n{args.participants} participants in {elapsed:.1f}s "
+          f"({args.participants / elapsed:.1f} sessions/s)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"elapsed": round(elapsed, 3), "participants": args.participants, "endpoints": rows}, f, indent=2)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="server to load over HTTP; without it, users are simulated in-process")
+    parser.add_argument("--participants", type=int, help="simulated participants (default 20 in-process, 1000 over HTTP)")
+    parser.add_argument("--concurrency", type=int, default=50, help="participants in flight at once")
+    parser.add_argument("--rate", type=float, default=0, help="participant arrivals per second (0 = all at once)")
+    parser.add_argument("--analyze-rate", type=float, default=0.2, help="/api/analyze requests per second")
+    parser.add_argument("--admin-chat-rate", type=float, default=0, help="/api/admin/chat requests per second")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the per-endpoint report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        args.participants = args.participants or 1000
+        run_load(args)
     else:
-        print("❌ Error: Data file was not created.")
+        populate(args.participants or 20)
 
 if __name__ == "__main__":
-    import os
-    import pandas as pd
-    populate()
+    main()